@@ -0,0 +1,185 @@
+import os
+import time
+
+import numpy as np
+import pygame
+
+from settings import DAY_NIGHT_FADE_STEPS, SPRITE_SHEET_PATH
+from sprite_sheet import SpriteSheet, load_image
+
+# Sprites sueltos: nombre -> (archivo, ancho, alto)
+DINO_SPRITES = {
+    "run_1": ("dino_running_1.png", 48, 50),
+    "run_2": ("dino_running_2.png", 48, 50),
+    "jump": ("dino_jumping.png", 48, 50),
+    "duck_1": ("dino_down_1.png", 57, 32),
+    "duck_2": ("dino_down_2.png", 57, 32),
+}
+BIRD_SPRITES = (
+    ("Terodactilo1.png", 46, 40),
+    ("Terodactilo2.png", 46, 40),
+)
+
+# Recortes de offline-sprite-2x.png: (x, y, ancho, alto), a escala 0.5
+SMALL_CACTUS_RECTS = (
+    (446, 2, 34, 70),
+    (480, 2, 34, 70),
+    (514, 2, 34, 70),
+    (548, 2, 34, 70),
+    (582, 2, 34, 70),
+    (616, 2, 34, 70),
+)
+LARGE_CACTUS_RECTS = (
+    (652, 2, 50, 100),
+    (702, 2, 50, 100),
+    (752, 2, 98, 100),
+)
+GROUND_RECT = (2, 104, 2400, 24)
+
+# Caché del proceso: cada imagen se lee y escala una sola vez y todos los
+# objetos comparten la misma Surface (nadie debe modificarlas)
+_sheets: dict[str, SpriteSheet] = {}
+_images: dict[tuple, pygame.Surface] = {}
+_masks: dict[pygame.Surface, pygame.mask.Mask] = {}
+# Surface de día -> pasos del fundido; [0] es la propia Surface y [-1] la de
+# noche (colores invertidos, mismo alfa)
+_fades: dict[pygame.Surface, list[pygame.Surface]] = {}
+
+load_stats = {"images": 0, "disk_loads": 0, "load_ms": 0.0}
+
+
+def _timed(key: tuple, build) -> pygame.Surface:
+    image = _images.get(key)
+    if image is None:
+        start = time.perf_counter()
+        image = build()
+        load_stats["load_ms"] += (time.perf_counter() - start) * 1000.0
+        load_stats["images"] += 1
+        _images[key] = image
+    return image
+
+
+def get_sheet(path: str = SPRITE_SHEET_PATH) -> SpriteSheet:
+    sheet = _sheets.get(path)
+    if sheet is None:
+        start = time.perf_counter()
+        sheet = SpriteSheet(path)
+        load_stats["load_ms"] += (time.perf_counter() - start) * 1000.0
+        load_stats["disk_loads"] += 1
+        _sheets[path] = sheet
+    return sheet
+
+
+def sheet_image(
+    x: int, y: int, width: int, height: int, scale: float = 0.5
+) -> pygame.Surface:
+    return _timed(
+        ("sheet", x, y, width, height, scale),
+        lambda: get_sheet().get_image(x, y, width, height, scale),
+    )
+
+
+def sprite(name: str, width: int, height: int) -> pygame.Surface:
+    def build() -> pygame.Surface:
+        load_stats["disk_loads"] += 1
+        image = load_image(os.path.join("sprites", name))
+        return pygame.transform.scale(image, (width, height))
+
+    return _timed(("sprite", name, width, height), build)
+
+
+def get_mask(image: pygame.Surface) -> pygame.mask.Mask:
+    """Máscara de colisión (alfa > 127) de una Surface del registro."""
+    mask = _masks.get(image)
+    if mask is None:
+        mask = pygame.mask.from_surface(image)
+        _masks[image] = mask
+    return mask
+
+
+def _build_fade(image: pygame.Surface) -> list[pygame.Surface]:
+    day = pygame.surfarray.array3d(image).astype(np.float32)
+    night = 255.0 - day
+    steps = [image]
+    for step in range(1, DAY_NIGHT_FADE_STEPS + 1):
+        t = step / DAY_NIGHT_FADE_STEPS
+        # copy() conserva el canal alfa; pixels3d solo reescribe el color
+        variant = image.copy()
+        pixels = pygame.surfarray.pixels3d(variant)
+        pixels[...] = np.rint(day + (night - day) * t)
+        del pixels  # desbloquea la Surface
+        steps.append(variant)
+    return steps
+
+
+def night_fade(image: pygame.Surface) -> list[pygame.Surface]:
+    """Pasos del fundido día -> noche de una Surface del registro."""
+    steps = _fades.get(image)
+    if steps is None:
+        start = time.perf_counter()
+        steps = _build_fade(image)
+        load_stats["load_ms"] += (time.perf_counter() - start) * 1000.0
+        _fades[image] = steps
+    return steps
+
+
+def shaded(image: pygame.Surface, step: int) -> pygame.Surface:
+    """Variante de `image` para el paso `step` del fundido (0 = día).
+
+    Solo se usa al dibujar: la colisión sigue con la Surface de día, que
+    tiene el mismo alfa que todas sus variantes.
+    """
+    if not step:
+        return image
+    steps = _fades.get(image)
+    if steps is None:
+        steps = night_fade(image)
+    return steps[step]
+
+
+def dino_images() -> dict[str, pygame.Surface]:
+    return {key: sprite(*spec) for key, spec in DINO_SPRITES.items()}
+
+
+def bird_images() -> list[pygame.Surface]:
+    return [sprite(*spec) for spec in BIRD_SPRITES]
+
+
+def small_cactus_images() -> list[pygame.Surface]:
+    return [sheet_image(*rect) for rect in SMALL_CACTUS_RECTS]
+
+
+def large_cactus_images() -> list[pygame.Surface]:
+    return [sheet_image(*rect) for rect in LARGE_CACTUS_RECTS]
+
+
+def ground_image() -> pygame.Surface:
+    return sheet_image(*GROUND_RECT)
+
+
+def preload() -> dict:
+    """Carga todos los assets del juego y devuelve load_stats.
+
+    Llamarlo después de crear la ventana para que convert_alpha se aplique.
+    """
+    dino_images()
+    bird_images()
+    small_cactus_images()
+    large_cactus_images()
+    ground_image()
+    start = time.perf_counter()
+    for image in _images.values():
+        get_mask(image)
+    for image in list(_images.values()):
+        night_fade(image)
+    load_stats["load_ms"] += (time.perf_counter() - start) * 1000.0
+    return load_stats
+
+
+def clear() -> None:
+    """Olvida la caché (p. ej. tras crear la ventana en modo headless)."""
+    _sheets.clear()
+    _images.clear()
+    _masks.clear()
+    _fades.clear()
+    load_stats.update(images=0, disk_loads=0, load_ms=0.0)
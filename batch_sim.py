@@ -0,0 +1,425 @@
+import argparse
+import itertools
+import time
+from typing import Callable, Optional, Union
+
+import numpy as np
+
+from settings import (
+    SCREEN_WIDTH,
+    GRAVITY,
+    SPEED_START,
+    MAX_SPEED,
+    ACCELERATION,
+    JUMP_VELOCITY,
+    MIN_JUMP_HEIGHT,
+    DINO_X_POS,
+    GROUND_Y_POS,
+)
+from simulation import INPUT_JUMP_PRESSED, INPUT_JUMP_HELD, INPUT_DUCK_HELD
+from spawn_table import GAP_SPEED_FACTOR, SPAWN_TABLE
+
+ArrayLike = Union[float, np.ndarray]
+
+# Tipos de obstáculo con los tamaños ya escalados que usa ObstacleManager
+KIND_SMALL_CACTUS = 0
+KIND_LARGE_CACTUS = (1, 2, 3)
+KIND_BIRD = (4, 5, 6)
+
+OBSTACLE_W = np.array([17, 25, 25, 49, 46, 46, 46], dtype=np.float64)
+OBSTACLE_H = np.array([35, 50, 50, 50, 40, 40, 40], dtype=np.float64)
+OBSTACLE_Y = np.array([360, 350, 350, 350, 270, 220, 160], dtype=np.float64)
+OBSTACLE_IS_BIRD = np.array([0, 0, 0, 0, 1, 1, 1], dtype=bool)
+
+# SPAWN_TABLE en arrays, un tramo por fila; las alturas de pájaro pasan a
+# tipos de obstáculo
+BRACKET_MAX_SCORE = np.array([b.max_score for b in SPAWN_TABLE])
+BRACKET_SMALL = np.array([b.small for b in SPAWN_TABLE])
+BRACKET_BIRD = np.array([b.bird for b in SPAWN_TABLE])
+BRACKET_GAP_LOW = np.array([b.gap[0] for b in SPAWN_TABLE])
+BRACKET_GAP_HIGH = np.array([b.gap[1] for b in SPAWN_TABLE])
+_BIRD_KIND_BY_Y = {int(OBSTACLE_Y[kind]): kind for kind in KIND_BIRD}
+BRACKET_BIRD_COUNT = np.array([max(1, len(b.bird_heights)) for b in SPAWN_TABLE])
+BRACKET_BIRD_KINDS = np.array(
+    [
+        [_BIRD_KIND_BY_Y[y] for y in b.bird_heights]
+        + [KIND_BIRD[0]] * (BRACKET_BIRD_COUNT.max() - len(b.bird_heights))
+        for b in SPAWN_TABLE
+    ]
+)
+
+DINO_RUN_SIZE = (48, 50)
+DINO_DUCK_SIZE = (57, 32)
+DINO_Y_OFFSET = 15
+
+_GOLDEN = np.uint64(0x9E3779B97F4A7C15)
+_MIX_1 = np.uint64(0xBF58476D1CE4E5B9)
+_MIX_2 = np.uint64(0x94D049BB133111EB)
+
+
+class BatchSimulator:
+    """N partidas independientes en arrays (struct-of-arrays).
+
+    Replica Dinosaur.update/apply_physics y ObstacleManager.update/spawn con
+    la curva de SPAWN_TABLE. Dos aproximaciones respecto al juego:
+
+    - La colisión usa rectángulos reducidos (inflate(-20, -15) y (-15, -15)),
+      no las máscaras de píxeles de GameState.
+    - No se aplica la tabla de alcance de spawn_table: está calculada con la
+      física por defecto y aquí la física cambia por entorno. Con la curva
+      del juego esa comprobación nunca retrasa un spawn, así que solo importa
+      al barrer huecos muy cortos.
+
+    El ciclo día/noche no afecta al juego y se omite. Cada entorno tiene su
+    propio flujo splitmix64, así que su resultado no depende del resto del
+    lote (tampoco coincide número a número con una partida de GameState).
+    """
+
+    def __init__(
+        self,
+        n_envs: int,
+        seed: int = 0,
+        capacity: int = 4,
+        gravity: ArrayLike = GRAVITY,
+        jump_velocity: ArrayLike = JUMP_VELOCITY,
+        min_jump_height: ArrayLike = MIN_JUMP_HEIGHT,
+        gap_speed_factor: ArrayLike = GAP_SPEED_FACTOR,
+        gap_variance_scale: ArrayLike = 1.0,
+    ) -> None:
+        self.n_envs = n_envs
+        self.capacity = capacity
+
+        def per_env(value: ArrayLike) -> np.ndarray:
+            return np.broadcast_to(
+                np.asarray(value, dtype=np.float64), (n_envs,)
+            ).copy()
+
+        self.gravity = per_env(gravity)
+        self.jump_velocity = per_env(jump_velocity)
+        self.min_jump_height = per_env(min_jump_height)
+        self.gap_speed_factor = per_env(gap_speed_factor)
+        self.gap_variance_scale = per_env(gap_variance_scale)
+
+        self.rng_state = (
+            np.arange(n_envs, dtype=np.uint64) * _GOLDEN + np.uint64(seed)
+        ) ^ _MIX_2
+
+        self.y = np.zeros(n_envs)
+        self.y_velocity = np.zeros(n_envs)
+        self.height = np.zeros(n_envs)
+        self.is_jumping = np.zeros(n_envs, dtype=bool)
+        self.is_ducking = np.zeros(n_envs, dtype=bool)
+        self.on_ground = np.zeros(n_envs, dtype=bool)
+
+        # Huecos libres con x = inf: nunca colisionan ni se mueven
+        self.obs_x = np.full((n_envs, capacity), np.inf)
+        self.obs_kind = np.zeros((n_envs, capacity), dtype=np.int8)
+        self.obs_width = np.zeros((n_envs, capacity))
+        self.obs_top = np.zeros((n_envs, capacity))
+        self.obs_height = np.zeros((n_envs, capacity))
+
+        # Obstáculo más cercano por delante del dino; con huecos de >= 600 px
+        # es el único que puede solaparse con él en x
+        self.next_x = np.full(n_envs, np.inf)
+        self.next_width = np.zeros(n_envs)
+        self.next_top = np.zeros(n_envs)
+        self.next_height = np.zeros(n_envs)
+        self.next_is_bird = np.zeros(n_envs, dtype=bool)
+        self._all_rows = np.arange(n_envs)
+        self._row_offsets = self._all_rows * capacity
+
+        self.game_speed = np.zeros(n_envs)
+        self.score = np.zeros(n_envs)
+        self.alive = np.zeros(n_envs, dtype=bool)
+        self.frames = np.zeros(n_envs, dtype=np.int64)
+        self.distance_traveled = np.zeros(n_envs)
+        self.distance_to_next_spawn = np.zeros(n_envs)
+        self.dropped_spawns = 0
+
+        self.reset()
+
+    def reset(self) -> None:
+        run_w, run_h = DINO_RUN_SIZE
+        self.height[:] = run_h
+        self.y[:] = GROUND_Y_POS - run_h + DINO_Y_OFFSET
+        self.y_velocity[:] = 0
+        self.is_jumping[:] = False
+        self.is_ducking[:] = False
+        self.on_ground[:] = True
+
+        self.obs_x[:] = np.inf
+        self.next_x[:] = np.inf
+        self.game_speed[:] = SPEED_START
+        self.score[:] = 0
+        self.alive[:] = True
+        self.frames[:] = 0
+        self.distance_traveled[:] = 0
+        self.distance_to_next_spawn[:] = self._randint(800, 1200, self._all_rows)
+        self.dropped_spawns = 0
+
+    def _uniform(self, rows: np.ndarray) -> np.ndarray:
+        # splitmix64: solo avanzan los flujos de las filas pedidas
+        z = self.rng_state[rows] + _GOLDEN
+        self.rng_state[rows] = z
+        z = (z ^ (z >> np.uint64(30))) * _MIX_1
+        z = (z ^ (z >> np.uint64(27))) * _MIX_2
+        z = z ^ (z >> np.uint64(31))
+        return (z >> np.uint64(11)).astype(np.float64) * (1.0 / (1 << 53))
+
+    def _randint(self, low: ArrayLike, high: ArrayLike, rows: np.ndarray) -> np.ndarray:
+        return low + np.floor(self._uniform(rows) * (np.asarray(high) - low + 1))
+
+    def step(self, inputs: np.ndarray) -> np.ndarray:
+        """Avanza un frame todo el lote; inputs es un bitfield por entorno."""
+        alive = self.alive
+        inputs = np.asarray(inputs)
+        jump_pressed = (inputs & INPUT_JUMP_PRESSED) != 0
+        jump_held = (inputs & INPUT_JUMP_HELD) != 0
+        duck_held = (inputs & INPUT_DUCK_HELD) != 0
+
+        self.game_speed = np.where(
+            alive & (self.game_speed < MAX_SPEED),
+            self.game_speed + ACCELERATION,
+            self.game_speed,
+        )
+
+        self._update_dino(alive, jump_pressed, jump_held, duck_held)
+        self._update_obstacles(alive)
+
+        self.score += np.where(alive, 0.15 * (self.game_speed / SPEED_START), 0.0)
+        self.frames += alive
+        self._find_next_obstacle()
+
+        self.alive = alive & ~self._collisions()
+        return self.alive
+
+    def _update_dino(
+        self,
+        alive: np.ndarray,
+        jump_pressed: np.ndarray,
+        jump_held: np.ndarray,
+        duck_held: np.ndarray,
+    ) -> None:
+        # animate(): el rect toma el alto del sprite del estado anterior
+        self.height = np.where(self.is_ducking, DINO_DUCK_SIZE[1], DINO_RUN_SIZE[1])
+        base_y = GROUND_Y_POS - self.height + DINO_Y_OFFSET
+
+        start_jump = alive & jump_pressed & self.on_ground
+        self.is_jumping |= start_jump
+        self.on_ground &= ~start_jump
+        self.y_velocity = np.where(start_jump, self.jump_velocity, self.y_velocity)
+        end_duck = start_jump & self.is_ducking
+        self.y = np.where(end_duck, base_y, self.y)
+        self.is_ducking &= ~end_duck
+
+        short_jump = (
+            alive
+            & self.is_jumping
+            & ~jump_held
+            & (self.y_velocity < self.min_jump_height)
+        )
+        self.y_velocity = np.where(short_jump, self.min_jump_height, self.y_velocity)
+
+        start_duck = alive & duck_held & ~self.is_ducking
+        fast_fall = alive & duck_held & ~self.on_ground
+        end_duck = alive & ~duck_held & self.is_ducking
+        self.y = np.where(start_duck | end_duck, base_y, self.y)
+        self.is_ducking = (self.is_ducking | start_duck) & ~end_duck
+        self.y_velocity += np.where(fast_fall, self.gravity * 2, 0.0)
+
+        # apply_physics(); pygame.Rect redondea la posición a entero
+        self.y_velocity = np.where(
+            alive, self.y_velocity + self.gravity, self.y_velocity
+        )
+        moved_y = np.rint(self.y + self.y_velocity)
+        target_y = base_y + np.where(self.is_ducking, 5, 0)
+        landed = moved_y >= target_y
+
+        self.y = np.where(alive, np.where(landed, target_y, moved_y), self.y)
+        self.y_velocity = np.where(alive & landed, 0.0, self.y_velocity)
+        self.on_ground = np.where(alive, landed, self.on_ground)
+        self.is_jumping &= ~(alive & landed)
+
+    @property
+    def obs_active(self) -> np.ndarray:
+        return np.isfinite(self.obs_x)
+
+    def _update_obstacles(self, alive: np.ndarray) -> None:
+        speed = np.where(alive, self.game_speed, 0.0)
+
+        left = np.trunc(self.obs_x)
+        self.obs_x[left + self.obs_width < -100] = np.inf
+        self.obs_x -= speed[:, None]
+
+        self.distance_traveled += speed
+        # Solo unas pocas partidas generan obstáculo por frame: se trabaja
+        # sobre sus índices en vez de sobre el lote completo
+        rows = np.flatnonzero(
+            alive & (self.distance_traveled >= self.distance_to_next_spawn)
+        )
+        if rows.size == 0:
+            return
+
+        self._spawn(rows)
+        self.distance_traveled[rows] = 0.0
+        self.distance_to_next_spawn[rows] = self._next_gap(rows)
+
+    def _next_gap(self, rows: np.ndarray) -> np.ndarray:
+        bracket = self._bracket(rows)
+        low = BRACKET_GAP_LOW[bracket]
+        high = BRACKET_GAP_HIGH[bracket]
+        variance = self._randint(low, high, rows)
+        return (
+            self.game_speed[rows] * self.gap_speed_factor[rows]
+            + variance * self.gap_variance_scale[rows]
+        )
+
+    def _bracket(self, rows: np.ndarray) -> np.ndarray:
+        """Tramo de SPAWN_TABLE de cada partida (el primero con score < max)."""
+        score = np.floor(self.score[rows])
+        bracket = np.searchsorted(BRACKET_MAX_SCORE, score, side="right")
+        return np.minimum(bracket, len(SPAWN_TABLE) - 1)
+
+    def _spawn(self, rows: np.ndarray) -> None:
+        bracket = self._bracket(rows)
+        u_bird = self._uniform(rows)
+        u_large = self._uniform(rows)
+        u_pick = self._uniform(rows)
+
+        large = KIND_LARGE_CACTUS[0] + np.floor(u_pick * len(KIND_LARGE_CACTUS))
+        pick = np.floor(u_pick * BRACKET_BIRD_COUNT[bracket]).astype(np.intp)
+        bird = BRACKET_BIRD_KINDS[bracket, pick]
+
+        cactus = np.where(u_large < BRACKET_SMALL[bracket], KIND_SMALL_CACTUS, large)
+        kind = np.where(u_bird < BRACKET_BIRD[bracket], bird, cactus).astype(np.int8)
+
+        free_slot = np.argmax(self.obs_x[rows], axis=1)
+        has_slot = np.isinf(self.obs_x[rows, free_slot])
+        self.dropped_spawns += int(np.count_nonzero(~has_slot))
+
+        rows = rows[has_slot]
+        cols = free_slot[has_slot]
+        kind = kind[has_slot]
+        self.obs_x[rows, cols] = SCREEN_WIDTH + 50
+        self.obs_kind[rows, cols] = kind
+        self.obs_width[rows, cols] = OBSTACLE_W[kind]
+        self.obs_top[rows, cols] = OBSTACLE_Y[kind]
+        self.obs_height[rows, cols] = OBSTACLE_H[kind]
+
+    def _find_next_obstacle(self) -> None:
+        left = np.trunc(self.obs_x)
+        ahead_x = np.where(left + self.obs_width >= DINO_X_POS, left, np.inf)
+        flat = self._row_offsets + np.argmin(ahead_x, axis=1)
+
+        self.next_x = ahead_x.ravel()[flat]
+        self.next_width = self.obs_width.ravel()[flat]
+        self.next_top = self.obs_top.ravel()[flat]
+        self.next_height = self.obs_height.ravel()[flat]
+        self.next_is_bird = OBSTACLE_IS_BIRD[self.obs_kind.ravel()[flat]]
+
+    def _collisions(self) -> np.ndarray:
+        # Mismos rectángulos que GameState: inflate(-20, -15) y inflate(-15, -15)
+        width = np.where(self.is_ducking, DINO_DUCK_SIZE[0], DINO_RUN_SIZE[0])
+        p_left = DINO_X_POS + 10
+        p_right = DINO_X_POS + 10 + (width - 20)
+        p_top = self.y + 7
+        p_bottom = p_top + self.height - 15
+
+        o_left = self.next_x + 7
+        o_top = self.next_top + 7
+
+        return (
+            (p_left < o_left + (self.next_width - 15))
+            & (o_left < p_right)
+            & (p_top < o_top + (self.next_height - 15))
+            & (o_top < p_bottom)
+        )
+
+    def run(
+        self,
+        max_frames: int,
+        policy: Optional[Callable[["BatchSimulator"], np.ndarray]] = None,
+    ) -> np.ndarray:
+        policy = policy or autopilot_inputs
+        for _ in range(max_frames):
+            if not self.step(policy(self)).any():
+                break
+        return self.score
+
+
+def autopilot_inputs(sim: BatchSimulator) -> np.ndarray:
+    """Versión vectorizada de simulation.autopilot_inputs"""
+    distance = sim.next_x - (DINO_X_POS + DINO_RUN_SIZE[0])
+    jump = ~sim.next_is_bird & (distance < sim.game_speed * 8)
+    return np.where(jump, INPUT_JUMP_PRESSED | INPUT_JUMP_HELD, 0).astype(np.uint8)
+
+
+def sweep(
+    gravities: list[float],
+    jump_velocities: list[float],
+    min_jump_heights: list[float],
+    envs_per_combo: int,
+    max_frames: int,
+    seed: int = 0,
+) -> list[dict]:
+    combos = list(itertools.product(gravities, jump_velocities, min_jump_heights))
+    params = np.repeat(np.array(combos, dtype=np.float64), envs_per_combo, axis=0)
+
+    sim = BatchSimulator(
+        len(params),
+        seed=seed,
+        gravity=params[:, 0],
+        jump_velocity=params[:, 1],
+        min_jump_height=params[:, 2],
+    )
+    scores = sim.run(max_frames).reshape(len(combos), envs_per_combo)
+    survived = sim.alive.reshape(len(combos), envs_per_combo)
+
+    return [
+        {
+            "gravity": gravity,
+            "jump_velocity": jump_velocity,
+            "min_jump_height": min_jump_height,
+            "mean_score": float(scores[i].mean()),
+            "median_score": float(np.median(scores[i])),
+            "survival_rate": float(survived[i].mean()),
+        }
+        for i, (gravity, jump_velocity, min_jump_height) in enumerate(combos)
+    ]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Barrido de parámetros en lote")
+    parser.add_argument("--gravity", type=float, nargs="+", default=[GRAVITY])
+    parser.add_argument(
+        "--jump-velocity", type=float, nargs="+", default=[JUMP_VELOCITY]
+    )
+    parser.add_argument(
+        "--min-jump-height", type=float, nargs="+", default=[MIN_JUMP_HEIGHT]
+    )
+    parser.add_argument(
+        "--envs", type=int, default=1000, help="partidas por combinación"
+    )
+    parser.add_argument("--frames", type=int, default=3000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    results = sweep(
+        args.gravity,
+        args.jump_velocity,
+        args.min_jump_height,
+        args.envs,
+        args.frames,
+        args.seed,
+    )
+    elapsed = time.perf_counter() - start
+
+    for row in results:
+        print(
+            f"g={row['gravity']:.2f} v0={row['jump_velocity']:.1f} "
+            f"min={row['min_jump_height']:.1f} | media {row['mean_score']:.0f} "
+            f"mediana {row['median_score']:.0f} | vivos {row['survival_rate']:.1%}"
+        )
+    total = len(results) * args.envs
+    print(f"{total} partidas x {args.frames} frames en {elapsed:.2f} s")
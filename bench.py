@@ -0,0 +1,316 @@
+import os
+
+# Sin ventana real: el benchmark corre igual en CI y en los quioscos
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import argparse
+import json
+import platform
+import sys
+import time
+from typing import Callable, Optional
+
+import numpy as np
+import pygame
+
+import assets
+from input_backends import ScriptedInput
+from latency import percentile
+from obstacles import ObstacleManager
+from renderer import Renderer
+from settings import (
+    CAMERA_PREVIEW_SIZE,
+    GROUND_Y_POS,
+    MAX_SPEED,
+    SCREEN_HEIGHT,
+    SCREEN_WIDTH,
+    SPRITE_SHEET_PATH,
+)
+from simulation import FrameInput, GameState, autopilot_inputs, sample_inputs
+from sprite_sheet import SpriteSheet
+
+# Obstáculos simultáneos en pantalla; "juego" usa la curva de spawns normal
+DENSITIES = {"juego": None, "50": 50, "500": 500}
+CAMERA_SIZE = (480, 640, 3)
+DEFAULT_THRESHOLD = 15.0
+
+
+def summarize(samples: list[float]) -> dict:
+    values = sorted(s * 1000.0 for s in samples)
+    mean = sum(values) / len(values)
+    return {
+        "iterations": len(values),
+        "mean_ms": mean,
+        "p50_ms": percentile(values, 0.50),
+        "p95_ms": percentile(values, 0.95),
+        "p99_ms": percentile(values, 0.99),
+        "max_ms": values[-1],
+        "per_s": 1000.0 / mean if mean > 0 else float("inf"),
+    }
+
+
+def measure(step: Callable[[], object], iterations: int, warmup: int = 50) -> dict:
+    for _ in range(warmup):
+        step()
+    perf_counter = time.perf_counter
+    samples = []
+    for _ in range(iterations):
+        start = perf_counter()
+        step()
+        samples.append(perf_counter() - start)
+    return summarize(samples)
+
+
+def make_manager(
+    state: GameState, density: Optional[int], warmup_ticks: int = 300
+) -> ObstacleManager:
+    """Manager con `density` obstáculos activos (como simulation --stress)."""
+    manager = state.obstacle_manager
+    if density is not None:
+        manager = ObstacleManager(
+            state.rng,
+            capacity=density + density // 20 + 16,
+            spawn_gap=(SCREEN_WIDTH + 200) / density,
+        )
+        state.obstacle_manager = manager
+    for _ in range(warmup_ticks):
+        manager.update(MAX_SPEED, 1000)
+    return manager
+
+
+def bench_dino(iterations: int) -> dict:
+    state = GameState(0)
+    player = state.player
+    # Corre, salta, mantiene el salto y se agacha en bucle
+    script = ScriptedInput.from_sequence(
+        [0] * 20 + [3] + [2] * 15 + [0] * 20 + [4] * 20
+    )
+    frame_input = FrameInput()
+
+    def step() -> None:
+        script.update()
+        frame_input.bits = sample_inputs(script)
+        player.update(frame_input)
+
+    return measure(step, iterations)
+
+
+def bench_obstacles(iterations: int, density: Optional[int]) -> dict:
+    manager = make_manager(GameState(0), density)
+    return measure(lambda: manager.update(MAX_SPEED, 1000), iterations)
+
+
+def bench_spawn(iterations: int) -> dict:
+    manager = GameState(0).obstacle_manager
+    manager.reset()
+
+    def step() -> None:
+        manager.spawn_obstacle(MAX_SPEED, 1000)
+        # Devuelve el obstáculo al pool para medir solo el spawn
+        manager.reset()
+
+    return measure(step, iterations)
+
+
+def bench_collision(iterations: int, density: Optional[int]) -> dict:
+    state = GameState(0)
+    make_manager(state, density)
+    return measure(state.check_collision, iterations)
+
+
+def bench_sprite_sheet(iterations: int) -> dict:
+    sheet = SpriteSheet(SPRITE_SHEET_PATH)
+    rects = (
+        assets.SMALL_CACTUS_RECTS + assets.LARGE_CACTUS_RECTS + (assets.GROUND_RECT,)
+    )
+    index = [0]
+
+    def step() -> None:
+        rect = rects[index[0] % len(rects)]
+        index[0] += 1
+        sheet.get_image(*rect)
+
+    return measure(step, iterations)
+
+
+def bench_camera_preview(iterations: int) -> Optional[dict]:
+    """Frame BGR de la cámara -> vista previa -> Surface (como en main.py)."""
+    try:
+        from pose_pipeline import render_preview
+    except ImportError:
+        return None
+    rng = np.random.default_rng(0)
+    frame = rng.integers(0, 255, CAMERA_SIZE, dtype=np.uint8)
+    width, height = CAMERA_PREVIEW_SIZE
+    out = np.empty((width, height, 3), dtype=np.uint8)
+    scratch = np.empty((height, width, 3), dtype=np.uint8)
+    surface = pygame.Surface(CAMERA_PREVIEW_SIZE)
+
+    def step() -> None:
+        render_preview(frame, out, scratch)
+        pygame.surfarray.blit_array(surface, out)
+
+    return measure(step, iterations)
+
+
+def bench_frame(
+    iterations: int, density: Optional[int], renderer: Renderer, full: bool
+) -> dict:
+    """Frame completo: entrada scripted, simulación, descripción y present().
+
+    Las colisiones se calculan pero no terminan la partida, así la densidad
+    se mantiene durante toda la medida.
+    """
+    state = GameState(0)
+    manager = make_manager(state, density)
+    player = state.player
+    script = ScriptedInput(lambda: autopilot_inputs(state))
+    frame_input = FrameInput()
+    ground_img = assets.ground_image()
+    ground_y = GROUND_Y_POS + 10
+    fg_color = state.fg_color
+    text = renderer.text
+    frame = [0]
+
+    def step() -> None:
+        script.update()
+        frame_input.bits = sample_inputs(script)
+        player.update(frame_input)
+        manager.update(MAX_SPEED, 1000)
+        state.check_collision()
+
+        frame[0] += 1
+        ground_x = -(frame[0] * MAX_SPEED) % ground_img.get_width()
+        if full:
+            renderer.invalidate()
+        renderer.begin(state.bg_color)
+        renderer.blit(ground_img, (-ground_x, ground_y))
+        renderer.blit(ground_img, (ground_img.get_width() - ground_x, ground_y))
+        player.draw(renderer)
+        manager.draw(renderer)
+        text(f"Pts {frame[0] // 6:05d}", fg_color, (SCREEN_WIDTH - 150, 20))
+        renderer.present()
+
+    return measure(step, iterations)
+
+
+def run_benchmarks(iterations: int = 2000, only: Optional[str] = None) -> dict:
+    pygame.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    assets.preload()
+    renderer = Renderer(screen, pygame.font.SysFont("consolas", 20))
+
+    cases: dict[str, Callable[[], Optional[dict]]] = {
+        "dino.update": lambda: bench_dino(iterations),
+        "obstacles.spawn": lambda: bench_spawn(iterations),
+        "sprite_sheet.get_image": lambda: bench_sprite_sheet(iterations // 4),
+        "camera.preview": lambda: bench_camera_preview(iterations),
+    }
+    for label, density in DENSITIES.items():
+        cases[f"obstacles.update[{label}]"] = lambda density=density: bench_obstacles(
+            iterations, density
+        )
+        cases[f"collision[{label}]"] = lambda density=density: bench_collision(
+            iterations, density
+        )
+        cases[f"frame.dirty[{label}]"] = lambda density=density: bench_frame(
+            iterations, density, renderer, full=False
+        )
+        cases[f"frame.full[{label}]"] = lambda density=density: bench_frame(
+            iterations, density, renderer, full=True
+        )
+
+    results = {}
+    for name, case in cases.items():
+        if only is not None and only not in name:
+            continue
+        # Cada caso empieza con un frame completo
+        renderer.invalidate()
+        result = case()
+        if result is None:
+            print(f"{name}: omitido (falta una dependencia)")
+            continue
+        results[name] = result
+        print(
+            f"{name}: media {result['mean_ms']:.4f} ms | p50 {result['p50_ms']:.4f} "
+            f"p95 {result['p95_ms']:.4f} p99 {result['p99_ms']:.4f} ms | "
+            f"{result['per_s']:.0f}/s"
+        )
+    pygame.quit()
+
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "machine": platform.machine(),
+            "system": platform.system(),
+            "iterations": iterations,
+        },
+        "cases": results,
+    }
+
+
+def compare(
+    results: dict, baseline: dict, threshold: float, metric: str = "p50_ms"
+) -> list[str]:
+    """Casos cuyo `metric` empeoró más de `threshold` % respecto a la base."""
+    regressions = []
+    for name, current in results["cases"].items():
+        reference = baseline["cases"].get(name)
+        if reference is None or reference[metric] <= 0:
+            continue
+        change = (current[metric] / reference[metric] - 1.0) * 100.0
+        if change > threshold:
+            regressions.append(
+                f"{name}: {metric} {reference[metric]:.4f} -> "
+                f"{current[metric]:.4f} ms (+{change:.1f} %)"
+            )
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Benchmark headless del juego (SDL dummy, entrada scripted)"
+    )
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--only", metavar="TEXTO", help="solo casos que lo contengan")
+    parser.add_argument("--json", metavar="RUTA", help="guarda el resultado en JSON")
+    parser.add_argument(
+        "--baseline",
+        metavar="RUTA",
+        help="compara con una base guardada y falla si algo empeora",
+    )
+    parser.add_argument(
+        "--save-baseline",
+        metavar="RUTA",
+        help="guarda el resultado como nueva base",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="porcentaje de empeoramiento permitido (por defecto %(default)s)",
+    )
+    parser.add_argument(
+        "--metric",
+        choices=("mean_ms", "p50_ms", "p95_ms", "p99_ms"),
+        default="p50_ms",
+    )
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.iterations, args.only)
+    for path in (args.json, args.save_baseline):
+        if path:
+            with open(path, "w") as f:
+                json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold, args.metric)
+        if regressions:
+            print(f"Regresiones (> {args.threshold:.0f} %):")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print(f"Sin regresiones respecto a {args.baseline}")
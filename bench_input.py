@@ -0,0 +1,138 @@
+import argparse
+import json
+import time
+from typing import Optional
+
+from camera_sources import LandmarkTraceRecorder, open_source
+from controller import DEFAULT_POSE_FILTER, InputHandler
+from input_events import DUCK_START, HAND_RAISE, JUMP
+from latency import percentile
+from settings import (
+    POSE_MODEL_COMPLEXITY,
+    POSE_INFERENCE_WIDTH,
+)
+
+
+def run_benchmark(
+    source_path: str,
+    realtime: bool = False,
+    use_process: bool = False,
+    model_complexity: int = POSE_MODEL_COMPLEXITY,
+    inference_width: int = POSE_INFERENCE_WIDTH,
+    pose_filter=DEFAULT_POSE_FILTER,
+    record_trace: Optional[str] = None,
+) -> dict:
+    """Pasa un vídeo o una traza por InputHandler y mide la entrada.
+
+    Los eventos se cuentan directamente de la cola, sin bucle de juego, así
+    el resultado solo depende de la fuente y de la configuración de pose.
+    """
+    source = open_source(source_path, realtime)
+    recorder = LandmarkTraceRecorder() if record_trace else None
+
+    start = time.perf_counter()
+    handler = InputHandler(
+        source=source,
+        use_process=use_process,
+        model_complexity=model_complexity,
+        inference_width=inference_width,
+        pose_filter=pose_filter,
+        trace_recorder=recorder,
+        log_frames=True,
+    )
+    startup = time.perf_counter() - start
+
+    counts = {JUMP: 0, DUCK_START: 0, HAND_RAISE: 0}
+    start = time.perf_counter()
+    while handler.camera_thread.is_alive() or len(handler.events):
+        event = handler.events.pop()
+        if event is None:
+            time.sleep(0.005)
+            continue
+        if event.kind in counts:
+            counts[event.kind] += 1
+    elapsed = time.perf_counter() - start
+
+    stats = handler.get_pipeline_stats()
+    frame_log = handler.frame_log
+    handler.close()
+    if recorder is not None:
+        recorder.save(record_trace)
+
+    latencies = sorted((done - captured) * 1000.0 for captured, done in frame_log)
+    processed = len(frame_log)
+    return {
+        "source": source_path,
+        "realtime": realtime,
+        "process": use_process,
+        "startup_s": startup,
+        "elapsed_s": elapsed,
+        "processed_frames": processed,
+        "dropped_frames": stats["dropped_frames"],
+        "inference_fps": processed / elapsed if elapsed > 0 else 0.0,
+        "latency_ms": {
+            "p50": percentile(latencies, 0.50),
+            "p95": percentile(latencies, 0.95),
+            "p99": percentile(latencies, 0.99),
+            "max": latencies[-1] if latencies else 0.0,
+        },
+        "jumps": counts[JUMP],
+        "ducks": counts[DUCK_START],
+        "hand_raises": counts[HAND_RAISE],
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Benchmark de la entrada por pose con un vídeo o una traza"
+    )
+    parser.add_argument("source", help="vídeo grabado o traza de landmarks (.npz)")
+    parser.add_argument(
+        "--realtime",
+        action="store_true",
+        help="reproduce al ritmo grabado (descarta frames como la cámara)",
+    )
+    parser.add_argument("--pose-process", action="store_true")
+    parser.add_argument(
+        "--model-complexity",
+        type=int,
+        choices=(0, 1, 2),
+        default=POSE_MODEL_COMPLEXITY,
+    )
+    parser.add_argument("--inference-width", type=int, default=POSE_INFERENCE_WIDTH)
+    parser.add_argument("--no-pose-filter", action="store_true")
+    parser.add_argument(
+        "--record-trace",
+        metavar="RUTA",
+        help="guarda los landmarks del vídeo como traza .npz",
+    )
+    parser.add_argument("--json", metavar="RUTA", help="guarda el resultado en JSON")
+    args = parser.parse_args()
+
+    result = run_benchmark(
+        args.source,
+        realtime=args.realtime,
+        use_process=args.pose_process,
+        model_complexity=args.model_complexity,
+        inference_width=args.inference_width,
+        pose_filter=None if args.no_pose_filter else DEFAULT_POSE_FILTER,
+        record_trace=args.record_trace,
+    )
+    latency = result["latency_ms"]
+    print(
+        f"{result['processed_frames']} frames en {result['elapsed_s']:.2f} s "
+        f"({result['inference_fps']:.1f} fps) | descartados "
+        f"{result['dropped_frames']} | arranque {result['startup_s']:.2f} s"
+    )
+    print(
+        f"latencia captura -> decisión: p50 {latency['p50']:.1f} "
+        f"p95 {latency['p95']:.1f} p99 {latency['p99']:.1f} "
+        f"max {latency['max']:.1f} ms"
+    )
+    print(
+        f"saltos {result['jumps']} | agachadas {result['ducks']} | "
+        f"manos arriba {result['hand_raises']}"
+    )
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(result, f, indent=2)
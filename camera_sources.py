@@ -0,0 +1,180 @@
+import threading
+import time
+from typing import Optional
+
+import numpy as np
+
+from pose_landmarks import NUM_LANDMARKS
+
+
+def open_camera(index: int = 0):
+    import cv2
+
+    cap = cv2.VideoCapture(index)
+    # Sin cola en el driver: el frame más reciente lo decide LatestFrameSlot
+    cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+    return cap
+
+
+class VideoFileSource:
+    """Vídeo grabado con la misma interfaz que cv2.VideoCapture.
+
+    Con `realtime` los frames salen al ritmo del vídeo y, como con la cámara,
+    se descartan si la inferencia no llega. Sin él se leen lo más rápido
+    posible y `lossless` pide a InputHandler procesarlos todos.
+    """
+
+    has_images = True
+
+    def __init__(self, path: str, realtime: bool = False) -> None:
+        # Import local: las trazas de landmarks no necesitan cv2
+        import cv2
+
+        self.cap = cv2.VideoCapture(path)
+        if not self.cap.isOpened():
+            raise RuntimeError(f"No se pudo abrir el vídeo {path}")
+        self.realtime = realtime
+        self.lossless = not realtime
+        self.fps = self.cap.get(cv2.CAP_PROP_FPS) or 30.0
+        self.frame_index = 0
+        # Tiempo del último frame dentro del vídeo, en segundos
+        self.media_time = 0.0
+        self._start = 0.0
+
+    def isOpened(self) -> bool:
+        return self.cap.isOpened()
+
+    def read(self) -> tuple[bool, Optional[np.ndarray]]:
+        if self.realtime:
+            if self.frame_index == 0:
+                self._start = time.perf_counter()
+            delay = self._start + self.frame_index / self.fps - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+
+        ret, frame = self.cap.read()
+        if not ret:
+            # Fin del vídeo: el bucle de captura termina con isOpened()
+            self.cap.release()
+            return False, None
+        self.media_time = self.frame_index / self.fps
+        self.frame_index += 1
+        return True, frame
+
+    def get(self, prop: int) -> float:
+        return self.cap.get(prop)
+
+    def set(self, prop: int, value: float) -> bool:
+        # El ritmo lo marca el vídeo: se ignoran CAP_PROP_FPS y compañía
+        return False
+
+    def release(self) -> None:
+        self.cap.release()
+
+
+def load_trace(path: str) -> tuple[np.ndarray, np.ndarray]:
+    """Devuelve (timestamps, landmarks); sin pose la fila es NaN."""
+    with np.load(path) as data:
+        return data["timestamps"].astype(np.float64), data["landmarks"]
+
+
+class LandmarkTraceSource:
+    """Reproduce una traza de landmarks grabada sin pasar por MediaPipe.
+
+    Cada "frame" es un array (33, 3) de x, y, visibility; InputHandler lo
+    clasifica con TraceProcessor. Con `realtime` respeta los tiempos
+    grabados, si no entrega las muestras seguidas y sin pérdidas.
+    """
+
+    has_images = False
+
+    def __init__(self, path: str, realtime: bool = False) -> None:
+        self.timestamps, landmarks = load_trace(path)
+        self.landmarks = landmarks.astype(np.float32)
+        self.realtime = realtime
+        self.lossless = not realtime
+        self.frame_index = 0
+        self.media_time = 0.0
+        self._start = 0.0
+        self._open = True
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def isOpened(self) -> bool:
+        return self._open
+
+    def read(self) -> tuple[bool, Optional[np.ndarray]]:
+        if self.frame_index >= len(self.timestamps):
+            self._open = False
+            return False, None
+
+        offset = self.timestamps[self.frame_index] - self.timestamps[0]
+        if self.realtime:
+            if self.frame_index == 0:
+                self._start = time.perf_counter()
+            delay = self._start + offset - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+
+        self.media_time = float(offset)
+        landmarks = self.landmarks[self.frame_index]
+        self.frame_index += 1
+        return True, landmarks
+
+    def get(self, prop: int) -> float:
+        return 0.0
+
+    def set(self, prop: int, value: float) -> bool:
+        return False
+
+    def release(self) -> None:
+        self._open = False
+
+
+class LandmarkTraceRecorder:
+    """Acumula landmarks por frame y los guarda como .npz comprimido.
+
+    Los landmarks se guardan en float16 (sobra para coordenadas
+    normalizadas); un frame sin pose queda como fila NaN.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._timestamps: list[float] = []
+        self._landmarks: list[np.ndarray] = []
+        self._empty = np.full((NUM_LANDMARKS, 3), np.nan, dtype=np.float16)
+
+    def __len__(self) -> int:
+        return len(self._timestamps)
+
+    def add(self, timestamp: float, landmarks: Optional[np.ndarray]) -> None:
+        row = (
+            self._empty
+            if landmarks is None
+            else landmarks.reshape(NUM_LANDMARKS, 3).astype(np.float16)
+        )
+        with self._lock:
+            self._timestamps.append(timestamp)
+            self._landmarks.append(row)
+
+    def save(self, path: str) -> None:
+        with self._lock:
+            timestamps = np.array(self._timestamps, dtype=np.float64)
+            landmarks = (
+                np.stack(self._landmarks)
+                if self._landmarks
+                else np.empty((0, NUM_LANDMARKS, 3), dtype=np.float16)
+            )
+        np.savez_compressed(path, timestamps=timestamps, landmarks=landmarks)
+
+
+def open_source(spec: Optional[str] = None, realtime: bool = False):
+    """Cámara (None o un índice), traza de landmarks (.npz) o vídeo."""
+    if spec is None:
+        return open_camera(0)
+    if spec.isdigit():
+        return open_camera(int(spec))
+    if spec.endswith(".npz"):
+        return LandmarkTraceSource(spec, realtime)
+    return VideoFileSource(spec, realtime)
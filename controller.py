@@ -1,237 +1,509 @@
-import cv2
-import mediapipe as mp
 import threading
 import time
 import numpy as np
 from typing import Optional
+from camera_sources import LandmarkTraceRecorder, open_camera
+from frame_buffers import LatestFrameSlot, PreviewBuffer
+from inference_budget import InferenceBudget
+from latency import LatencyTracker
+from input_events import (
+    InputEvent,
+    SPSCQueue,
+    JUMP,
+    JUMP_END,
+    DUCK_START,
+    DUCK_END,
+    HAND_RAISE,
+    HAND_LOWER,
+)
+from pose_overlay import PoseOverlay
+from pose_landmarks import NUM_LANDMARKS, TraceProcessor
+from profiler import FrameProfiler
+from settings import (
+    CAMERA_PREVIEW_SIZE,
+    POSE_MODEL_COMPLEXITY,
+    POSE_INFERENCE_WIDTH,
+    POSE_BUDGET_MS,
+    POSE_FILTER_ENABLED,
+    POSE_FILTER_PARAMS,
+    POSE_UMBRAL_SALTO,
+    POSE_UMBRAL_AGACHARSE,
+    POSE_UMBRAL_MANO_RESET,
+)
+
+DEFAULT_POSE_FILTER = POSE_FILTER_PARAMS if POSE_FILTER_ENABLED else None
 
 
 class InputHandler:
-    def __init__(self) -> None:
-        self.mp_drawing = mp.solutions.drawing_utils
-        self.mp_pose = mp.solutions.pose
-
-        self.cap = cv2.VideoCapture(0)
-
-        self.pose = self.mp_pose.Pose(
-            min_detection_confidence=0.5, min_tracking_confidence=0.5
-        )
-
-        self.UMBRAL_SALTO = 0.4
-        self.UMBRAL_AGACHARSE = 0.7
-        self.UMBRAL_MANO_RESET = 0.3
-
-        self.lock = threading.Lock()
+    def __init__(
+        self,
+        source=None,
+        use_process: bool = False,
+        model_complexity: int = POSE_MODEL_COMPLEXITY,
+        inference_width: int = POSE_INFERENCE_WIDTH,
+        budget_ms: float = POSE_BUDGET_MS,
+        pose_filter: Optional[dict] = DEFAULT_POSE_FILTER,
+        trace_recorder: Optional[LandmarkTraceRecorder] = None,
+        log_frames: bool = False,
+        profiler: Optional[FrameProfiler] = None,
+    ) -> None:
+        # Cámara por defecto, o una fuente de camera_sources (vídeo o traza)
+        self.cap = source if source is not None else open_camera(0)
+        # Una traza ya trae landmarks: no hay imagen que inferir ni previsualizar
+        self.has_images = getattr(self.cap, "has_images", True)
+        # Fuentes grabadas leídas a toda velocidad: se procesan todos los frames
+        self.lossless = getattr(self.cap, "lossless", False)
+        if use_process and not self.has_images:
+            raise ValueError("Una traza de landmarks no necesita el worker de pose")
+
+        self.UMBRAL_SALTO = POSE_UMBRAL_SALTO
+        self.UMBRAL_AGACHARSE = POSE_UMBRAL_AGACHARSE
+        self.UMBRAL_MANO_RESET = POSE_UMBRAL_MANO_RESET
+
+        # Estado del lado del juego: solo lo toca update() y los getters
         self.jump_pressed = False
         self.jump_triggered = False
         self.duck_pressed = False
-        self.was_jumping = False
-
         self.hand_raised = False
         self.hand_raise_triggered = False
+
+        # Estado del lado de la cámara: solo lo toca _publish_state
+        self.was_jumping = False
+        self.was_ducking = False
         self.was_hand_raised = False
+        self._reset_requested = False
+
+        # Los flancos viajan como eventos con marca de tiempo; update() los
+        # vacía una vez por frame, así ninguno se pierde entre dos sondeos
+        self.events = SPSCQueue()
 
         self.game_over_state = False
 
-        self.current_frame = None
-        self.frame_lock = threading.Lock()
+        # Vista previa ya escalada, en RGB y en layout de surfarray (ancho, alto)
+        preview_width, preview_height = CAMERA_PREVIEW_SIZE
+        self.preview_shape = (preview_width, preview_height, 3)
+        self.preview = PreviewBuffer(self.preview_shape)
+        self._preview_scratch = np.empty((preview_height, preview_width, 3), np.uint8)
+
+        self.frame_slot = LatestFrameSlot()
+        self.pose_overlay: Optional[PoseOverlay] = None
+        self.processed_frames = 0
+        self.latency = LatencyTracker()
+        self._frame_done = threading.Event()
+        self.trace_recorder = trace_recorder
+        # Con log_frames, (captura, fin de inferencia) de cada frame procesado
+        self.frame_log: Optional[list[tuple[float, float]]] = [] if log_frames else None
+
+        # En modo proceso la inferencia corre fuera de este intérprete (sin GIL
+        # compartido con pygame); si no, en un hilo con su propio PoseProcessor
+        self.use_process = use_process
+        self.pose_options = {
+            "model_complexity": model_complexity,
+            "inference_width": inference_width,
+            "pose_filter": pose_filter,
+        }
+        self.pose_client = None
+        self.processor = None
+
+        # Presupuesto adaptativo: ajusta fps, resolución y modelo en marcha
+        self.budget = InferenceBudget(budget_ms) if budget_ms > 0 else None
+        self._applied_level = None
+        self._capture_interval = 0.0
+        # cv2.VideoCapture no es thread-safe: los fps pedidos los aplica el
+        # hilo de captura entre lecturas
+        self._requested_fps: Optional[int] = None
+
+        # Tiempos de captura, inferencia y vista previa del hilo de la cámara
+        self.profiler = profiler if profiler is not None and profiler.enabled else None
+
+        if use_process:
+            self._start_pose_process()
+        elif self.has_images:
+            from pose_pipeline import PoseProcessor
+
+            self.processor = PoseProcessor(**self.pose_options)
+            if self.profiler is not None:
+                # Solo MediaPipe; el resto de camera.process es clasificación
+                self.profiler.instrument(self.processor, "_infer", "camera.inference")
+        else:
+            self.processor = TraceProcessor(pose_filter)
 
         self.running = True
         self.camera_thread = None
+        self.inference_thread = None
         self._start_camera_thread()
 
+    def _start_pose_process(self) -> None:
+        from pose_worker import PoseProcessClient
+
+        ret, frame = self.cap.read()
+        if not ret:
+            raise RuntimeError("No se pudo leer la cámara para iniciar el worker")
+        self.pose_client = PoseProcessClient(
+            frame.shape, self.preview_shape, self.pose_options
+        )
+        self._update_pose_control()
+        if self.budget is not None:
+            self._apply_budget_level()
+        self.pose_client.submit(frame, time.perf_counter(), self._media_time())
+
+    def _media_time(self) -> Optional[float]:
+        # Tiempo del frame dentro del vídeo o la traza; None con la cámara
+        return getattr(self.cap, "media_time", None)
+
+    def _wait_frame_done(self) -> None:
+        while self.running and not self._frame_done.wait(timeout=0.5):
+            if self.pose_client is not None and not self.pose_client.is_alive():
+                break
+        self._frame_done.clear()
+
+    def _update_pose_control(self) -> None:
+        if self.pose_client is not None:
+            self.pose_client.set_control(
+                self.game_over_state,
+                self.UMBRAL_SALTO,
+                self.UMBRAL_AGACHARSE,
+                self.UMBRAL_MANO_RESET,
+            )
+
     def _start_camera_thread(self) -> None:
         if self.camera_thread is None or not self.camera_thread.is_alive():
             self.running = True
-            self.camera_thread = threading.Thread(target=self._camera_loop, daemon=True)
+            self.camera_thread = threading.Thread(
+                target=self._capture_loop, daemon=True
+            )
             self.camera_thread.start()
-
-    def _camera_loop(self) -> None:
+        if self.inference_thread is None or not self.inference_thread.is_alive():
+            target = self._result_loop if self.use_process else self._camera_loop
+            self.inference_thread = threading.Thread(target=target, daemon=True)
+            self.inference_thread.start()
+
+    def _apply_budget_level(self) -> None:
+        level = self.budget.level
+        if level != self._applied_level:
+            if self.pose_client is not None:
+                self.pose_client.set_pose_config(
+                    level.inference_width, level.model_complexity
+                )
+            else:
+                self.processor.configure(level.inference_width, level.model_complexity)
+            self._requested_fps = level.camera_fps
+            self._applied_level = level
+        # Margen del 10 % para no descartar frames por jitter de la cámara
+        self._capture_interval = 0.9 * self.budget.frame_stride / level.camera_fps
+
+    def _capture_loop(self) -> None:
+        last_submit = 0.0
+        # En modo proceso el primer frame ya se envió al arrancar el worker
+        in_flight = self.pose_client is not None
+        profiler = self.profiler
+        camera_fps = None
+        # Una traza no tiene fps de cámara que ajustar (ni hace falta cv2)
+        fps_prop = None
+        if self.has_images:
+            import cv2
+
+            fps_prop = cv2.CAP_PROP_FPS
         while self.running and self.cap.isOpened():
+            requested_fps = self._requested_fps
+            if fps_prop is not None and requested_fps != camera_fps:
+                self.cap.set(fps_prop, requested_fps)
+                camera_fps = requested_fps
+            start = time.perf_counter()
             ret, frame = self.cap.read()
+            if profiler is not None:
+                profiler.record("camera.capture", start, time.perf_counter())
             if not ret:
                 time.sleep(0.01)
                 continue
+            now = time.perf_counter()
+            if now - last_submit < self._capture_interval:
+                continue
+            last_submit = now
+            if self.lossless and in_flight:
+                # Se lee el frame siguiente mientras se infiere el anterior
+                self._wait_frame_done()
+            in_flight = True
+            if self.pose_client is not None:
+                self.pose_client.submit(frame, time.perf_counter(), self._media_time())
+            else:
+                self.frame_slot.put(frame, time.perf_counter(), self._media_time())
+        if self.lossless and in_flight:
+            self._wait_frame_done()
+        self.frame_slot.close()
 
-            image = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            image.flags.writeable = False
-
-            results = self.pose.process(image)
-
-            image.flags.writeable = True
-            image = cv2.cvtColor(image, cv2.COLOR_RGB2BGR)
-
-            height, width, _ = image.shape
+    def _camera_loop(self) -> None:
+        if self.has_images:
+            from pose_pipeline import render_preview
+
+        while self.running:
+            item = self.frame_slot.take(timeout=0.5)
+            if item is None:
+                if not self.camera_thread.is_alive():
+                    break
+                continue
+            frame, capture_time, _, media_time = item
+
+            if self.budget is not None:
+                self._apply_budget_level()
+            start = time.perf_counter()
+            result = self.processor.process(
+                frame,
+                self.game_over_state,
+                self.UMBRAL_SALTO,
+                self.UMBRAL_AGACHARSE,
+                self.UMBRAL_MANO_RESET,
+                media_time,
+            )
+            inference_time = time.perf_counter()
+            if self.budget is not None:
+                self.budget.record(inference_time - start)
+            if self.profiler is not None:
+                self.profiler.record("camera.process", start, inference_time)
+            self._publish_state(
+                result.jump,
+                result.duck,
+                result.hand_raised,
+                capture_time,
+                inference_time,
+            )
+            self._publish_overlay(
+                result.landmarks, result.jump, result.duck, result.hand_raised
+            )
+            if self.trace_recorder is not None:
+                self.trace_recorder.add(media_time, result.landmarks)
+
+            if self.has_images:
+                start = time.perf_counter()
+                render_preview(frame, self.preview.back_buffer(), self._preview_scratch)
+                self.preview.publish()
+                if self.profiler is not None:
+                    self.profiler.record("camera.preview", start, time.perf_counter())
+
+    def _result_loop(self) -> None:
+        from pose_worker import (
+            FLAG_JUMP,
+            FLAG_DUCK,
+            FLAG_HAND_RAISED,
+            FLAG_HAS_POSE,
+            RESULT_HEADER_FIELDS,
+        )
 
-            if self.game_over_state:
-                cv2.line(
-                    image,
-                    (0, int(height * self.UMBRAL_MANO_RESET)),
-                    (width, int(height * self.UMBRAL_MANO_RESET)),
-                    (255, 0, 255),
-                    2,
-                )
-            else:
-                cv2.line(
-                    image,
-                    (0, int(height * self.UMBRAL_SALTO)),
-                    (width, int(height * self.UMBRAL_SALTO)),
-                    (0, 255, 0),
-                    2,
-                )
+        while self.running:
+            record = self.pose_client.wait_result(
+                timeout=0.5, out_preview=self.preview.back_buffer()
+            )
+            if record is None:
+                if not self.pose_client.is_alive():
+                    break
+                continue
 
-                cv2.line(
-                    image,
-                    (0, int(height * self.UMBRAL_AGACHARSE)),
-                    (width, int(height * self.UMBRAL_AGACHARSE)),
-                    (0, 0, 255),
-                    2,
+            self.preview.publish()
+            if self.profiler is not None:
+                done = float(record[2])
+                self.profiler.record(
+                    "worker.process", done - float(record[4]), done, "pose worker"
                 )
+            if self.budget is not None:
+                self.budget.record(float(record[4]))
+                self._apply_budget_level()
+            flags = int(record[3])
+            self._publish_state(
+                bool(flags & FLAG_JUMP),
+                bool(flags & FLAG_DUCK),
+                bool(flags & FLAG_HAND_RAISED),
+                float(record[1]),
+                float(record[2]),
+            )
+            landmarks = None
+            if flags & FLAG_HAS_POSE:
+                # El registro se reutiliza en la siguiente lectura
+                landmarks = record[RESULT_HEADER_FIELDS:].reshape(NUM_LANDMARKS, 3)
+                landmarks = landmarks.astype(np.float32)
+            self._publish_overlay(
+                landmarks,
+                bool(flags & FLAG_JUMP),
+                bool(flags & FLAG_DUCK),
+                bool(flags & FLAG_HAND_RAISED),
+            )
+            if self.trace_recorder is not None:
+                self.trace_recorder.add(float(record[5]), landmarks)
+
+    def _publish_state(
+        self,
+        current_jump_state: bool,
+        current_duck_state: bool,
+        current_hand_raised: bool,
+        capture_time: float,
+        inference_time: float,
+    ) -> None:
+        if self._reset_requested:
+            self._reset_requested = False
+            self.was_jumping = False
+            self.was_ducking = False
+            self.was_hand_raised = False
 
-            current_jump_state = False
-            current_duck_state = False
-            current_hand_raised = False
-
-            if results.pose_landmarks:
-                landmarks = results.pose_landmarks.landmark
-                nose_y = landmarks[self.mp_pose.PoseLandmark.NOSE].y
-
-                if self.game_over_state:
-                    left_wrist = landmarks[self.mp_pose.PoseLandmark.LEFT_WRIST]
-                    right_wrist = landmarks[self.mp_pose.PoseLandmark.RIGHT_WRIST]
-
-                    if (
-                        left_wrist.y < self.UMBRAL_MANO_RESET
-                        or right_wrist.y < self.UMBRAL_MANO_RESET
-                    ):
-                        current_hand_raised = True
-                        cv2.putText(
-                            image,
-                            "MANO ARRIBA - RESET",
-                            (10, 90),
-                            cv2.FONT_HERSHEY_SIMPLEX,
-                            0.7,
-                            (255, 0, 255),
-                            2,
-                        )
-
-                if nose_y < self.UMBRAL_SALTO:
-                    current_jump_state = True
-                    cv2.putText(
-                        image,
-                        "SALTANDO",
-                        (10, 50),
-                        cv2.FONT_HERSHEY_SIMPLEX,
-                        1,
-                        (0, 255, 0),
-                        2,
-                    )
-
-                elif nose_y > self.UMBRAL_AGACHARSE:
-                    current_duck_state = True
-                    cv2.putText(
-                        image,
-                        "AGACHADO",
-                        (10, 50),
-                        cv2.FONT_HERSHEY_SIMPLEX,
-                        1,
-                        (0, 0, 255),
-                        2,
-                    )
-                else:
-                    cv2.putText(
-                        image,
-                        "NEUTRO",
-                        (10, 50),
-                        cv2.FONT_HERSHEY_SIMPLEX,
-                        1,
-                        (255, 255, 255),
-                        2,
+        published_time = time.perf_counter()
+        for current, previous, start_kind, end_kind in (
+            (current_jump_state, self.was_jumping, JUMP, JUMP_END),
+            (current_duck_state, self.was_ducking, DUCK_START, DUCK_END),
+            (current_hand_raised, self.was_hand_raised, HAND_RAISE, HAND_LOWER),
+        ):
+            if current != previous:
+                self.events.push(
+                    InputEvent(
+                        start_kind if current else end_kind,
+                        capture_time,
+                        inference_time,
+                        published_time,
                     )
-
-                self.mp_drawing.draw_landmarks(
-                    image, results.pose_landmarks, self.mp_pose.POSE_CONNECTIONS
                 )
 
-            with self.lock:
-                if current_jump_state and not self.was_jumping:
-                    self.jump_triggered = True
-                else:
-                    self.jump_triggered = False
-
-                self.jump_pressed = current_jump_state
-                self.duck_pressed = current_duck_state
-                self.was_jumping = current_jump_state
-
-                if current_hand_raised and not self.was_hand_raised:
-                    self.hand_raise_triggered = True
-                else:
-                    self.hand_raise_triggered = False
-
-                self.hand_raised = current_hand_raised
-                self.was_hand_raised = current_hand_raised
-
-            with self.frame_lock:
-                self.current_frame = image.copy()
-
-            if cv2.waitKey(1) & 0xFF == ord("q"):
-                self.close()
-                break
+        self.was_jumping = current_jump_state
+        self.was_ducking = current_duck_state
+        self.was_hand_raised = current_hand_raised
+        self.processed_frames += 1
+        if self.frame_log is not None:
+            self.frame_log.append((capture_time, inference_time))
+        self._frame_done.set()
+
+    def _publish_overlay(
+        self,
+        landmarks: Optional[np.ndarray],
+        jump: bool,
+        duck: bool,
+        hand_raised: bool,
+    ) -> None:
+        # Se sustituye la referencia entera: el juego nunca ve uno a medias
+        self.pose_overlay = PoseOverlay(
+            landmarks,
+            jump,
+            duck,
+            hand_raised,
+            self.game_over_state,
+            self.UMBRAL_SALTO,
+            self.UMBRAL_AGACHARSE,
+            self.UMBRAL_MANO_RESET,
+        )
 
     # No lo elimines es necesario para Pygame
     def update(self) -> None:
-        pass
+        while True:
+            event = self.events.pop()
+            if event is None:
+                break
+            kind = event.kind
+            if kind == JUMP:
+                self.jump_pressed = True
+                self.jump_triggered = True
+                self.latency.publish(
+                    event.capture_time, event.inference_time, event.published_time
+                )
+            elif kind == JUMP_END:
+                self.jump_pressed = False
+            elif kind == DUCK_START:
+                self.duck_pressed = True
+            elif kind == DUCK_END:
+                self.duck_pressed = False
+            elif kind == HAND_RAISE:
+                self.hand_raised = True
+                self.hand_raise_triggered = True
+            elif kind == HAND_LOWER:
+                self.hand_raised = False
 
     def reset(self) -> None:
-        with self.lock:
-            self.jump_pressed = False
-            self.jump_triggered = False
-            self.duck_pressed = False
-            self.was_jumping = False
-            self.hand_raised = False
-            self.hand_raise_triggered = False
-            self.was_hand_raised = False
-            self.game_over_state = False
+        while self.events.pop() is not None:
+            pass
+        self.jump_pressed = False
+        self.jump_triggered = False
+        self.duck_pressed = False
+        self.hand_raised = False
+        self.hand_raise_triggered = False
+        self.game_over_state = False
+        self._reset_requested = True
+        self.latency.reset()
+        self._update_pose_control()
+        if self.budget is not None:
+            self.budget.set_game_over(False)
 
     def set_game_over(self, is_game_over: bool) -> None:
-        with self.lock:
-            self.game_over_state = is_game_over
-
-    def get_camera_frame(self) -> Optional[np.ndarray]:
-        with self.frame_lock:
-            if self.current_frame is not None:
-                frame_rgb = cv2.cvtColor(self.current_frame, cv2.COLOR_BGR2RGB)
-                frame_rgb = cv2.flip(frame_rgb, 1)
-                frame_rgb = np.rot90(frame_rgb)
-                return frame_rgb
+        changed = self.game_over_state != is_game_over
+        self.game_over_state = is_game_over
+        if changed:
+            self._update_pose_control()
+            if self.budget is not None:
+                self.budget.set_game_over(is_game_over)
+
+    def tick_inputs(self) -> None:
+        # La pose se lee del estado que deja update(), no se genera por tick
         return None
 
+    def get_camera_preview(self, last_seq: int) -> tuple[int, Optional[np.ndarray]]:
+        """Vista previa lista para blit_array, o None si no llegó un frame nuevo."""
+        return self.preview.acquire(last_seq)
+
+    def get_pose_overlay(self) -> Optional[PoseOverlay]:
+        """Landmarks y estado del último frame, para dibujar sobre la vista previa."""
+        return self.pose_overlay
+
+    def get_pipeline_stats(self) -> dict:
+        latency = self.latency.summary()
+        if self.pose_client is not None:
+            captured = self.pose_client.frames.write_seq
+            dropped = self.pose_client.dropped_frames
+        else:
+            captured = self.frame_slot.published
+            dropped = self.frame_slot.dropped
+        return {
+            "captured_frames": captured,
+            "dropped_frames": dropped,
+            "processed_frames": self.processed_frames,
+            "event_overflows": self.events.overflows,
+            "median_jump_latency_ms": latency["total"]["p50"],
+        }
+
+    def frame_presented(self) -> None:
+        """Llamar justo después de pygame.display.update."""
+        self.latency.present(time.perf_counter())
+
+    def get_budget_state(self) -> Optional[dict]:
+        return self.budget.state() if self.budget is not None else None
+
     def is_jump_just_pressed(self) -> bool:
-        with self.lock:
-            result = self.jump_triggered
-            if result:
-                self.jump_triggered = False
-            return result
+        result = self.jump_triggered
+        if result:
+            self.jump_triggered = False
+            self.latency.consume(time.perf_counter())
+        return result
 
     def is_jump_held(self) -> bool:
-        with self.lock:
-            return self.jump_pressed
+        return self.jump_pressed
 
     def is_duck_held(self) -> bool:
-        with self.lock:
-            return self.duck_pressed
+        return self.duck_pressed
 
     def is_hand_raised_just_now(self) -> bool:
-        with self.lock:
-            result = self.hand_raise_triggered
-            if result:
-                self.hand_raise_triggered = False
-            return result
+        result = self.hand_raise_triggered
+        if result:
+            self.hand_raise_triggered = False
+        return result
 
     def close(self) -> None:
         self.running = False
-        if self.camera_thread and self.camera_thread.is_alive():
-            self.camera_thread.join(timeout=1.0)
+        self.frame_slot.close()
+        for thread in (self.camera_thread, self.inference_thread):
+            if (
+                thread
+                and thread.is_alive()
+                and thread is not threading.current_thread()
+            ):
+                thread.join(timeout=1.0)
+        if self.pose_client is not None:
+            self.pose_client.close()
+            self.pose_client = None
+        if self.processor is not None:
+            self.processor.close()
+            self.processor = None
         if self.cap.isOpened():
             self.cap.release()
 
@@ -1,10 +1,27 @@
-import pygame
-import os
+from assets import dino_images, shaded
 from settings import DINO_X_POS, GROUND_Y_POS, GRAVITY, JUMP_VELOCITY, MIN_JUMP_HEIGHT
 
 
 class Dinosaur:
     def __init__(self):
+        # Surfaces compartidas del registro de assets: solo se leen de disco
+        # la primera vez en todo el proceso
+        images = dino_images()
+        self.run_img_1 = images["run_1"]
+        self.run_img_2 = images["run_2"]
+        self.run_list = [self.run_img_1, self.run_img_2]
+
+        self.jump_img = images["jump"]
+
+        self.duck_img_1 = images["duck_1"]
+        self.duck_img_2 = images["duck_2"]
+        self.duck_list = [self.duck_img_1, self.duck_img_2]
+
+        self.y_pos_offset = 15
+        self.reset()
+
+    def reset(self) -> None:
+        """Vuelve al estado inicial sin recargar imágenes."""
         self.is_jumping = False
         self.is_ducking = False
         self.is_running = True
@@ -13,30 +30,16 @@ class Dinosaur:
         self.y_velocity = 0
         self.step_index = 0
 
-        self.y_pos_offset = 15
-
-        def load_img(name, w, h):
-            path = os.path.join("sprites", name)
-            img = pygame.image.load(path).convert_alpha()
-            return pygame.transform.scale(img, (w, h))
-
-        self.run_img_1 = load_img("dino_running_1.png", 48, 50)
-        self.run_img_2 = load_img("dino_running_2.png", 48, 50)
-        self.run_list = [self.run_img_1, self.run_img_2]
-
-        self.jump_img = load_img("dino_jumping.png", 48, 50)
-
-        self.duck_img_1 = load_img("dino_down_1.png", 57, 32)
-        self.duck_img_2 = load_img("dino_down_2.png", 57, 32)
-        self.duck_list = [self.duck_img_1, self.duck_img_2]
-
         self.image = self.run_list[0]
         self.rect = self.image.get_rect()
         self.rect.x = DINO_X_POS
 
         self.rect.y = GROUND_Y_POS - self.rect.height + self.y_pos_offset
+        # Posición al empezar el tick, para interpolar el render
+        self.prev_y = self.rect.y
 
     def update(self, input_handler) -> None:
+        self.prev_y = self.rect.y
         if self.is_ducking:
             self.animate(self.duck_list)
         elif self.is_jumping:
@@ -92,10 +95,13 @@ class Dinosaur:
     def start_duck(self) -> None:
         self.is_ducking = True
         self.rect.y = GROUND_Y_POS - self.rect.height + self.y_pos_offset
+        # Cambio de sprite: se salta a la nueva altura sin interpolar
+        self.prev_y = self.rect.y
 
     def end_duck(self) -> None:
         self.is_ducking = False
         self.rect.y = GROUND_Y_POS - self.rect.height + self.y_pos_offset
+        self.prev_y = self.rect.y
 
     def apply_physics(self) -> None:
         self.y_velocity += GRAVITY
@@ -114,5 +120,8 @@ class Dinosaur:
         else:
             self.on_ground = False
 
-    def draw(self, screen) -> None:
-        screen.blit(self.image, (self.rect.x, self.rect.y))
+    def draw(self, screen, alpha: float = 1.0, shade: int = 0) -> None:
+        """`alpha` es la fracción del tick actual ya transcurrida y `shade`
+        el paso del fundido día/noche (GameState.night_step)."""
+        y = self.prev_y + (self.rect.y - self.prev_y) * alpha
+        screen.blit(shaded(self.image, shade), (self.rect.x, round(y)))
@@ -0,0 +1,94 @@
+import threading
+from typing import Optional
+
+import numpy as np
+
+
+class LatestFrameSlot:
+    """Buffer de un solo hueco entre captura e inferencia.
+
+    El productor siempre sobrescribe: si el consumidor no llegó a tomar el
+    frame anterior, ese frame se descarta y se cuenta en `dropped`.
+
+    Además del instante de captura guarda el tiempo del frame dentro de su
+    fuente (vídeo o traza), que es el que usa el filtro de pose.
+    """
+
+    def __init__(self) -> None:
+        self._cond = threading.Condition()
+        self._frame: Optional[np.ndarray] = None
+        self._timestamp = 0.0
+        self._media_time = 0.0
+        self._seq = 0
+        self._closed = False
+
+        self.published = 0
+        self.dropped = 0
+
+    def put(
+        self, frame: np.ndarray, timestamp: float, media_time: Optional[float] = None
+    ) -> None:
+        with self._cond:
+            if self._frame is not None:
+                self.dropped += 1
+            self._frame = frame
+            self._timestamp = timestamp
+            self._media_time = timestamp if media_time is None else media_time
+            self._seq += 1
+            self.published += 1
+            self._cond.notify()
+
+    def take(
+        self, timeout: Optional[float] = None
+    ) -> Optional[tuple[np.ndarray, float, int, float]]:
+        with self._cond:
+            self._cond.wait_for(
+                lambda: self._frame is not None or self._closed, timeout
+            )
+            if self._frame is None:
+                return None
+            frame = self._frame
+            self._frame = None
+            return frame, self._timestamp, self._seq, self._media_time
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+
+class PreviewBuffer:
+    """Triple buffer para la vista previa de la cámara.
+
+    El productor escribe en `back_buffer()` y llama a `publish()`; el
+    consumidor obtiene el último publicado con `acquire()`. Ninguno de los dos
+    copia ni reserva memoria, y el productor nunca toca el buffer en lectura.
+    """
+
+    def __init__(self, shape: tuple[int, ...], dtype=np.uint8) -> None:
+        self._buffers = [np.zeros(shape, dtype=dtype) for _ in range(3)]
+        self._lock = threading.Lock()
+        self._back = 0
+        self._ready = 1
+        self._front = 2
+        self._ready_seq = 0
+        self._front_seq = 0
+
+    def back_buffer(self) -> np.ndarray:
+        return self._buffers[self._back]
+
+    def publish(self) -> int:
+        with self._lock:
+            self._back, self._ready = self._ready, self._back
+            self._ready_seq += 1
+            return self._ready_seq
+
+    def acquire(self, last_seq: int) -> tuple[int, Optional[np.ndarray]]:
+        """Devuelve (seq, buffer) o (last_seq, None) si no hay nada nuevo."""
+        with self._lock:
+            if self._ready_seq == last_seq:
+                return last_seq, None
+            if self._ready_seq != self._front_seq:
+                self._front, self._ready = self._ready, self._front
+                self._front_seq = self._ready_seq
+            return self._front_seq, self._buffers[self._front]
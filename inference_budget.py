@@ -0,0 +1,117 @@
+from typing import NamedTuple
+
+
+class BudgetLevel(NamedTuple):
+    camera_fps: int
+    inference_width: int  # 0 = resolución de la cámara
+    model_complexity: int
+
+
+# De más caro a más barato
+DEFAULT_LEVELS = (
+    BudgetLevel(30, 0, 1),
+    BudgetLevel(30, 480, 1),
+    BudgetLevel(30, 480, 0),
+    BudgetLevel(30, 320, 0),
+    BudgetLevel(20, 256, 0),
+    BudgetLevel(15, 192, 0),
+)
+
+# En game over solo importan las muñecas: resolución del nivel más barato y
+# 1 de cada N frames. Modelo y fps de cámara no cambian: reconstruir el modelo
+# o renegociar el stream de la cámara (cientos de ms en V4L2/DirectShow) al
+# perder y al reiniciar pararía la inferencia justo al empezar la partida
+GAME_OVER_FRAME_STRIDE = 3
+
+
+class InferenceBudget:
+    """Ajusta la calidad de la inferencia de pose a un presupuesto de tiempo.
+
+    Lleva una media exponencial del tiempo de inferencia por frame. Si supera
+    el objetivo baja un nivel; si queda holgadamente por debajo sube uno. Tras
+    cada cambio espera `hold_frames` frames para no oscilar.
+    """
+
+    def __init__(
+        self,
+        target_ms: float,
+        levels: tuple[BudgetLevel, ...] = DEFAULT_LEVELS,
+        alpha: float = 0.1,
+        headroom: float = 0.6,
+        hold_frames: int = 30,
+    ) -> None:
+        self.target_ms = target_ms
+        self.levels = levels
+        self.alpha = alpha
+        self.headroom = headroom
+        self.hold_frames = hold_frames
+
+        self.level_index = 0
+        self.average_ms = 0.0
+        self.game_over = False
+        self.frames = 0
+        self.frames_within_budget = 0
+        self.level_changes = 0
+        self._frames_since_change = 0
+
+    @property
+    def level(self) -> BudgetLevel:
+        level = self.levels[self.level_index]
+        if self.game_over:
+            return level._replace(inference_width=self.levels[-1].inference_width)
+        return level
+
+    @property
+    def frame_stride(self) -> int:
+        return GAME_OVER_FRAME_STRIDE if self.game_over else 1
+
+    def set_game_over(self, game_over: bool) -> None:
+        self.game_over = game_over
+
+    def record(self, inference_s: float) -> None:
+        elapsed_ms = inference_s * 1000.0
+        self.frames += 1
+        if elapsed_ms <= self.target_ms:
+            self.frames_within_budget += 1
+
+        # En game over se mide el nivel barato: no debe mover el adaptativo
+        if self.game_over:
+            return
+
+        if self.average_ms == 0.0:
+            self.average_ms = elapsed_ms
+        else:
+            self.average_ms += self.alpha * (elapsed_ms - self.average_ms)
+
+        self._frames_since_change += 1
+        if self._frames_since_change < self.hold_frames:
+            return
+
+        if self.average_ms > self.target_ms and self.level_index < len(self.levels) - 1:
+            self._change_level(self.level_index + 1)
+        elif self.average_ms < self.target_ms * self.headroom and self.level_index > 0:
+            self._change_level(self.level_index - 1)
+
+    def _change_level(self, index: int) -> None:
+        self.level_index = index
+        self.level_changes += 1
+        self._frames_since_change = 0
+        # La media del nivel anterior no describe el nuevo
+        self.average_ms = 0.0
+
+    def state(self) -> dict:
+        level = self.level
+        return {
+            "target_ms": self.target_ms,
+            "average_ms": self.average_ms,
+            "level_index": self.level_index,
+            "camera_fps": level.camera_fps,
+            "inference_width": level.inference_width,
+            "model_complexity": level.model_complexity,
+            "game_over_cadence": self.game_over,
+            "frame_stride": self.frame_stride,
+            "within_budget": (
+                self.frames_within_budget / self.frames if self.frames else 1.0
+            ),
+            "level_changes": self.level_changes,
+        }
@@ -0,0 +1,333 @@
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Callable, Optional, Protocol, Sequence
+
+import numpy as np
+import pygame
+
+from latency import LatencyTracker
+from pose_overlay import PoseOverlay
+from simulation import INPUT_DUCK_HELD, INPUT_JUMP_HELD, INPUT_JUMP_PRESSED
+
+
+class ActionInput(Protocol):
+    """Lo que consume Dinosaur.update en cada tick."""
+
+    def is_jump_just_pressed(self) -> bool: ...
+
+    def is_jump_held(self) -> bool: ...
+
+    def is_duck_held(self) -> bool: ...
+
+
+class InputBackend(ActionInput, Protocol):
+    """Entrada del juego; la implementan InputHandler (pose) y los de aquí.
+
+    main.py llama a update() una vez por frame antes de la simulación y
+    tick_inputs() en cada tick de simulación (ver sample_inputs).
+    """
+
+    latency: Optional[LatencyTracker]
+
+    def update(self) -> None: ...
+
+    def tick_inputs(self) -> Optional[int]:
+        """Bitfield INPUT_* generado para este tick, o None si se lee el estado."""
+        ...
+
+    def is_hand_raised_just_now(self) -> bool: ...
+
+    def set_game_over(self, is_game_over: bool) -> None: ...
+
+    def reset(self) -> None: ...
+
+    def get_camera_preview(self, last_seq: int) -> tuple[int, Optional[np.ndarray]]: ...
+
+    def get_budget_state(self) -> Optional[dict]: ...
+
+    def get_pose_overlay(self) -> Optional[PoseOverlay]: ...
+
+    def frame_presented(self) -> None: ...
+
+    def close(self) -> None: ...
+
+
+class _ButtonInput(ABC):
+    """Base de los backends sin cámara: estado de botones y flancos.
+
+    Las subclases leen el dispositivo en poll(); update() convierte lo
+    mantenido en flancos igual que InputHandler.
+    """
+
+    # Sin tracker de latencia: el HUD de latencia solo aplica a la pose
+    latency = None
+
+    def __init__(self) -> None:
+        self.jump_pressed = False
+        self.jump_triggered = False
+        self.duck_pressed = False
+        self.restart_pressed = False
+        self.restart_triggered = False
+        self.game_over_state = False
+
+    @abstractmethod
+    def poll(self) -> tuple[bool, bool, bool]:
+        """Devuelve (salto, agachado, reinicio) mantenidos ahora mismo."""
+
+    def update(self) -> None:
+        jump, duck, restart = self.poll()
+        if jump and not self.jump_pressed:
+            self.jump_triggered = True
+        if restart and not self.restart_pressed:
+            self.restart_triggered = True
+        self.jump_pressed = jump
+        self.duck_pressed = duck
+        self.restart_pressed = restart
+
+    def reset(self) -> None:
+        self.jump_triggered = False
+        self.restart_triggered = False
+        self.game_over_state = False
+
+    def set_game_over(self, is_game_over: bool) -> None:
+        self.game_over_state = is_game_over
+
+    def tick_inputs(self) -> Optional[int]:
+        return None
+
+    def get_camera_preview(self, last_seq: int) -> tuple[int, None]:
+        return last_seq, None
+
+    def get_budget_state(self) -> None:
+        return None
+
+    def get_pose_overlay(self) -> None:
+        return None
+
+    def frame_presented(self) -> None:
+        pass
+
+    def is_jump_just_pressed(self) -> bool:
+        result = self.jump_triggered
+        self.jump_triggered = False
+        return result
+
+    def is_jump_held(self) -> bool:
+        return self.jump_pressed
+
+    def is_duck_held(self) -> bool:
+        return self.duck_pressed
+
+    def is_hand_raised_just_now(self) -> bool:
+        result = self.restart_triggered and self.game_over_state
+        self.restart_triggered = False
+        return result
+
+    def close(self) -> None:
+        pass
+
+
+class KeyboardInput(_ButtonInput):
+    """Espacio o flecha arriba saltan, flecha abajo agacha.
+
+    También es la entrada mientras el modelo de pose arranca. R reinicia
+    desde el bucle de eventos de main.py con cualquier backend.
+    """
+
+    JUMP_KEYS = (pygame.K_SPACE, pygame.K_UP)
+    DUCK_KEYS = (pygame.K_DOWN,)
+
+    def poll(self) -> tuple[bool, bool, bool]:
+        keys = pygame.key.get_pressed()
+        return (
+            any(keys[key] for key in self.JUMP_KEYS),
+            any(keys[key] for key in self.DUCK_KEYS),
+            False,
+        )
+
+
+class GamepadInput(KeyboardInput):
+    """Primer mando conectado (y el teclado, que sigue funcionando).
+
+    A salta, B o Start reinician; la cruceta o el stick izquierdo hacia
+    abajo agachan. Si el mando se desconecta se sigue con el teclado hasta
+    que main.py pasa el JOYDEVICEADDED de otro a handle_device_event().
+    """
+
+    JUMP_BUTTONS = (0,)
+    RESTART_BUTTONS = (1, 7)
+    DUCK_AXIS = 1
+    DEADZONE = 0.5
+
+    def __init__(self, index: int = 0) -> None:
+        super().__init__()
+        pygame.joystick.init()
+        if pygame.joystick.get_count() <= index:
+            raise RuntimeError("No hay ningún mando conectado")
+        # None mientras no haya mando conectado
+        self.joystick: Optional[pygame.joystick.Joystick]
+        self.joystick = pygame.joystick.Joystick(index)
+
+    def handle_device_event(self, event: pygame.event.Event) -> None:
+        """Sigue JOYDEVICEADDED / JOYDEVICEREMOVED; ignora el resto de eventos."""
+        if event.type == pygame.JOYDEVICEREMOVED:
+            joystick = self.joystick
+            if joystick is not None and joystick.get_instance_id() == event.instance_id:
+                self.joystick = None
+        elif event.type == pygame.JOYDEVICEADDED and self.joystick is None:
+            self.joystick = pygame.joystick.Joystick(event.device_index)
+
+    def _button(self, buttons: tuple[int, ...]) -> bool:
+        joystick = self.joystick
+        count = joystick.get_numbuttons()
+        return any(joystick.get_button(b) for b in buttons if b < count)
+
+    def poll(self) -> tuple[bool, bool, bool]:
+        jump, duck, restart = super().poll()
+        joystick = self.joystick
+        if joystick is None:
+            return jump, duck, restart
+        if joystick.get_numhats() and joystick.get_hat(0)[1] < 0:
+            duck = True
+        if (
+            joystick.get_numaxes() > self.DUCK_AXIS
+            and joystick.get_axis(self.DUCK_AXIS) > self.DEADZONE
+        ):
+            duck = True
+        return (
+            jump or self._button(self.JUMP_BUTTONS),
+            duck,
+            restart or self._button(self.RESTART_BUTTONS),
+        )
+
+
+class ScriptedInput(_ButtonInput):
+    """Entradas generadas por código, para pruebas y puestos de demo.
+
+    `script` devuelve un bitfield INPUT_* de simulation por tick de
+    simulación (p. ej. autopilot_inputs o una lista grabada), con el mismo
+    significado que en las repeticiones: INPUT_JUMP_PRESSED solo es un salto
+    corto y INPUT_JUMP_HELD lo alarga. sample_inputs() lo consume con
+    tick_inputs(), así la partida no depende de los fps del render. Tras
+    `restart_ticks` ticks en game over (también contados en tick_inputs())
+    pide reiniciar, así una demo corre sola indefinidamente.
+    """
+
+    def __init__(self, script: Callable[[], int], restart_ticks: int = 90) -> None:
+        super().__init__()
+        self.script = script
+        self.restart_ticks = restart_ticks
+        self._game_over_ticks = 0
+        self.bits = 0
+
+    @classmethod
+    def from_sequence(cls, bits: Sequence[int], loop: bool = True, **kwargs):
+        state = {"index": 0}
+
+        def script() -> int:
+            index = state["index"]
+            if index >= len(bits):
+                if not loop or not bits:
+                    return 0
+                index = 0
+            state["index"] = index + 1
+            return bits[index]
+
+        return cls(script, **kwargs)
+
+    @classmethod
+    def from_file(cls, path: str, loop: bool = True, **kwargs):
+        """Un bitfield entero por línea, un tick por línea."""
+        with open(path) as f:
+            bits = [int(line) for line in f if line.strip()]
+        return cls.from_sequence(bits, loop, **kwargs)
+
+    def tick_inputs(self) -> int:
+        """Avanza el script un tick y devuelve su bitfield."""
+        if self.game_over_state:
+            # El script no avanza en game over; solo cuenta hasta reiniciar
+            self._game_over_ticks += 1
+            if self._game_over_ticks == self.restart_ticks:
+                self.restart_triggered = True
+            self.bits = 0
+            return 0
+        self._game_over_ticks = 0
+        self.bits = self.script()
+        return self.bits
+
+    def poll(self) -> tuple[bool, bool, bool]:
+        # Todo llega por tick en tick_inputs(), no por frame
+        return False, False, False
+
+    def reset(self) -> None:
+        super().reset()
+        self._game_over_ticks = 0
+        self.bits = 0
+
+    def is_jump_just_pressed(self) -> bool:
+        return bool(self.bits & INPUT_JUMP_PRESSED)
+
+    def is_jump_held(self) -> bool:
+        return bool(self.bits & INPUT_JUMP_HELD)
+
+    def is_duck_held(self) -> bool:
+        return bool(self.bits & INPUT_DUCK_HELD)
+
+
+class PoseWarmup:
+    """Crea la entrada por pose en segundo plano.
+
+    `factory` hace los imports pesados (cv2, mediapipe), abre la cámara y
+    construye el modelo. La entrada queda lista cuando ha procesado su primer
+    frame: la primera inferencia es la más lenta y así no cae en la partida.
+    """
+
+    def __init__(self, factory: Callable[[], object], timeout: float = 20.0) -> None:
+        self._factory = factory
+        self.timeout = timeout
+        self.handler = None
+        self.error: Optional[BaseException] = None
+        self.status = "cargando"
+        self.elapsed = 0.0
+        self._ready = threading.Event()
+        self._cancelled = False
+        self._thread = threading.Thread(target=self._run, name="pose warmup")
+        self._thread.daemon = True
+        self._thread.start()
+
+    @property
+    def ready(self) -> bool:
+        return self._ready.is_set()
+
+    @property
+    def finished(self) -> bool:
+        return not self._thread.is_alive()
+
+    def _run(self) -> None:
+        start = time.perf_counter()
+        try:
+            self.handler = self._factory()
+            deadline = start + self.timeout
+            while not self._cancelled and not self.handler.processed_frames:
+                if time.perf_counter() > deadline:
+                    self.status = "sin frames de la cámara"
+                    self.handler.close()
+                    return
+                time.sleep(0.01)
+            if self._cancelled:
+                return
+            self.status = "lista"
+            self._ready.set()
+        except Exception as error:
+            self.error = error
+            self.status = f"error: {error}"
+        finally:
+            self.elapsed = time.perf_counter() - start
+            if self._cancelled and self.handler is not None:
+                self.handler.close()
+
+    def close(self) -> None:
+        self._cancelled = True
+        if self.handler is not None and self.finished:
+            self.handler.close()
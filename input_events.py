@@ -0,0 +1,53 @@
+from typing import NamedTuple, Optional
+
+JUMP = 1
+JUMP_END = 2
+DUCK_START = 3
+DUCK_END = 4
+HAND_RAISE = 5
+HAND_LOWER = 6
+
+
+class InputEvent(NamedTuple):
+    kind: int
+    capture_time: float
+    inference_time: float
+    published_time: float
+
+
+class SPSCQueue:
+    """Cola de un productor y un consumidor sobre un anillo de tamaño fijo.
+
+    El productor solo escribe `_tail` y el consumidor solo escribe `_head`;
+    con el GIL cada asignación es atómica, así que no hace falta lock. Si la
+    cola se llena el evento nuevo se descarta y se cuenta en `overflows`.
+    """
+
+    def __init__(self, capacity: int = 256) -> None:
+        self._buffer: list[Optional[InputEvent]] = [None] * capacity
+        self._capacity = capacity
+        self._head = 0
+        self._tail = 0
+        self.overflows = 0
+
+    def push(self, event: InputEvent) -> bool:
+        tail = self._tail
+        if tail - self._head >= self._capacity:
+            self.overflows += 1
+            return False
+        self._buffer[tail % self._capacity] = event
+        self._tail = tail + 1
+        return True
+
+    def pop(self) -> Optional[InputEvent]:
+        head = self._head
+        if head == self._tail:
+            return None
+        index = head % self._capacity
+        event = self._buffer[index]
+        self._buffer[index] = None
+        self._head = head + 1
+        return event
+
+    def __len__(self) -> int:
+        return self._tail - self._head
@@ -0,0 +1,140 @@
+import csv
+import json
+import threading
+from collections import deque
+from typing import Optional
+
+STAGES = ("capture", "inference", "published", "consumed", "presented")
+
+# (nombre, etapa inicial, etapa final)
+SEGMENTS = (
+    ("capture_to_inference", 0, 1),
+    ("inference_to_published", 1, 2),
+    ("published_to_consumed", 2, 3),
+    ("consumed_to_presented", 3, 4),
+    ("total", 0, 4),
+)
+
+HISTOGRAM_BIN_MS = 5
+HISTOGRAM_BINS = 100
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class LatencyTracker:
+    """Latencia de cada salto desde la captura hasta el frame presentado.
+
+    El hilo de inferencia marca captura, fin de inferencia y publicación; el
+    bucle del juego marca el consumo (is_jump_just_pressed) y la presentación
+    (después de pygame.display.update). Las muestras completas se guardan en
+    una ventana móvil.
+    """
+
+    def __init__(self, window: int = 512) -> None:
+        self._lock = threading.Lock()
+        self._pending: Optional[list[float]] = None
+        self._consumed: list[list[float]] = []
+        self.samples: deque[tuple[float, ...]] = deque(maxlen=window)
+        self.lost = 0
+
+    def publish(self, capture_t: float, inference_t: float, published_t: float) -> None:
+        with self._lock:
+            # Un flanco publicado que nadie consumió se perdió
+            if self._pending is not None:
+                self.lost += 1
+            self._pending = [capture_t, inference_t, published_t]
+
+    def consume(self, consumed_t: float) -> None:
+        with self._lock:
+            if self._pending is None:
+                return
+            self._pending.append(consumed_t)
+            self._consumed.append(self._pending)
+            self._pending = None
+
+    def present(self, presented_t: float) -> None:
+        if not self._consumed:
+            return
+        with self._lock:
+            for record in self._consumed:
+                record.append(presented_t)
+                self.samples.append(tuple(record))
+            self._consumed.clear()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._pending = None
+            self._consumed.clear()
+
+    def summary(self) -> dict:
+        with self._lock:
+            samples = list(self.samples)
+
+        result = {"count": len(samples), "lost": self.lost}
+        for name, start, end in SEGMENTS:
+            values = sorted((s[end] - s[start]) * 1000.0 for s in samples)
+            result[name] = {
+                "p50": percentile(values, 0.50),
+                "p95": percentile(values, 0.95),
+                "p99": percentile(values, 0.99),
+            }
+        return result
+
+    def histogram(self) -> list[int]:
+        """Conteos de la latencia total en bins de HISTOGRAM_BIN_MS."""
+        with self._lock:
+            samples = list(self.samples)
+        counts = [0] * HISTOGRAM_BINS
+        for sample in samples:
+            total_ms = (sample[4] - sample[0]) * 1000.0
+            counts[min(HISTOGRAM_BINS - 1, int(total_ms // HISTOGRAM_BIN_MS))] += 1
+        return counts
+
+    def export_csv(self, path: str) -> None:
+        with self._lock:
+            samples = list(self.samples)
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow([*STAGES, *(name + "_ms" for name, _, _ in SEGMENTS)])
+            for sample in samples:
+                segments = [
+                    f"{(sample[end] - sample[start]) * 1000.0:.3f}"
+                    for _, start, end in SEGMENTS
+                ]
+                writer.writerow([f"{t:.6f}" for t in sample] + segments)
+
+    def export_json(self, path: str) -> None:
+        with self._lock:
+            samples = list(self.samples)
+        data = {
+            "stages": STAGES,
+            "summary_ms": self.summary(),
+            "histogram": {
+                "bin_ms": HISTOGRAM_BIN_MS,
+                "total_counts": self.histogram(),
+            },
+            "samples": [dict(zip(STAGES, sample)) for sample in samples],
+        }
+        with open(path, "w") as f:
+            json.dump(data, f, indent=2)
+
+    def export(self, path: str) -> None:
+        if path.endswith(".csv"):
+            self.export_csv(path)
+        else:
+            self.export_json(path)
+
+    def hud_lines(self) -> list[str]:
+        summary = self.summary()
+        lines = [f"Latencia salto (n={summary['count']}, perdidos {summary['lost']})"]
+        for name, _, _ in SEGMENTS:
+            stats = summary[name]
+            lines.append(
+                f"{name}: {stats['p50']:.0f}/{stats['p95']:.0f}/{stats['p99']:.0f} ms"
+            )
+        return lines
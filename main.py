@@ -1,177 +1,482 @@
+import time
+
+# Referencia del tiempo hasta el primer frame; se toma antes de los imports
+STARTUP_T0 = time.perf_counter()
+
+import argparse
+import random
 import pygame
 import sys
+from typing import Optional
+import assets
 from settings import (
     SCREEN_WIDTH,
     SCREEN_HEIGHT,
     FPS,
-    COLOR_WHITE,
-    COLOR_BLACK,
-    SPEED_START,
-    MAX_SPEED,
-    ACCELERATION,
+    TICK_RATE,
+    MAX_FRAME_TIME,
+    CAMERA_PREVIEW_SIZE,
     GROUND_Y_POS,
-    SPRITE_SHEET_PATH,
-    get_day_night_distance,
+    POSE_MODEL_COMPLEXITY,
+    POSE_INFERENCE_WIDTH,
+    POSE_BUDGET_MS,
+    POSE_FILTER_ENABLED,
+    POSE_FILTER_PARAMS,
+)
+from input_backends import (
+    GamepadInput,
+    InputBackend,
+    KeyboardInput,
+    PoseWarmup,
+    ScriptedInput,
 )
-from dinosaur import Dinosaur
-from controller import InputHandler
-from obstacles import ObstacleManager
-from sprite_sheet import SpriteSheet
+from pose_overlay import draw_pose_overlay
+from profiler import FrameProfiler
+from replay import ReplayPlayer, ReplayWriter
+from renderer import Renderer
+from simulation import GameState, autopilot_inputs, sample_inputs
 
-pygame.init()
-screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-pygame.display.set_caption("Dino Jumper")
-clock = pygame.time.Clock()
-font = pygame.font.SysFont("consolas", 20)
+# controller, camera_sources y pose_pipeline (cv2 + mediapipe) se importan en
+# create_pose_input, dentro del hilo de PoseWarmup, para no retrasar la ventana
 
 
 def reset_game(
-    player: Dinosaur, obstacle_manager: ObstacleManager, input_handler: InputHandler
-) -> tuple[float, float, bool, bool, tuple[int, int, int], tuple[int, int, int], int]:
+    state: GameState,
+    input_handler: InputBackend,
+    replay_writer: Optional[ReplayWriter] = None,
+) -> None:
     """Resetea el juego sin crear nuevas instancias"""
-    player.__init__()
-    obstacle_manager.obstacles.clear()
-    obstacle_manager.last_spawn_time = 0
+    state.reset()
     input_handler.reset()
+    if replay_writer is not None:
+        replay_writer.reset()
 
-    return (
-        0,
-        SPEED_START,
-        False,
-        True,
-        COLOR_WHITE,
-        COLOR_BLACK,
-        get_day_night_distance(),
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Dino Jumper")
+    parser.add_argument(
+        "--source",
+        metavar="RUTA",
+        help="vídeo o traza de landmarks (.npz) en lugar de la cámara",
+    )
+    parser.add_argument(
+        "--record-trace",
+        metavar="RUTA",
+        help="al salir guarda los landmarks de la partida como traza .npz",
+    )
+    parser.add_argument(
+        "--pose-process",
+        action="store_true",
+        help="ejecuta la inferencia de pose en un proceso aparte",
+    )
+    parser.add_argument(
+        "--model-complexity",
+        type=int,
+        choices=(0, 1, 2),
+        default=POSE_MODEL_COMPLEXITY,
+        help="complejidad del modelo de MediaPipe (0 = más rápido)",
+    )
+    parser.add_argument(
+        "--inference-width",
+        type=int,
+        default=POSE_INFERENCE_WIDTH,
+        help="ancho en píxeles para la inferencia (0 = resolución de la cámara)",
+    )
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=POSE_BUDGET_MS,
+        help="presupuesto de inferencia por frame; ajusta calidad sola (0 = apagado)",
+    )
+    parser.add_argument(
+        "--no-pose-filter",
+        action="store_true",
+        help="decide salto/agachado con el umbral crudo de cada frame",
+    )
+    parser.add_argument(
+        "--fps",
+        type=int,
+        default=FPS,
+        help="límite de fps del render (0 = sin límite); la física no cambia",
+    )
+    parser.add_argument(
+        "--latency-hud",
+        action="store_true",
+        help="muestra la latencia cámara -> salto (también con F2)",
     )
+    parser.add_argument(
+        "--latency-export",
+        metavar="RUTA",
+        help="al salir guarda las latencias en .csv o .json",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="mide cada subsistema del frame y lo muestra (F3 lo oculta)",
+    )
+    parser.add_argument(
+        "--profile-export",
+        metavar="RUTA",
+        help="al salir guarda el perfil como trace de Chrome (.json)",
+    )
+    parser.add_argument(
+        "--input",
+        choices=("pose", "keyboard", "gamepad", "scripted"),
+        default="pose",
+        help="entrada del juego; solo 'pose' abre la cámara y carga el modelo",
+    )
+    parser.add_argument(
+        "--input-script",
+        metavar="RUTA",
+        help="con --input scripted: un bitfield INPUT_* por línea y tick de "
+        "simulación (sin él juega el piloto automático)",
+    )
+    parser.add_argument(
+        "--record-replay",
+        metavar="RUTA",
+        help="graba semilla y entradas de cada tick para reproducir la partida",
+    )
+    parser.add_argument(
+        "--replay-landmarks",
+        action="store_true",
+        help="con --record-replay, incluye también los landmarks de la pose",
+    )
+    parser.add_argument(
+        "--replay",
+        metavar="RUTA",
+        help="reproduce una repetición a velocidad real (sin ventana: replay.py)",
+    )
+    parser.add_argument(
+        "--no-pose-overlay",
+        action="store_true",
+        help="sin umbrales ni esqueleto sobre la vista previa (F4 lo alterna)",
+    )
+    args = parser.parse_args()
+    if args.replay_landmarks and args.record_trace:
+        parser.error("--replay-landmarks y --record-trace no se pueden combinar")
+    return args
+
+
+def create_pose_input(
+    args: argparse.Namespace,
+    profiler: FrameProfiler,
+    replay_writer: Optional[ReplayWriter] = None,
+):
+    from camera_sources import LandmarkTraceRecorder, open_source
+    from controller import InputHandler
+
+    pose_filter = POSE_FILTER_PARAMS
+    if args.no_pose_filter or not POSE_FILTER_ENABLED:
+        pose_filter = None
+
+    trace_recorder = None
+    if args.record_trace:
+        trace_recorder = LandmarkTraceRecorder()
+    elif args.replay_landmarks:
+        trace_recorder = replay_writer
+
+    return InputHandler(
+        source=open_source(args.source, realtime=True),
+        use_process=args.pose_process,
+        model_complexity=args.model_complexity,
+        inference_width=args.inference_width,
+        budget_ms=args.budget_ms,
+        pose_filter=pose_filter,
+        trace_recorder=trace_recorder,
+        profiler=profiler,
+    )
+
+
+def create_input(args: argparse.Namespace, state: GameState) -> InputBackend:
+    """Backend elegido con --input; la pose arranca aparte en PoseWarmup."""
+    if args.input == "gamepad":
+        try:
+            return GamepadInput()
+        except RuntimeError as error:
+            print(f"{error}; se usa el teclado")
+    elif args.input == "scripted":
+        if args.input_script:
+            return ScriptedInput.from_file(args.input_script)
+        return ScriptedInput(lambda: autopilot_inputs(state))
+    return KeyboardInput()
 
 
 def main() -> None:
-    player = Dinosaur()
-    input_handler = InputHandler()
-    obstacle_manager = ObstacleManager()
+    args = parse_args()
+
+    # La ventana se crea aquí y no al importar: el worker de pose (spawn)
+    # vuelve a importar este módulo y no debe abrir otra ventana
+    pygame.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    pygame.display.set_caption("Dino Jumper")
+    clock = pygame.time.Clock()
+    font = pygame.font.SysFont("consolas", 20)
+
+    # Todo se carga una vez aquí; reiniciar la partida ya no toca el disco
+    load_stats = assets.preload()
+    print(
+        f"Assets: {load_stats['images']} imágenes, "
+        f"{load_stats['disk_loads']} lecturas de disco, "
+        f"{load_stats['load_ms']:.1f} ms"
+    )
 
-    sheet = SpriteSheet(SPRITE_SHEET_PATH)
-    ground_img = sheet.get_image(2, 104, 2400, 24)
-    ground_x = 0
+    profiler = FrameProfiler(enabled=args.profile or bool(args.profile_export))
+    section = profiler.section
+
+    # Con una semilla conocida la partida se puede repetir tick a tick
+    replay_player = ReplayPlayer(args.replay) if args.replay else None
+    replay_writer = None
+    if replay_player is not None:
+        state = replay_player.new_state()
+        args.input = "keyboard"
+    elif args.record_replay:
+        seed = random.randrange(2**32)
+        replay_writer = ReplayWriter(args.record_replay, seed)
+        state = GameState(seed)
+    else:
+        state = GameState()
+
+    # Con --input pose se juega con teclado hasta que procesa su primer frame
+    input_handler = create_input(args, state)
+    pose_warmup = None
+    if args.input == "pose":
+        pose_warmup = PoseWarmup(
+            lambda: create_pose_input(args, profiler, replay_writer)
+        )
+    pose_status_until = 0.0
+    first_frame_done = False
+    # Pantalla de inicio: la partida arranca con el primer salto (el backend
+    # scripted y las repeticiones empiezan directamente)
+    started = args.input == "scripted" or replay_player is not None
+
+    # Sin --profile no envuelven nada
+    profiler.instrument(state.player, "update", "sim.player")
+    profiler.instrument(state.obstacle_manager, "update", "sim.obstacles")
+    profiler.instrument(state, "check_collision", "sim.collision")
+    profiler.instrument(pygame.display, "update", "present.display_update")
+
+    renderer = Renderer(screen, font)
+    text = renderer.text
+    ground_img = assets.ground_image()
     ground_y = GROUND_Y_POS + 10
 
-    game_speed = SPEED_START
-    score = 0.0
-    game_over = False
+    camera_surface = pygame.Surface(CAMERA_PREVIEW_SIZE)
+    camera_seq = 0
+    show_latency = args.latency_hud
+    show_profile = profiler.enabled
+    show_overlay = not args.no_pose_overlay
 
-    bg_color = COLOR_WHITE
-    fg_color = COLOR_BLACK
-    is_day = True
-    next_day_night_switch = get_day_night_distance()
+    tick_dt = 1.0 / TICK_RATE
+    accumulator = 0.0
+    previous_time = time.perf_counter()
 
     running = True
     while running:
-        for event in pygame.event.get():
+        frame_start = time.perf_counter()
+        with section("events"):
+            events = pygame.event.get()
+        for event in events:
             if event.type == pygame.QUIT:
                 running = False
+                if args.latency_export and input_handler.latency is not None:
+                    input_handler.latency.export(args.latency_export)
+                if args.profile_export:
+                    profiler.export_chrome_trace(args.profile_export)
                 input_handler.close()
+                if pose_warmup is not None:
+                    pose_warmup.close()
+                recorder = getattr(input_handler, "trace_recorder", None)
+                if args.record_trace and recorder is not None:
+                    recorder.save(args.record_trace)
+                if replay_writer is not None:
+                    replay_writer.close()
                 pygame.quit()
                 sys.exit()
 
-            if event.type == pygame.KEYDOWN and game_over:
-                if event.key == pygame.K_r:
-                    (
-                        score,
-                        game_speed,
-                        game_over,
-                        is_day,
-                        bg_color,
-                        fg_color,
-                        next_day_night_switch,
-                    ) = reset_game(player, obstacle_manager, input_handler)
-                    ground_x = 0
-
-        input_handler.update()
-
-        input_handler.set_game_over(game_over)
-
-        if game_over and input_handler.is_hand_raised_just_now():
-            (
-                score,
-                game_speed,
-                game_over,
-                is_day,
-                bg_color,
-                fg_color,
-                next_day_night_switch,
-            ) = reset_game(player, obstacle_manager, input_handler)
-            ground_x = 0
-
-        if not game_over:
-            if game_speed < MAX_SPEED:
-                game_speed += ACCELERATION
-
-            player.update(input_handler)
-            obstacle_manager.update(game_speed, int(score))
-
-            score += 0.15 * (game_speed / SPEED_START)
-
-            ground_x -= game_speed
-            if ground_x <= -ground_img.get_width():
-                ground_x = 0
-
-            if score >= next_day_night_switch:
-                is_day = not is_day
-
-                if is_day:
-                    bg_color = COLOR_WHITE
-                    fg_color = COLOR_BLACK
-                else:
-                    bg_color = COLOR_BLACK
-                    fg_color = COLOR_WHITE
-
-                next_day_night_switch = score + get_day_night_distance()
-
-            player_rect = player.rect.inflate(-20, -15)
-            for obs in obstacle_manager.obstacles:
-                obs_rect = obs.rect.inflate(-15, -15)
-                if player_rect.colliderect(obs_rect):
-                    game_over = True
-
-        screen.fill(bg_color)
-
-        camera_frame = input_handler.get_camera_frame()
-        if camera_frame is not None:
-            camera_surface = pygame.surfarray.make_surface(camera_frame)
-            camera_width, camera_height = 320, 240
-            camera_surface = pygame.transform.scale(
-                camera_surface, (camera_width, camera_height)
+            if isinstance(input_handler, GamepadInput):
+                # Mandos conectados o desconectados en plena partida
+                input_handler.handle_device_event(event)
+
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F2:
+                show_latency = not show_latency
+
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                show_profile = profiler.enabled and not show_profile
+
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F4:
+                show_overlay = not show_overlay
+
+            if event.type == pygame.KEYDOWN and state.game_over:
+                if event.key == pygame.K_r and replay_player is None:
+                    reset_game(state, input_handler, replay_writer)
+
+        if (
+            pose_warmup is not None
+            and pose_warmup.ready
+            and input_handler is not pose_warmup.handler
+        ):
+            input_handler = pose_warmup.handler
+            input_handler.set_game_over(state.game_over)
+            ready_time = time.perf_counter()
+            pose_status_until = ready_time + 3.0
+            profiler.record("startup.pose_ready", STARTUP_T0, ready_time)
+            print(
+                f"Pose lista a los {(ready_time - STARTUP_T0) * 1000:.0f} ms "
+                f"(arranque en segundo plano {pose_warmup.elapsed * 1000:.0f} ms)"
             )
 
+        with section("input"):
+            input_handler.update()
+
+            input_handler.set_game_over(state.game_over)
+
+            if state.game_over and input_handler.is_hand_raised_just_now():
+                if replay_player is None:
+                    reset_game(state, input_handler, replay_writer)
+
+        # Paso fijo: la simulación avanza TICK_RATE veces por segundo sea cual
+        # sea el ritmo del render; las entradas se muestrean en cada tick
+        now = time.perf_counter()
+        accumulator += min(now - previous_time, MAX_FRAME_TIME)
+        previous_time = now
+        if not started:
+            started = input_handler.is_jump_held()
+            if not started:
+                accumulator = 0.0
+        with section("sim"):
+            while accumulator >= tick_dt:
+                accumulator -= tick_dt
+                if replay_player is not None:
+                    # La grabación decide también los reinicios
+                    replay_player.step(state)
+                elif not state.game_over:
+                    bits = sample_inputs(input_handler)
+                    if replay_writer is not None:
+                        replay_writer.tick(bits)
+                    state.step(bits)
+                    if state.game_over:
+                        # Los ticks que quedan en este frame ya son de game over
+                        input_handler.set_game_over(True)
+                else:
+                    # En game over solo avanza el backend: ScriptedInput cuenta
+                    # los ticks y reinicia en uno exacto, sean cuales sean los fps
+                    if replay_writer is not None:
+                        replay_writer.game_over_tick()
+                    input_handler.tick_inputs()
+                    if input_handler.is_hand_raised_just_now():
+                        reset_game(state, input_handler, replay_writer)
+
+        game_over = state.game_over
+        # Fracción del siguiente tick ya transcurrida, para interpolar
+        alpha = 1.0 if game_over else accumulator / tick_dt
+        fg_color = state.fg_color
+        shade = state.night_step
+
+        # Se describe el frame entero; el renderer solo repinta lo que cambió
+        renderer.begin(state.bg_color)
+
+        with section("camera_preview"):
+            camera_seq, camera_frame = input_handler.get_camera_preview(camera_seq)
+            if camera_frame is not None:
+                pygame.surfarray.blit_array(camera_surface, camera_frame)
+
+        draw_start = time.perf_counter()
+
+        if camera_seq:
+            camera_width, camera_height = CAMERA_PREVIEW_SIZE
             camera_x = 10
             camera_y = 10
 
             border_color = (255, 0, 255) if game_over else fg_color
-            pygame.draw.rect(
-                screen,
+            renderer.rect(
                 border_color,
                 (camera_x - 2, camera_y - 2, camera_width + 4, camera_height + 4),
                 3,
             )
 
-            screen.blit(camera_surface, (camera_x, camera_y))
-
-        screen.blit(ground_img, (ground_x, ground_y))
-        screen.blit(ground_img, (ground_x + ground_img.get_width(), ground_y))
-
-        player.draw(screen)
-        obstacle_manager.draw(screen)
+            renderer.blit(
+                camera_surface,
+                (camera_x, camera_y),
+                changed=camera_frame is not None,
+            )
 
-        score_surface = font.render(f"Pts {int(score):05d}", True, fg_color)
-        screen.blit(score_surface, (SCREEN_WIDTH - 150, 20))
+            overlay = input_handler.get_pose_overlay() if show_overlay else None
+            if overlay is not None:
+                draw_pose_overlay(
+                    renderer,
+                    (camera_x, camera_y, camera_width, camera_height),
+                    overlay,
+                )
+
+            budget = input_handler.get_budget_state()
+            if budget is not None:
+                width_label = budget["inference_width"] or "full"
+                text(
+                    f"L{budget['level_index']} {width_label} "
+                    f"c{budget['model_complexity']} {budget['camera_fps']}fps "
+                    f"{budget['average_ms']:.0f}/{budget['target_ms']:.0f}ms "
+                    f"ok {budget['within_budget']:.0%}",
+                    fg_color,
+                    (camera_x, camera_y + camera_height + 8),
+                )
+
+        ground_x = state.interpolated_ground_x(alpha)
+        ground = assets.shaded(ground_img, shade)
+        renderer.blit(ground, (round(ground_x), ground_y))
+        renderer.blit(ground, (round(ground_x) + ground.get_width(), ground_y))
+
+        state.player.draw(renderer, alpha, shade)
+        state.obstacle_manager.draw(renderer, alpha, shade)
+
+        text(f"Pts {int(state.score):05d}", fg_color, (SCREEN_WIDTH - 150, 20))
 
         if game_over:
-            go_text = font.render("Levanta la mano para reiniciar", True, fg_color)
-            rect = go_text.get_rect(center=(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2))
-            screen.blit(go_text, rect)
+            text(
+                "Levanta la mano (o pulsa R) para reiniciar",
+                fg_color,
+                center=(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2),
+            )
+        elif not started:
+            text(
+                "Salta (o pulsa espacio) para empezar",
+                fg_color,
+                center=(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2),
+            )
 
-        pygame.display.update()
-        clock.tick(FPS)
+        if replay_player is not None:
+            label = "terminada" if replay_player.finished else "en curso"
+            text(f"Repetición {label}", fg_color, center=(SCREEN_WIDTH / 2, 30))
+        elif pose_warmup is not None and not pose_warmup.ready:
+            text(
+                f"Pose: {pose_warmup.status} - jugando con teclado",
+                fg_color,
+                center=(SCREEN_WIDTH / 2, 30),
+            )
+        elif now < pose_status_until:
+            text("Pose lista", fg_color, center=(SCREEN_WIDTH / 2, 30))
+
+        if show_latency and input_handler.latency is not None:
+            for i, line in enumerate(input_handler.latency.hud_lines()):
+                text(line, fg_color, (SCREEN_WIDTH - 480, 60 + i * 22))
+
+        if show_profile:
+            for i, line in enumerate(profiler.hud_lines()):
+                text(line, fg_color, (10, 290 + i * 22))
+        profiler.record("draw", draw_start, time.perf_counter())
+
+        with section("present"):
+            renderer.present()
+        input_handler.frame_presented()
+        profiler.record("frame", frame_start, time.perf_counter())
+
+        if not first_frame_done:
+            first_frame_done = True
+            first_frame_time = time.perf_counter()
+            profiler.record("startup.first_frame", STARTUP_T0, first_frame_time)
+            print(f"Primer frame a los {(first_frame_time - STARTUP_T0) * 1000:.0f} ms")
+
+        with section("tick_wait"):
+            clock.tick(args.fps)
 
 
 if __name__ == "__main__":
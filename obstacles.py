@@ -1,24 +1,55 @@
-import pygame
+import math
 import random
-import os
-from settings import SCREEN_WIDTH, SPRITE_SHEET_PATH, GROUND_Y_POS
-from sprite_sheet import SpriteSheet
+from collections import deque
+from typing import Optional, Sequence
+
+from assets import bird_images, large_cactus_images, shaded, small_cactus_images
+from settings import SCREEN_WIDTH, GROUND_Y_POS
+from spawn_table import (
+    GAP_SPEED_FACTOR,
+    SPAWN_TABLE,
+    ObstacleProfile,
+    profile_of,
+    reachability_table,
+    spawn_bracket,
+)
 
 
 class Obstacle:
+    """Registro reutilizable: ObstacleManager lo recicla con spawn()."""
+
+    __slots__ = (
+        "image",
+        "rect",
+        "type",
+        "exact_x",
+        "prev_x",
+        "step_index",
+        "images",
+    )
+
     def __init__(self, image, speed: float, y_pos: int, type_obj: str):
+        self.rect = image.get_rect()
+        self.spawn(image, y_pos, type_obj)
+
+    def spawn(self, image, y_pos: int, type_obj: str, images: Sequence = ()) -> None:
+        """Reinicia el registro en el borde derecho sin crear objetos nuevos."""
         self.image = image
-        self.rect = self.image.get_rect()
-        self.rect.x = SCREEN_WIDTH + 50
-        self.rect.y = y_pos
+        rect = self.rect
+        rect.width, rect.height = image.get_width(), image.get_height()
+        rect.x = SCREEN_WIDTH + 50
+        rect.y = y_pos
         self.type = type_obj
 
-        self.exact_x = float(self.rect.x)
+        self.exact_x = float(rect.x)
+        self.prev_x = self.exact_x
 
         self.step_index = 0
-        self.images = [image]
+        # Solo los pájaros animan; comparten la lista del manager
+        self.images = images
 
     def update(self, speed: float) -> None:
+        self.prev_x = self.exact_x
         self.exact_x -= speed
         self.rect.x = int(self.exact_x)
 
@@ -29,113 +60,188 @@ class Obstacle:
             frame = 0 if self.step_index < 5 else 1
             self.image = self.images[frame]
 
-    def draw(self, screen) -> None:
-        screen.blit(self.image, (self.rect.x, self.rect.y))
+    def draw(self, screen, alpha: float = 1.0, shade: int = 0) -> None:
+        x = self.prev_x + (self.exact_x - self.prev_x) * alpha
+        screen.blit(shaded(self.image, shade), (round(x), self.rect.y))
 
 
 class ObstacleManager:
-    def __init__(self):
-        self.sheet = SpriteSheet(SPRITE_SHEET_PATH)
-        self.obstacles = []
+    """Obstáculos activos en una cola ordenada por x sobre un pool fijo.
+
+    Los obstáculos entran por la derecha y salen por la izquierda en el mismo
+    orden, así que `obstacles` es una deque: el que sale se saca por la
+    izquierda en O(1) y vuelve a `_free` para el siguiente spawn. El pool se
+    crea entero al construir; si una partida necesitara más de `capacity`
+    obstáculos a la vez crece (y lo cuenta en `allocations`).
+
+    `spawn_gap` fija la distancia entre spawns en vez de la curva del juego;
+    con huecos menores que la velocidad salen varios por tick (modo estrés).
+
+    Con la curva del juego (SPAWN_TABLE) cada spawn se comprueba contra el
+    anterior en la tabla de alcance: si a la velocidad actual no se puede
+    superar la pareja, el obstáculo espera hasta que el hueco alcance.
+    """
+
+    def __init__(
+        self,
+        rng: Optional[random.Random] = None,
+        capacity: int = 16,
+        spawn_gap: Optional[float] = None,
+    ):
+        self.rng = rng if rng is not None else random.Random()
+        self.obstacles: deque[Obstacle] = deque()
         self.ground_offset = 15
         self.last_spawn_time = 0
-
-        def load_bird(name):
-            path = os.path.join("sprites", name)
-            img = pygame.image.load(path).convert_alpha()
-            return pygame.transform.scale(img, (46, 40))
-
-        self.bird_images = [
-            load_bird("Terodactilo1.png"),
-            load_bird("Terodactilo2.png"),
-        ]
-
-        self.small_cactus = [
-            self.sheet.get_image(446, 2, 34, 70),
-            self.sheet.get_image(480, 2, 34, 70),
-            self.sheet.get_image(514, 2, 34, 70),
-            self.sheet.get_image(548, 2, 34, 70),
-            self.sheet.get_image(582, 2, 34, 70),
-            self.sheet.get_image(616, 2, 34, 70),
-        ]
-
-        self.large_cactus = [
-            self.sheet.get_image(652, 2, 50, 100),
-            self.sheet.get_image(702, 2, 50, 100),
-            self.sheet.get_image(752, 2, 98, 100),
-        ]
-
-        self.bird_heights = [270, 220, 160]
-        self.distance_to_next_spawn = random.randint(800, 1200)
+        self.spawn_gap = spawn_gap
+
+        self.bird_images = bird_images()
+        self.small_cactus = small_cactus_images()
+        self.large_cactus = large_cactus_images()
+
+        # Perfiles precalculados: cada cactus tiene una sola y, los pájaros
+        # comparten imagen y se distinguen por la altura
+        self._cactus_profiles = {
+            img: profile_of(img, self._cactus_y(img, large))
+            for large, images in ((False, self.small_cactus), (True, self.large_cactus))
+            for img in images
+        }
+        heights = sorted({y for bracket in SPAWN_TABLE for y in bracket.bird_heights})
+        self._bird_profiles = {y: profile_of(self.bird_images[0], y) for y in heights}
+        self.reachability = reachability_table(
+            [*self._cactus_profiles.values(), *self._bird_profiles.values()]
+        )
+        # Sustituto de un candidato imposible: el cactus más estrecho
+        self._narrowest_cactus = min(self.small_cactus, key=lambda img: img.get_width())
+
+        placeholder = self.small_cactus[0]
+        self._free = [Obstacle(placeholder, 0, 0, "cactus") for _ in range(capacity)]
+        self.capacity = capacity
+        self.allocations = 0
+        self.reset()
+
+    def reset(self) -> None:
+        self._free.extend(self.obstacles)
+        self.obstacles.clear()
+        self.last_spawn_time = 0
+        self.distance_to_next_spawn = self.rng.randint(800, 1200)
         self.distance_traveled = 0
+        # Siguiente candidato (lo escribe _pick); `_pending` si la tabla de
+        # alcance lo retuvo. Perfil del último spawn
+        self._next_image = None
+        self._next_y = 0
+        self._next_type = ""
+        self._next_images: Sequence = ()
+        self._pending = False
+        self._last_profile: Optional[ObstacleProfile] = None
+        self.delayed_spawns = 0
 
     def update(self, current_speed: float, current_score: int) -> None:
-        if self.obstacles:
-            if self.obstacles[0].rect.right < -100:
-                self.obstacles.pop(0)
+        obstacles = self.obstacles
+        while obstacles and obstacles[0].rect.right < -100:
+            self._free.append(obstacles.popleft())
 
-        for obs in self.obstacles:
+        for obs in obstacles:
             obs.update(current_speed)
 
         self.distance_traveled += current_speed
 
-        if self.distance_traveled >= self.distance_to_next_spawn:
-            self.spawn_obstacle(current_speed, current_score)
-            self.distance_traveled = 0
-            self.distance_to_next_spawn = self.calculate_next_gap(
-                current_speed, current_score
-            )
+        if self.spawn_gap is not None:
+            while self.distance_traveled >= self.spawn_gap:
+                self.spawn_obstacle(current_speed, current_score)
+                self.distance_traveled -= self.spawn_gap
+        elif self.distance_traveled >= self.distance_to_next_spawn:
+            if self.spawn_obstacle(current_speed, current_score):
+                self.distance_traveled = 0
+                self.distance_to_next_spawn = self.calculate_next_gap(
+                    current_speed, current_score
+                )
 
     def calculate_next_gap(self, speed: float, score: int) -> float:
-        base_gap = speed * 75
-        if score < 150:
-            variance = random.randint(400, 900)
-        elif score < 500:
-            variance = random.randint(250, 600)
+        low, high = spawn_bracket(score).gap
+        return speed * GAP_SPEED_FACTOR + self.rng.randint(low, high)
+
+    def _activate(
+        self, image, y_pos: int, type_obj: str, images: Sequence = ()
+    ) -> None:
+        if self._free:
+            obs = self._free.pop()
         else:
-            variance = random.randint(150, 400)
-        return base_gap + variance
-
-    def spawn_obstacle(self, speed: float, score: int) -> None:
-        final_y_pos = 0
-
-        if score < 150:
-            img = random.choice(self.small_cactus)
-            final_y_pos = GROUND_Y_POS - img.get_height() + self.ground_offset
-            obs = Obstacle(img, speed, final_y_pos, "cactus")
-            self.obstacles.append(obs)
-
-        elif score < 450:
-            if random.random() < 0.5:
-                img = random.choice(self.small_cactus)
-                final_y_pos = GROUND_Y_POS - img.get_height() + self.ground_offset
-            else:
-                img = random.choice(self.large_cactus)
-                final_y_pos = GROUND_Y_POS - img.get_height() + self.ground_offset + 5
-            obs = Obstacle(img, speed, final_y_pos, "cactus")
-            self.obstacles.append(obs)
-
+            self.allocations += 1
+            self.capacity += 1
+            obs = Obstacle(image, 0, y_pos, type_obj)
+        obs.spawn(image, y_pos, type_obj, images)
+        self.obstacles.append(obs)
+
+    def _cactus_y(self, img, large: bool) -> int:
+        y_pos = GROUND_Y_POS - img.get_height() + self.ground_offset
+        return y_pos + 5 if large else y_pos
+
+    def _set_cactus(self, img, large: bool) -> None:
+        self._next_image = img
+        self._next_y = self._cactus_y(img, large)
+        self._next_type = "cactus"
+        self._next_images = ()
+
+    def _pick(self, score: int) -> None:
+        """Sortea el siguiente obstáculo según SPAWN_TABLE en los campos `_next_*`."""
+        rng = self.rng
+        bracket = spawn_bracket(score)
+        if bracket.bird and rng.random() < bracket.bird:
+            self._next_image = self.bird_images[0]
+            self._next_y = rng.choice(bracket.bird_heights)
+            self._next_type = "bird"
+            self._next_images = self.bird_images
+            return
+        small = bracket.small
+        large = small < 1.0 and rng.random() >= small
+        self._set_cactus(
+            rng.choice(self.large_cactus if large else self.small_cactus), large
+        )
+
+    def _next_profile(self) -> ObstacleProfile:
+        if self._next_type == "bird":
+            return self._bird_profiles[self._next_y]
+        return self._cactus_profiles[self._next_image]
+
+    def spawn_obstacle(self, speed: float, score: int) -> bool:
+        """Activa el siguiente obstáculo; False si la tabla de alcance lo retiene.
+
+        El candidato retenido sale sin volver a sortearse cuando el hueco
+        con el anterior llega al mínimo, así el rng avanza igual.
+        """
+        if self._pending:
+            self._pending = False
         else:
-            if random.random() < 0.25:
-                y_pos = random.choice(self.bird_heights)
-                if score < 700 and y_pos == self.bird_heights[0]:
-                    y_pos = self.bird_heights[1]
-
-                obs = Obstacle(self.bird_images[0], speed, y_pos, "bird")
-                obs.images = self.bird_images
-                self.obstacles.append(obs)
-            else:
-                if random.random() < 0.5:
-                    img = random.choice(self.small_cactus)
-                    final_y_pos = GROUND_Y_POS - img.get_height() + self.ground_offset
-                else:
-                    img = random.choice(self.large_cactus)
-                    final_y_pos = (
-                        GROUND_Y_POS - img.get_height() + self.ground_offset + 5
+            self._pick(score)
+
+        if self.spawn_gap is None:
+            profile = self._next_profile()
+            if self.obstacles:
+                last = self.obstacles[-1]
+                gap = SCREEN_WIDTH + 50 - (last.exact_x + last.rect.width)
+                missing = self.reachability.missing_gap(
+                    speed, self._last_profile, profile, gap
+                )
+                if missing == math.inf:
+                    # Imposible a esta velocidad: se cambia por el cactus
+                    # más estrecho, que siempre se puede saltar
+                    self._set_cactus(self._narrowest_cactus, False)
+                    profile = self._next_profile()
+                    missing = self.reachability.missing_gap(
+                        speed, self._last_profile, profile, gap
                     )
-                obs = Obstacle(img, speed, final_y_pos, "cactus")
-                self.obstacles.append(obs)
-
-    def draw(self, screen) -> None:
+                if missing > 0.0:
+                    self._pending = True
+                    self.distance_to_next_spawn = self.distance_traveled + missing
+                    self.delayed_spawns += 1
+                    return False
+            self._last_profile = profile
+
+        self._activate(
+            self._next_image, self._next_y, self._next_type, self._next_images
+        )
+        return True
+
+    def draw(self, screen, alpha: float = 1.0, shade: int = 0) -> None:
         for obs in self.obstacles:
-            obs.draw(screen)
+            obs.draw(screen, alpha, shade)
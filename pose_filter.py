@@ -0,0 +1,128 @@
+import math
+from typing import Optional
+
+
+class OneEuroFilter:
+    """Filtro One Euro (Casiez et al.): suaviza mucho en reposo y poco en
+    movimiento rápido. Además del valor filtrado expone su velocidad."""
+
+    def __init__(self, min_cutoff: float, beta: float, d_cutoff: float) -> None:
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self.value: Optional[float] = None
+        self.velocity = 0.0
+        self._last_t = 0.0
+
+    @staticmethod
+    def _alpha(cutoff: float, dt: float) -> float:
+        tau = 1.0 / (2.0 * math.pi * cutoff)
+        return 1.0 / (1.0 + tau / dt)
+
+    def reset(self) -> None:
+        self.value = None
+        self.velocity = 0.0
+
+    def __call__(self, x: float, t: float) -> float:
+        if self.value is None:
+            self.value = x
+            self.velocity = 0.0
+            self._last_t = t
+            return x
+
+        dt = t - self._last_t
+        if dt <= 0.0:
+            return self.value
+        self._last_t = t
+
+        raw_velocity = (x - self.value) / dt
+        a_d = self._alpha(self.d_cutoff, dt)
+        self.velocity += a_d * (raw_velocity - self.velocity)
+
+        cutoff = self.min_cutoff + self.beta * abs(self.velocity)
+        a = self._alpha(cutoff, dt)
+        self.value += a * (x - self.value)
+        return self.value
+
+
+class PoseFilter:
+    """Decisión salto/agachado/mano con filtrado, histéresis y predicción.
+
+    Cada coordenada y pasa por un One Euro. Una acción se activa cuando el
+    valor filtrado, o su proyección `prediction_s` segundos hacia delante si
+    se mueve a más de `min_velocity`, cruza el umbral; se desactiva cuando esa
+    misma proyección vuelve `hysteresis` por detrás de la línea. Comparar la
+    suelta con el valor sin proyectar la adelantaría al frame siguiente si la
+    proyección supera la banda, y un salto predicho sería un salto corto.
+    """
+
+    def __init__(
+        self,
+        min_cutoff: float = 1.0,
+        beta: float = 1.0,
+        d_cutoff: float = 1.0,
+        hysteresis: float = 0.03,
+        prediction_s: float = 0.06,
+        min_velocity: float = 0.5,
+    ) -> None:
+        self.hysteresis = hysteresis
+        self.prediction_s = prediction_s
+        self.min_velocity = min_velocity
+
+        self.nose = OneEuroFilter(min_cutoff, beta, d_cutoff)
+        self.left_wrist = OneEuroFilter(min_cutoff, beta, d_cutoff)
+        self.right_wrist = OneEuroFilter(min_cutoff, beta, d_cutoff)
+
+        self.jump = False
+        self.duck = False
+        self.hand_raised = False
+
+    def reset(self) -> None:
+        self.nose.reset()
+        self.left_wrist.reset()
+        self.right_wrist.reset()
+        self.jump = False
+        self.duck = False
+        self.hand_raised = False
+
+    def _predicted(self, f: OneEuroFilter) -> float:
+        if abs(f.velocity) < self.min_velocity:
+            return f.value
+        return f.value + f.velocity * self.prediction_s
+
+    def _above(self, f: OneEuroFilter, line: float, active: bool) -> bool:
+        # "Arriba" en imagen es y menor que la línea
+        band = self.hysteresis if active else 0.0
+        return self._predicted(f) < line + band
+
+    def _below(self, f: OneEuroFilter, line: float, active: bool) -> bool:
+        band = self.hysteresis if active else 0.0
+        return self._predicted(f) > line - band
+
+    def classify(
+        self,
+        nose_y: float,
+        left_wrist_y: float,
+        right_wrist_y: float,
+        t: float,
+        game_over: bool,
+        umbral_salto: float,
+        umbral_agacharse: float,
+        umbral_mano_reset: float,
+    ) -> tuple[bool, bool, bool]:
+        self.nose(nose_y, t)
+        self.left_wrist(left_wrist_y, t)
+        self.right_wrist(right_wrist_y, t)
+
+        if game_over:
+            self.hand_raised = self._above(
+                self.left_wrist, umbral_mano_reset, self.hand_raised
+            ) or self._above(self.right_wrist, umbral_mano_reset, self.hand_raised)
+        else:
+            self.hand_raised = False
+
+        self.jump = self._above(self.nose, umbral_salto, self.jump)
+        self.duck = not self.jump and self._below(
+            self.nose, umbral_agacharse, self.duck
+        )
+        return self.jump, self.duck, self.hand_raised
@@ -0,0 +1,120 @@
+"""Landmarks de pose y su clasificación, sin cv2 ni MediaPipe.
+
+Lo importan las rutas que solo manejan trazas grabadas (LandmarkTraceSource,
+threshold_tuner, bench_input sobre un .npz) sin arrastrar la inferencia.
+"""
+
+import time
+from typing import Optional
+
+import numpy as np
+
+from pose_filter import PoseFilter
+
+NUM_LANDMARKS = 33
+
+# Índices de MediaPipe (PoseLandmark) que usa la clasificación
+NOSE = 0
+LEFT_WRIST = 15
+RIGHT_WRIST = 16
+
+
+class PoseResult:
+    __slots__ = ("jump", "duck", "hand_raised", "landmarks")
+
+    def __init__(
+        self,
+        jump: bool = False,
+        duck: bool = False,
+        hand_raised: bool = False,
+        landmarks: Optional[np.ndarray] = None,
+    ) -> None:
+        self.jump = jump
+        self.duck = duck
+        self.hand_raised = hand_raised
+        # (33, 3) con x, y, visibility normalizados, o None sin detección
+        self.landmarks = landmarks
+
+
+def classify_pose(
+    nose_y: float,
+    left_wrist_y: float,
+    right_wrist_y: float,
+    timestamp: float,
+    game_over: bool,
+    umbral_salto: float,
+    umbral_agacharse: float,
+    umbral_mano_reset: float,
+    pose_filter: Optional[PoseFilter],
+) -> tuple[bool, bool, bool]:
+    """Decide (salto, agachado, mano arriba) a partir de las coordenadas y."""
+    if pose_filter is not None:
+        return pose_filter.classify(
+            nose_y,
+            left_wrist_y,
+            right_wrist_y,
+            timestamp,
+            game_over,
+            umbral_salto,
+            umbral_agacharse,
+            umbral_mano_reset,
+        )
+    hand_raised = game_over and (
+        left_wrist_y < umbral_mano_reset or right_wrist_y < umbral_mano_reset
+    )
+    jump = nose_y < umbral_salto
+    duck = not jump and nose_y > umbral_agacharse
+    return jump, duck, hand_raised
+
+
+class TraceProcessor:
+    """Clasifica landmarks ya grabados con la misma lógica que PoseProcessor.
+
+    Recibe arrays (33, 3) de LandmarkTraceSource en lugar de imágenes, así
+    una traza se puede reproducir sin MediaPipe ni cámara.
+    """
+
+    def __init__(self, pose_filter: Optional[dict] = None) -> None:
+        self.pose_filter = (
+            PoseFilter(**pose_filter) if pose_filter is not None else None
+        )
+        self.inference_width = 0
+        self.model_complexity = 0
+
+    def configure(self, inference_width: int, model_complexity: int) -> None:
+        pass
+
+    def process(
+        self,
+        landmarks: np.ndarray,
+        game_over: bool,
+        umbral_salto: float,
+        umbral_agacharse: float,
+        umbral_mano_reset: float,
+        timestamp: Optional[float] = None,
+    ) -> PoseResult:
+        if timestamp is None:
+            timestamp = time.perf_counter()
+        result = PoseResult()
+
+        if np.isnan(landmarks[NOSE, 1]):
+            if self.pose_filter is not None:
+                self.pose_filter.reset()
+            return result
+
+        result.jump, result.duck, result.hand_raised = classify_pose(
+            float(landmarks[NOSE, 1]),
+            float(landmarks[LEFT_WRIST, 1]),
+            float(landmarks[RIGHT_WRIST, 1]),
+            timestamp,
+            game_over,
+            umbral_salto,
+            umbral_agacharse,
+            umbral_mano_reset,
+            self.pose_filter,
+        )
+        result.landmarks = landmarks
+        return result
+
+    def close(self) -> None:
+        pass
@@ -0,0 +1,135 @@
+from typing import Optional
+
+import numpy as np
+
+# Conexiones del esqueleto de MediaPipe Pose (mp.solutions.pose.POSE_CONNECTIONS),
+# copiadas para dibujar sin importar mediapipe en el proceso del juego
+POSE_CONNECTIONS = (
+    (0, 1),
+    (1, 2),
+    (2, 3),
+    (3, 7),
+    (0, 4),
+    (4, 5),
+    (5, 6),
+    (6, 8),
+    (9, 10),
+    (11, 12),
+    (11, 13),
+    (13, 15),
+    (15, 17),
+    (15, 19),
+    (15, 21),
+    (17, 19),
+    (12, 14),
+    (14, 16),
+    (16, 18),
+    (16, 20),
+    (16, 22),
+    (18, 20),
+    (11, 23),
+    (12, 24),
+    (23, 24),
+    (23, 25),
+    (24, 26),
+    (25, 27),
+    (26, 28),
+    (27, 29),
+    (28, 30),
+    (29, 31),
+    (30, 32),
+    (27, 31),
+    (28, 32),
+)
+
+# Igual que draw_landmarks: por debajo no se dibuja el punto
+MIN_VISIBILITY = 0.5
+
+COLOR_JUMP = (0, 255, 0)
+COLOR_DUCK = (255, 0, 0)
+COLOR_HAND = (255, 0, 255)
+COLOR_NEUTRAL = (255, 255, 255)
+COLOR_BONE = (245, 245, 245)
+COLOR_JOINT = (245, 66, 66)
+
+
+class PoseOverlay:
+    """Lo necesario para dibujar el overlay de un frame procesado.
+
+    Lo publica el hilo de resultados de InputHandler junto a la vista
+    previa; el juego lo dibuja encima con primitivas de pygame.
+    """
+
+    __slots__ = (
+        "landmarks",
+        "jump",
+        "duck",
+        "hand_raised",
+        "game_over",
+        "umbral_salto",
+        "umbral_agacharse",
+        "umbral_mano_reset",
+    )
+
+    def __init__(
+        self,
+        landmarks: Optional[np.ndarray],
+        jump: bool,
+        duck: bool,
+        hand_raised: bool,
+        game_over: bool,
+        umbral_salto: float,
+        umbral_agacharse: float,
+        umbral_mano_reset: float,
+    ) -> None:
+        # (33, 3) con x, y, visibility normalizados, o None sin detección
+        self.landmarks = landmarks
+        self.jump = jump
+        self.duck = duck
+        self.hand_raised = hand_raised
+        self.game_over = game_over
+        self.umbral_salto = umbral_salto
+        self.umbral_agacharse = umbral_agacharse
+        self.umbral_mano_reset = umbral_mano_reset
+
+
+def draw_pose_overlay(
+    renderer, area: tuple[int, int, int, int], overlay: PoseOverlay
+) -> None:
+    """Líneas de umbral, estado y esqueleto sobre la vista previa en `area`."""
+    x, y, width, height = area
+
+    def threshold(fraction: float, color: tuple[int, int, int]) -> None:
+        line_y = y + int(height * fraction)
+        renderer.line(color, (x, line_y), (x + width - 1, line_y), 2)
+
+    if overlay.game_over:
+        threshold(overlay.umbral_mano_reset, COLOR_HAND)
+    else:
+        threshold(overlay.umbral_salto, COLOR_JUMP)
+        threshold(overlay.umbral_agacharse, COLOR_DUCK)
+
+    landmarks = overlay.landmarks
+    if landmarks is None:
+        return
+
+    if overlay.jump:
+        renderer.text("SALTANDO", COLOR_JUMP, (x + 6, y + 6))
+    elif overlay.duck:
+        renderer.text("AGACHADO", COLOR_DUCK, (x + 6, y + 6))
+    else:
+        renderer.text("NEUTRO", COLOR_NEUTRAL, (x + 6, y + 6))
+    if overlay.game_over and overlay.hand_raised:
+        renderer.text("MANO ARRIBA - RESET", COLOR_HAND, (x + 6, y + 30))
+
+    xy = landmarks[:, :2]
+    points = np.rint(xy * (width, height) + (x, y)).astype(int).tolist()
+    # Fuera del frame no se dibuja: el overlay no debe salirse de la vista previa
+    inside = ((xy >= 0.0) & (xy <= 1.0)).all(axis=1)
+    visible = ((landmarks[:, 2] >= MIN_VISIBILITY) & inside).tolist()
+    for start, end in POSE_CONNECTIONS:
+        if visible[start] and visible[end]:
+            renderer.line(COLOR_BONE, points[start], points[end], 2)
+    for (px, py), shown in zip(points, visible):
+        if shown:
+            renderer.rect(COLOR_JOINT, (px - 2, py - 2, 5, 5), 0)
@@ -0,0 +1,138 @@
+import cv2
+import mediapipe as mp
+import numpy as np
+import time
+from typing import Optional
+from pose_filter import PoseFilter
+from pose_landmarks import (
+    LEFT_WRIST,
+    NOSE,
+    NUM_LANDMARKS,
+    RIGHT_WRIST,
+    PoseResult,
+    TraceProcessor,
+    classify_pose,
+)
+
+
+def render_preview(image: np.ndarray, out: np.ndarray, scratch: np.ndarray) -> None:
+    """Escala un frame BGR a la vista previa RGB en el layout de surfarray.
+
+    `scratch` es (alto, ancho, 3) y `out` su traspuesta (ancho, alto, 3), lista
+    para pygame.surfarray.blit_array sin más conversiones.
+    """
+    height, width, _ = scratch.shape
+    cv2.resize(image, (width, height), dst=scratch, interpolation=cv2.INTER_AREA)
+    cv2.cvtColor(scratch, cv2.COLOR_BGR2RGB, dst=scratch)
+    np.copyto(out, scratch.transpose(1, 0, 2))
+
+
+class PoseProcessor:
+    """Inferencia de MediaPipe y clasificación salto/agachado/mano.
+
+    Lo comparten el hilo de inferencia de InputHandler y el proceso de
+    pose_worker, así ambos modos toman exactamente las mismas decisiones.
+
+    Para CPUs lentas la inferencia puede hacerse a menor resolución
+    (`inference_width`) o con un modelo más ligero (`model_complexity`). Los
+    landmarks son normalizados, así que las decisiones no dependen del tamaño.
+    """
+
+    def __init__(
+        self,
+        min_detection_confidence: float = 0.5,
+        min_tracking_confidence: float = 0.5,
+        model_complexity: int = 1,
+        inference_width: int = 0,
+        pose_filter: Optional[dict] = None,
+    ) -> None:
+        self.mp_pose = mp.solutions.pose
+
+        self.min_detection_confidence = min_detection_confidence
+        self.min_tracking_confidence = min_tracking_confidence
+        self.model_complexity = model_complexity
+        self.pose = self._create_pose()
+
+        self.inference_width = inference_width
+
+        # Parámetros de PoseFilter; None = umbrales crudos sobre cada frame
+        self.pose_filter = (
+            PoseFilter(**pose_filter) if pose_filter is not None else None
+        )
+
+    def _create_pose(self):
+        return self.mp_pose.Pose(
+            model_complexity=self.model_complexity,
+            min_detection_confidence=self.min_detection_confidence,
+            min_tracking_confidence=self.min_tracking_confidence,
+        )
+
+    def configure(self, inference_width: int, model_complexity: int) -> None:
+        self.inference_width = inference_width
+        if model_complexity != self.model_complexity:
+            self.model_complexity = model_complexity
+            self.pose.close()
+            self.pose = self._create_pose()
+
+    def _infer(self, image: np.ndarray) -> Optional[np.ndarray]:
+        """Landmarks (33, 3) normalizados al frame, o None sin detección."""
+        height, width, _ = image.shape
+        if self.inference_width and width > self.inference_width:
+            scaled_height = max(1, round(height * self.inference_width / width))
+            image = cv2.resize(
+                image,
+                (self.inference_width, scaled_height),
+                interpolation=cv2.INTER_AREA,
+            )
+        rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+        rgb.flags.writeable = False
+        results = self.pose.process(rgb)
+        if not results.pose_landmarks:
+            return None
+        return np.array(
+            [(lm.x, lm.y, lm.visibility) for lm in results.pose_landmarks.landmark],
+            dtype=np.float32,
+        )
+
+    def process(
+        self,
+        image: np.ndarray,
+        game_over: bool,
+        umbral_salto: float,
+        umbral_agacharse: float,
+        umbral_mano_reset: float,
+        timestamp: Optional[float] = None,
+    ) -> PoseResult:
+        """Procesa un frame BGR sin modificarlo.
+
+        Las líneas de umbral, el estado y el esqueleto los dibuja el juego
+        sobre la vista previa (pose_overlay) a partir de `landmarks`.
+        """
+        if timestamp is None:
+            timestamp = time.perf_counter()
+        landmarks = self._infer(image)
+
+        result = PoseResult()
+
+        if landmarks is not None:
+            result.jump, result.duck, result.hand_raised = classify_pose(
+                float(landmarks[NOSE, 1]),
+                float(landmarks[LEFT_WRIST, 1]),
+                float(landmarks[RIGHT_WRIST, 1]),
+                timestamp,
+                game_over,
+                umbral_salto,
+                umbral_agacharse,
+                umbral_mano_reset,
+                self.pose_filter,
+            )
+
+            result.landmarks = landmarks
+        elif self.pose_filter is not None:
+            # Sin pose no hay trayectoria fiable que extrapolar
+            self.pose_filter.reset()
+
+        return result
+
+    def close(self) -> None:
+        self.pose.close()
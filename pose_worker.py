@@ -0,0 +1,402 @@
+import multiprocessing as mp
+import time
+from multiprocessing import shared_memory
+from typing import Optional
+
+import numpy as np
+
+from pose_landmarks import NUM_LANDMARKS
+
+FLAG_JUMP = 1
+FLAG_DUCK = 2
+FLAG_HAND_RAISED = 4
+FLAG_HAS_POSE = 8
+
+# Registro de resultado: seq del frame, captura, fin de inferencia, flags,
+# duración de la inferencia, tiempo en la fuente y landmarks
+RESULT_HEADER_FIELDS = 6
+RESULT_RECORD_SIZE = RESULT_HEADER_FIELDS + NUM_LANDMARKS * 3
+
+# Control compartido: game over, los tres umbrales y la configuración de pose
+CONTROL_GAME_OVER = 0
+CONTROL_UMBRAL_SALTO = 1
+CONTROL_UMBRAL_AGACHARSE = 2
+CONTROL_UMBRAL_MANO_RESET = 3
+CONTROL_INFERENCE_WIDTH = 4
+CONTROL_MODEL_COMPLEXITY = 5
+CONTROL_SIZE = 6
+
+
+class FrameRing:
+    """Anillo de frames BGR en memoria compartida con seqlock por hueco.
+
+    El escritor marca el hueco con -1 mientras copia y después publica su
+    número de secuencia; el lector descarta la copia si el número cambió.
+    """
+
+    def __init__(
+        self, shape: tuple[int, int, int], slots: int = 4, name: Optional[str] = None
+    ) -> None:
+        self.shape = shape
+        self.slots = slots
+        frame_bytes = int(np.prod(shape))
+        header_bytes = 8 * (1 + 3 * slots)
+        create = name is None
+        self.shm = shared_memory.SharedMemory(
+            name=name, create=create, size=header_bytes + frame_bytes * slots
+        )
+
+        # [write_seq, slot_seq * slots, capture_time * slots, media_time * slots]
+        self.header = np.ndarray((1 + 3 * slots,), dtype=np.int64, buffer=self.shm.buf)
+        self.times = self.header[1 + slots : 1 + 2 * slots].view(np.float64)
+        self.media_times = self.header[1 + 2 * slots :].view(np.float64)
+        self.frames = np.ndarray(
+            (slots, *shape), dtype=np.uint8, buffer=self.shm.buf, offset=header_bytes
+        )
+        if create:
+            self.header[:] = 0
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    @property
+    def write_seq(self) -> int:
+        return int(self.header[0])
+
+    def write(
+        self,
+        frame: np.ndarray,
+        capture_time: float,
+        media_time: Optional[float] = None,
+    ) -> int:
+        seq = int(self.header[0]) + 1
+        index = seq % self.slots
+        self.header[1 + index] = -1
+        np.copyto(self.frames[index], frame)
+        self.times[index] = capture_time
+        self.media_times[index] = capture_time if media_time is None else media_time
+        self.header[1 + index] = seq
+        self.header[0] = seq
+        return seq
+
+    def read(self, seq: int, out: np.ndarray) -> Optional[tuple[float, float]]:
+        """Copia el frame en `out` y devuelve (captura, tiempo en la fuente)."""
+        index = seq % self.slots
+        if self.header[1 + index] != seq:
+            return None
+        np.copyto(out, self.frames[index])
+        capture_time = float(self.times[index])
+        media_time = float(self.media_times[index])
+        if self.header[1 + index] != seq:
+            return None
+        return capture_time, media_time
+
+    def close(self, unlink: bool = False) -> None:
+        del self.header, self.times, self.media_times, self.frames
+        self.shm.close()
+        if unlink:
+            self.shm.unlink()
+
+
+class ResultRing:
+    """Anillo de resultados de pose con su vista previa ya escalada.
+
+    Cada hueco guarda un registro float64 y la vista previa RGB del mismo
+    frame en layout de surfarray, protegidos por el mismo número de secuencia.
+    """
+
+    HEADER_SIZE = 3  # write_seq, frames descartados, frames procesados
+
+    def __init__(
+        self,
+        preview_shape: tuple[int, int, int],
+        slots: int = 4,
+        name: Optional[str] = None,
+    ) -> None:
+        self.slots = slots
+        create = name is None
+        floats_size = 8 * (
+            self.HEADER_SIZE + slots * (1 + RESULT_RECORD_SIZE) + CONTROL_SIZE
+        )
+        preview_size = slots * int(np.prod(preview_shape))
+        size = floats_size + preview_size
+        self.shm = shared_memory.SharedMemory(name=name, create=create, size=size)
+
+        self.header = np.ndarray(
+            (self.HEADER_SIZE,), dtype=np.int64, buffer=self.shm.buf
+        )
+        offset = 8 * self.HEADER_SIZE
+        self.record_seq = np.ndarray(
+            (slots,), dtype=np.int64, buffer=self.shm.buf, offset=offset
+        )
+        offset += 8 * slots
+        self.records = np.ndarray(
+            (slots, RESULT_RECORD_SIZE),
+            dtype=np.float64,
+            buffer=self.shm.buf,
+            offset=offset,
+        )
+        offset += 8 * slots * RESULT_RECORD_SIZE
+        self.control = np.ndarray(
+            (CONTROL_SIZE,), dtype=np.float64, buffer=self.shm.buf, offset=offset
+        )
+        self.previews = np.ndarray(
+            (slots, *preview_shape),
+            dtype=np.uint8,
+            buffer=self.shm.buf,
+            offset=floats_size,
+        )
+        if create:
+            self.header[:] = 0
+            self.record_seq[:] = 0
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    @property
+    def write_seq(self) -> int:
+        return int(self.header[0])
+
+    def begin_write(self) -> tuple[int, np.ndarray, np.ndarray]:
+        """Reserva el siguiente hueco y devuelve (seq, registro, vista previa)."""
+        seq = int(self.header[0]) + 1
+        index = seq % self.slots
+        self.record_seq[index] = -1
+        return seq, self.records[index], self.previews[index]
+
+    def end_write(self, seq: int) -> None:
+        self.record_seq[seq % self.slots] = seq
+        self.header[0] = seq
+
+    def read(
+        self, seq: int, out: np.ndarray, out_preview: Optional[np.ndarray] = None
+    ) -> bool:
+        index = seq % self.slots
+        if self.record_seq[index] != seq:
+            return False
+        np.copyto(out, self.records[index])
+        if out_preview is not None:
+            np.copyto(out_preview, self.previews[index])
+        return bool(self.record_seq[index] == seq)
+
+    def close(self, unlink: bool = False) -> None:
+        del self.header, self.record_seq, self.records, self.control, self.previews
+        self.shm.close()
+        if unlink:
+            self.shm.unlink()
+
+
+def _worker_main(
+    frame_ring_name: str,
+    result_ring_name: str,
+    shape: tuple[int, int, int],
+    preview_shape: tuple[int, int, int],
+    pose_options: dict,
+    frame_slots: int,
+    result_slots: int,
+    frame_event,
+    result_event,
+    stop_event,
+) -> None:
+    from pose_pipeline import PoseProcessor, render_preview
+
+    frames = FrameRing(shape, frame_slots, name=frame_ring_name)
+    results = ResultRing(preview_shape, result_slots, name=result_ring_name)
+    # El cliente rellena la configuración antes de arrancar el proceso (y
+    # puede cambiarla después con set_pose_config): aquí solo se lee
+    control = results.control
+    processor = PoseProcessor(
+        **dict(
+            pose_options,
+            inference_width=int(control[CONTROL_INFERENCE_WIDTH]),
+            model_complexity=int(control[CONTROL_MODEL_COMPLEXITY]),
+        )
+    )
+
+    image = np.empty(shape, dtype=np.uint8)
+    preview_scratch = np.empty((preview_shape[1], preview_shape[0], 3), dtype=np.uint8)
+    last_seq = 0
+
+    try:
+        while not stop_event.is_set():
+            if not frame_event.wait(timeout=0.1):
+                continue
+            frame_event.clear()
+
+            seq = frames.write_seq
+            if seq <= last_seq:
+                continue
+            times = frames.read(seq, image)
+            if times is None:
+                continue
+            capture_time, media_time = times
+            if last_seq:
+                results.header[1] += seq - last_seq - 1
+            last_seq = seq
+
+            control = results.control
+            inference_width = int(control[CONTROL_INFERENCE_WIDTH])
+            model_complexity = int(control[CONTROL_MODEL_COMPLEXITY])
+            if (
+                inference_width != processor.inference_width
+                or model_complexity != processor.model_complexity
+            ):
+                processor.configure(inference_width, model_complexity)
+
+            start = time.perf_counter()
+            result = processor.process(
+                image,
+                bool(control[CONTROL_GAME_OVER]),
+                float(control[CONTROL_UMBRAL_SALTO]),
+                float(control[CONTROL_UMBRAL_AGACHARSE]),
+                float(control[CONTROL_UMBRAL_MANO_RESET]),
+                media_time,
+            )
+
+            flags = (
+                (FLAG_JUMP if result.jump else 0)
+                | (FLAG_DUCK if result.duck else 0)
+                | (FLAG_HAND_RAISED if result.hand_raised else 0)
+            )
+            result_seq, record, preview = results.begin_write()
+            record[0] = seq
+            record[1] = capture_time
+            record[2] = time.perf_counter()
+            record[4] = record[2] - start
+            record[5] = media_time
+            if result.landmarks is not None:
+                flags |= FLAG_HAS_POSE
+                record[RESULT_HEADER_FIELDS:] = result.landmarks.ravel()
+            record[3] = flags
+
+            render_preview(image, preview, preview_scratch)
+            results.end_write(result_seq)
+            results.header[2] += 1
+            result_event.set()
+    finally:
+        processor.close()
+        frames.close()
+        results.close()
+
+
+class PoseProcessClient:
+    """Lado del juego del worker de pose en un proceso aparte.
+
+    Los frames y resultados viajan por memoria compartida; entre procesos
+    solo se envían los nombres de los segmentos y unos Event para despertar.
+    """
+
+    def __init__(
+        self,
+        shape: tuple[int, int, int],
+        preview_shape: tuple[int, int, int],
+        pose_options: Optional[dict] = None,
+        frame_slots: int = 4,
+        result_slots: int = 4,
+    ) -> None:
+        # spawn: el hijo no hereda el estado de pygame ni los hilos de la cámara
+        ctx = mp.get_context("spawn")
+        self.frames = FrameRing(shape, frame_slots)
+        self.results = ResultRing(preview_shape, result_slots)
+        self.frame_event = ctx.Event()
+        self.result_event = ctx.Event()
+        self.stop_event = ctx.Event()
+
+        self._record = np.zeros(RESULT_RECORD_SIZE, dtype=np.float64)
+        self._last_result_seq = 0
+
+        pose_options = pose_options or {}
+        # Antes de arrancar: el worker solo lee estos campos, así no pisa un
+        # set_pose_config que llegue mientras se inicia
+        self.set_pose_config(
+            pose_options.get("inference_width", 0),
+            pose_options.get("model_complexity", 1),
+        )
+
+        self.process = ctx.Process(
+            target=_worker_main,
+            args=(
+                self.frames.name,
+                self.results.name,
+                shape,
+                preview_shape,
+                pose_options,
+                frame_slots,
+                result_slots,
+                self.frame_event,
+                self.result_event,
+                self.stop_event,
+            ),
+            daemon=True,
+        )
+        self.process.start()
+
+    def set_control(
+        self,
+        game_over: bool,
+        umbral_salto: float,
+        umbral_agacharse: float,
+        umbral_mano_reset: float,
+    ) -> None:
+        control = self.results.control
+        control[CONTROL_GAME_OVER] = 1.0 if game_over else 0.0
+        control[CONTROL_UMBRAL_SALTO] = umbral_salto
+        control[CONTROL_UMBRAL_AGACHARSE] = umbral_agacharse
+        control[CONTROL_UMBRAL_MANO_RESET] = umbral_mano_reset
+
+    def set_pose_config(self, inference_width: int, model_complexity: int) -> None:
+        control = self.results.control
+        control[CONTROL_INFERENCE_WIDTH] = inference_width
+        control[CONTROL_MODEL_COMPLEXITY] = model_complexity
+
+    def submit(
+        self,
+        frame: np.ndarray,
+        capture_time: float,
+        media_time: Optional[float] = None,
+    ) -> int:
+        seq = self.frames.write(frame, capture_time, media_time)
+        self.frame_event.set()
+        return seq
+
+    def wait_result(
+        self, timeout: float, out_preview: Optional[np.ndarray] = None
+    ) -> Optional[np.ndarray]:
+        """Devuelve el resultado más reciente aún no leído, o None.
+
+        Si se pasa `out_preview`, copia en él la vista previa del mismo frame.
+        """
+        seq = self.results.write_seq
+        if seq <= self._last_result_seq:
+            if not self.result_event.wait(timeout):
+                return None
+            self.result_event.clear()
+            seq = self.results.write_seq
+            if seq <= self._last_result_seq:
+                return None
+        if not self.results.read(seq, self._record, out_preview):
+            return None
+        self._last_result_seq = seq
+        return self._record
+
+    @property
+    def dropped_frames(self) -> int:
+        return int(self.results.header[1])
+
+    @property
+    def processed_frames(self) -> int:
+        return int(self.results.header[2])
+
+    def is_alive(self) -> bool:
+        return self.process.is_alive()
+
+    def close(self) -> None:
+        self.stop_event.set()
+        self.frame_event.set()
+        self.process.join(timeout=2.0)
+        if self.process.is_alive():
+            self.process.terminate()
+        self.frames.close(unlink=True)
+        self.results.close(unlink=True)
@@ -0,0 +1,139 @@
+import contextlib
+import json
+import os
+import threading
+import time
+from collections import deque
+from typing import Optional
+
+_NULL_SECTION = contextlib.nullcontext()
+
+
+class _Section:
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler: "FrameProfiler", name: str) -> None:
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self) -> None:
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc) -> None:
+        self.profiler.record(self.name, self.start, time.perf_counter())
+
+
+class FrameProfiler:
+    """Tiempos por subsistema del bucle principal y del hilo de la cámara.
+
+    Cada muestra es un intervalo (nombre, inicio, fin, hilo). Se guardan las
+    últimas `window` duraciones por nombre para el HUD y los últimos
+    `max_events` intervalos para exportar como trace de Chrome
+    (chrome://tracing o Perfetto). Desactivado no mide nada: section()
+    devuelve un contexto vacío e instrument() no envuelve.
+    """
+
+    def __init__(
+        self, enabled: bool = True, window: int = 120, max_events: int = 200_000
+    ) -> None:
+        self.enabled = enabled
+        self.window = window
+        self._lock = threading.Lock()
+        self._durations: dict[str, deque[float]] = {}
+        self._events: deque[tuple[str, float, float, object]] = deque(maxlen=max_events)
+        self._thread_names: dict[object, str] = {}
+        self._origin = time.perf_counter()
+
+    def record(
+        self, name: str, start: float, end: float, thread: Optional[str] = None
+    ) -> None:
+        if not self.enabled:
+            return
+        if thread is None:
+            current = threading.current_thread()
+            thread = current.ident
+            thread_name = current.name
+        else:
+            # Intervalos medidos fuera de este proceso (worker de pose)
+            thread_name = thread
+        with self._lock:
+            self._thread_names.setdefault(thread, thread_name)
+            durations = self._durations.get(name)
+            if durations is None:
+                durations = self._durations[name] = deque(maxlen=self.window)
+            durations.append(end - start)
+            self._events.append((name, start, end, thread))
+
+    def section(self, name: str):
+        if not self.enabled:
+            return _NULL_SECTION
+        return _Section(self, name)
+
+    def instrument(self, owner, attribute: str, name: str) -> None:
+        """Sustituye owner.attribute por una versión cronometrada."""
+        if not self.enabled:
+            return
+        function = getattr(owner, attribute)
+        record = self.record
+        perf_counter = time.perf_counter
+
+        def timed(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                record(name, start, perf_counter())
+
+        setattr(owner, attribute, timed)
+
+    def stats(self) -> dict[str, dict[str, float]]:
+        with self._lock:
+            items = [(name, list(values)) for name, values in self._durations.items()]
+        return {
+            name: {
+                "avg_ms": sum(values) / len(values) * 1000.0,
+                "max_ms": max(values) * 1000.0,
+                "count": len(values),
+            }
+            for name, values in items
+            if values
+        }
+
+    def hud_lines(self, limit: int = 14) -> list[str]:
+        stats = sorted(self.stats().items(), key=lambda item: -item[1]["avg_ms"])
+        lines = [f"Perfil (últimas {self.window} muestras) media/máx ms"]
+        for name, values in stats[:limit]:
+            lines.append(f"{name}: {values['avg_ms']:.2f}/{values['max_ms']:.2f}")
+        return lines
+
+    def export_chrome_trace(self, path: str) -> None:
+        with self._lock:
+            events = list(self._events)
+            thread_names = dict(self._thread_names)
+        pid = os.getpid()
+        # El formato espera tid numéricos: cada hilo recibe un índice
+        tids = {thread: i for i, thread in enumerate(thread_names)}
+        trace = [
+            {
+                "name": "thread_name",
+                "ph": "M",
+                "pid": pid,
+                "tid": tids[thread],
+                "args": {"name": name},
+            }
+            for thread, name in thread_names.items()
+        ]
+        for name, start, end, thread in events:
+            trace.append(
+                {
+                    "name": name,
+                    "cat": name.split(".", 1)[0],
+                    "ph": "X",
+                    "ts": (start - self._origin) * 1e6,
+                    "dur": (end - start) * 1e6,
+                    "pid": pid,
+                    "tid": tids[thread],
+                }
+            )
+        with open(path, "w") as f:
+            json.dump({"traceEvents": trace, "displayTimeUnit": "ms"}, f)
@@ -0,0 +1,227 @@
+from collections import OrderedDict
+from typing import Optional
+
+import pygame
+
+
+class TextCache:
+    """Surfaces de texto ya renderizadas, por (texto, color), con LRU."""
+
+    def __init__(self, font: pygame.font.Font, max_entries: int = 128) -> None:
+        self.font = font
+        self.max_entries = max_entries
+        self._cache: OrderedDict[tuple, pygame.Surface] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, text: str, color: tuple[int, int, int]) -> pygame.Surface:
+        key = (text, color)
+        surface = self._cache.get(key)
+        if surface is not None:
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return surface
+        self.misses += 1
+        surface = self.font.render(text, True, color)
+        self._cache[key] = surface
+        if len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+        return surface
+
+
+class Renderer:
+    """Render por rectángulos sucios con la misma interfaz de blit que Surface.
+
+    Cada frame se describe entero (blit, rect, line, text) pero no se dibuja al
+    momento: present() compara con el frame anterior y solo repinta y envía a
+    la pantalla las zonas donde algo apareció, se movió o desapareció. Un
+    blit cuyo contenido cambió sin cambiar de Surface (la vista previa de la
+    cámara) se marca con `changed=True`. Cambiar el color de fondo (día/noche)
+    fuerza un frame completo.
+
+    Cada zona sucia repinta todas las operaciones que la tocan, así que con
+    muchas zonas (cientos de obstáculos) sale más caro que un frame completo:
+    pasadas `max_regions` zonas o `max_dirty_fraction` de la pantalla se
+    repinta todo.
+    """
+
+    def __init__(
+        self,
+        screen: pygame.Surface,
+        font: pygame.font.Font,
+        max_regions: int = 48,
+        max_dirty_fraction: float = 0.5,
+    ) -> None:
+        self.screen = screen
+        self.bounds = screen.get_rect()
+        self.text_cache = TextCache(font)
+        self._background: Optional[tuple[int, int, int]] = None
+        self._full_redraw = True
+        # (firma, rect, tipo, argumentos, cambió)
+        self._ops: list[tuple] = []
+        self._previous: list[tuple] = []
+        # Firmas de _previous; None tras un frame completo (se calculan al usarlas)
+        self._previous_signatures: Optional[set] = None
+        self.max_regions = max_regions
+        self.max_dirty_fraction = max_dirty_fraction
+
+        self.frames = 0
+        self.full_frames = 0
+        self.dirty_fraction = 1.0
+
+    def invalidate(self) -> None:
+        self._full_redraw = True
+
+    def begin(self, background: tuple[int, int, int]) -> None:
+        if background != self._background:
+            self._background = background
+            self._full_redraw = True
+        self._ops = []
+
+    def blit(
+        self,
+        surface: pygame.Surface,
+        pos: tuple[float, float],
+        changed: bool = False,
+    ) -> pygame.Rect:
+        rect = surface.get_rect(topleft=(int(pos[0]), int(pos[1])))
+        rect = rect.clip(self.bounds)
+        if rect.width and rect.height:
+            # La Surface queda referenciada en _previous, así su id no se
+            # reutiliza mientras se compara contra ella
+            signature = (id(surface), pos[0], pos[1])
+            self._ops.append((signature, rect, "blit", (surface, pos), changed))
+        return rect
+
+    def rect(
+        self, color: tuple[int, int, int], rect: tuple[int, int, int, int], width: int
+    ) -> None:
+        rect = pygame.Rect(rect).clip(self.bounds)
+        signature = ("rect", color, tuple(rect), width)
+        self._ops.append((signature, rect, "rect", (color, rect, width), False))
+
+    def line(
+        self,
+        color: tuple[int, int, int],
+        start: tuple[int, int],
+        end: tuple[int, int],
+        width: int = 1,
+    ) -> None:
+        x0, y0 = start
+        x1, y1 = end
+        rect = pygame.Rect(min(x0, x1), min(y0, y1), abs(x1 - x0) + 1, abs(y1 - y0) + 1)
+        rect = rect.inflate(2 * width, 2 * width).clip(self.bounds)
+        signature = ("line", color, x0, y0, x1, y1, width)
+        self._ops.append((signature, rect, "line", (color, start, end, width), False))
+
+    def text(
+        self,
+        text: str,
+        color: tuple[int, int, int],
+        pos: Optional[tuple[float, float]] = None,
+        center: Optional[tuple[float, float]] = None,
+    ) -> None:
+        surface = self.text_cache.render(text, color)
+        if center is not None:
+            pos = surface.get_rect(center=center).topleft
+        self.blit(surface, pos)
+
+    def _draw(self, op: tuple) -> None:
+        _, _, kind, args, _ = op
+        if kind == "blit":
+            surface, pos = args
+            self.screen.blit(surface, pos)
+        elif kind == "line":
+            color, start, end, width = args
+            pygame.draw.line(self.screen, color, start, end, width)
+        else:
+            color, rect, width = args
+            pygame.draw.rect(self.screen, color, rect, width)
+
+    def _merge(self, rects: list[pygame.Rect]) -> list[pygame.Rect]:
+        """Une las zonas que se solapan barriendo de izquierda a derecha.
+
+        Solo se compara con las zonas abiertas (las que llegan a la x actual):
+        las demás ya no pueden solapar con nada que venga después. Alguna
+        unión puede acabar pisando una zona cerrada; se repinta dos veces, sin
+        error.
+        """
+        rects = sorted(rects, key=lambda r: r.x)
+        merged: list[pygame.Rect] = []
+        active: list[pygame.Rect] = []
+        for rect in rects:
+            left = rect.x
+            if active:
+                still_open = []
+                for other in active:
+                    if other.right < left:
+                        merged.append(other)
+                    else:
+                        still_open.append(other)
+                active = still_open
+            index = rect.collidelist(active)
+            while index != -1:
+                rect = rect.union(active.pop(index))
+                index = rect.collidelist(active)
+            active.append(rect)
+        merged.extend(active)
+        return merged
+
+    def _present_full(self, ops: list[tuple]) -> None:
+        self.screen.fill(self._background)
+        for op in ops:
+            self._draw(op)
+        pygame.display.update()
+        self._full_redraw = False
+        self.full_frames += 1
+        self.dirty_fraction = 1.0
+        self._previous = ops
+        self._previous_signatures = None
+
+    def present(self) -> None:
+        """Repinta las zonas sucias y las envía con pygame.display.update."""
+        screen = self.screen
+        ops = self._ops
+        self.frames += 1
+
+        if self._full_redraw:
+            self._present_full(ops)
+            return
+
+        previous_signatures = self._previous_signatures
+        if previous_signatures is None:
+            previous_signatures = {op[0] for op in self._previous}
+        # Se corta en cuanto hay demasiadas zonas: el frame será completo
+        limit = 2 * self.max_regions
+        dirty = []
+        for op in ops:
+            if op[4] or op[0] not in previous_signatures:
+                dirty.append(op[1])
+                if len(dirty) > limit:
+                    self._present_full(ops)
+                    return
+        current_signatures = {op[0] for op in ops}
+        dirty += [op[1] for op in self._previous if op[0] not in current_signatures]
+        if len(dirty) > limit:
+            self._present_full(ops)
+            return
+        dirty = self._merge(dirty)
+        area = sum(r.width * r.height for r in dirty)
+        dirty_fraction = area / (self.bounds.width * self.bounds.height)
+        if len(dirty) > self.max_regions or dirty_fraction > self.max_dirty_fraction:
+            self._present_full(ops)
+            return
+
+        for region in dirty:
+            screen.set_clip(region)
+            screen.fill(self._background, region)
+            for op in ops:
+                if op[1].colliderect(region):
+                    self._draw(op)
+        screen.set_clip(None)
+
+        if dirty:
+            pygame.display.update(dirty)
+        self.dirty_fraction = dirty_fraction
+        self._previous = ops
+        self._previous_signatures = current_signatures
@@ -0,0 +1,148 @@
+import os
+
+# Sin ventana real, como bench.py
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import argparse
+import sys
+from typing import Optional
+
+import numpy as np
+import pygame
+
+import assets
+from input_backends import ScriptedInput
+from obstacles import ObstacleManager
+from renderer import Renderer
+from settings import GROUND_Y_POS, SCREEN_HEIGHT, SCREEN_WIDTH
+from simulation import GameState, autopilot_inputs, sample_inputs
+
+# Sub-frames de render por tick: ejercita la interpolación entre ticks
+ALPHAS = (0.0, 0.5)
+
+
+def draw_scene(
+    renderer: Renderer,
+    state: GameState,
+    alpha: float,
+    camera: pygame.Surface,
+    camera_changed: bool,
+) -> None:
+    """Lo mismo que describe main.py por frame, sin HUD de pose ni perfiles."""
+    fg_color = state.fg_color
+    shade = state.night_step
+    renderer.begin(state.bg_color)
+
+    border_color = (255, 0, 255) if state.game_over else fg_color
+    width, height = camera.get_size()
+    renderer.rect(border_color, (8, 8, width + 4, height + 4), 3)
+    renderer.blit(camera, (10, 10), changed=camera_changed)
+
+    ground_img = assets.ground_image()
+    ground = assets.shaded(ground_img, shade)
+    ground_x = round(state.interpolated_ground_x(alpha))
+    renderer.blit(ground, (ground_x, GROUND_Y_POS + 10))
+    renderer.blit(ground, (ground_x + ground.get_width(), GROUND_Y_POS + 10))
+
+    state.player.draw(renderer, alpha, shade)
+    state.obstacle_manager.draw(renderer, alpha, shade)
+
+    renderer.text(f"Pts {int(state.score):05d}", fg_color, (SCREEN_WIDTH - 150, 20))
+    if state.game_over:
+        renderer.text(
+            "Levanta la mano (o pulsa R) para reiniciar",
+            fg_color,
+            center=(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2),
+        )
+
+
+def check_renderer(ticks: int, seed: int, stress: Optional[int] = None) -> dict:
+    """Compara píxel a píxel los rectángulos sucios con un repintado completo.
+
+    La misma escena se describe en dos Renderer: el de la pantalla trabaja
+    como en el juego y el de referencia, sobre una Surface aparte, repinta
+    todo en cada frame. Con `stress` hay ese número de obstáculos a la vez,
+    para pasar también por el repintado completo por carga.
+    """
+    pygame.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    # Mismo formato de píxel que la pantalla, para comparar sin convertir
+    reference = screen.copy()
+    assets.preload()
+    font = pygame.font.SysFont("consolas", 20)
+    renderer = Renderer(screen, font)
+    full = Renderer(reference, font)
+
+    state = GameState(seed)
+    if stress is not None:
+        state.obstacle_manager = ObstacleManager(
+            state.rng,
+            capacity=stress + stress // 20 + 16,
+            spawn_gap=(SCREEN_WIDTH + 200) / stress,
+        )
+    script = ScriptedInput(lambda: autopilot_inputs(state), restart_ticks=30)
+    rng = np.random.default_rng(seed)
+    camera = pygame.Surface((64, 48))
+
+    mismatched = 0
+    frames = 0
+    for tick in range(ticks):
+        script.update()
+        script.set_game_over(state.game_over)
+        if state.game_over and script.is_hand_raised_just_now():
+            state.reset()
+            script.reset()
+        if state.game_over:
+            script.tick_inputs()
+        else:
+            state.step(sample_inputs(script))
+            if stress is not None:
+                # Sin muertes: la densidad se mantiene toda la prueba
+                state.game_over = False
+
+        # La vista previa cambia de contenido sin cambiar de Surface
+        camera_changed = tick % 3 == 0
+        if camera_changed:
+            pygame.surfarray.blit_array(
+                camera, rng.integers(0, 256, (64, 48, 3), dtype=np.uint8)
+            )
+        for i, alpha in enumerate(ALPHAS):
+            changed = camera_changed and i == 0
+            draw_scene(renderer, state, alpha, camera, changed)
+            renderer.present()
+            full.invalidate()
+            draw_scene(full, state, alpha, camera, changed)
+            full.present()
+            frames += 1
+            if not np.array_equal(
+                pygame.surfarray.pixels2d(screen), pygame.surfarray.pixels2d(reference)
+            ):
+                mismatched += 1
+
+    result = {
+        "frames": frames,
+        "mismatched_frames": mismatched,
+        "full_frames": renderer.full_frames,
+    }
+    pygame.quit()
+    return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Comprueba que el render por rectángulos sucios pinta lo "
+        "mismo que un frame completo"
+    )
+    parser.add_argument("--ticks", type=int, default=6000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--stress", type=int, metavar="N", help="N obstáculos a la vez en pantalla"
+    )
+    args = parser.parse_args()
+
+    result = check_renderer(args.ticks, args.seed, args.stress)
+    print(
+        f"{result['frames']} frames | {result['full_frames']} completos | "
+        f"{result['mismatched_frames']} distintos del repintado completo"
+    )
+    sys.exit(1 if result["mismatched_frames"] else 0)
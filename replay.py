@@ -0,0 +1,239 @@
+import argparse
+import struct
+import threading
+import time
+from typing import Iterator, Optional
+
+import numpy as np
+
+from simulation import GameState
+
+# Formato: cabecera y después registros etiquetados, todo little-endian.
+# Se escribe solo añadiendo al final; un registro cortado al final del
+# archivo (el juego se cerró a medias) se ignora al leer.
+MAGIC = b"DJRP"
+VERSION = 2
+HEADER = struct.Struct("<4sBQ")  # magic, versión, semilla de GameState
+
+TAG_TICKS = 1  # bitfield INPUT_* repetido en `count` ticks seguidos
+TAG_RESET = 2  # reinicio tras `dwell` ticks en la pantalla de game over
+TAG_LANDMARKS = 3  # muestra de pose (diagnóstico, no afecta a la partida)
+
+TICKS = struct.Struct("<BBH")  # tag, bits, count
+RESET = struct.Struct("<BI")  # tag, dwell
+LANDMARKS = struct.Struct("<BdIH")  # tag, timestamp, tick, puntos (0 = sin pose)
+
+MAX_RUN = 0xFFFF
+
+# Valores de ReplayPlayer.inputs() para un reinicio y para un tick en game
+# over antes de él
+RESET_INPUT = -1
+GAME_OVER_INPUT = -2
+
+
+class ReplayWriter:
+    """Graba una partida para reproducirla tick a tick.
+
+    Se guarda la semilla y el bitfield de entrada de cada tick de
+    simulación, comprimido por tramos iguales (casi todo el tiempo no se
+    pulsa nada). Los ticks en game over no tienen entrada: solo se cuentan
+    y se guardan con el reinicio, así la reproducción muestra la pantalla de
+    game over lo mismo que se vio. add() tiene la interfaz de
+    LandmarkTraceRecorder, así InputHandler puede añadir los landmarks desde
+    el hilo de la cámara.
+    """
+
+    def __init__(self, path: str, seed: int, buffer_size: int = 1 << 16) -> None:
+        self.seed = seed
+        self._lock = threading.Lock()
+        self._file = open(path, "wb", buffering=buffer_size)
+        self._file.write(HEADER.pack(MAGIC, VERSION, seed))
+        self._bits = 0
+        self._run = 0
+        self._dwell = 0
+        self.ticks = 0
+
+    def _flush_run(self) -> None:
+        if self._run:
+            self._file.write(TICKS.pack(TAG_TICKS, self._bits, self._run))
+            self._run = 0
+
+    def tick(self, bits: int) -> None:
+        with self._lock:
+            if self._run and (bits != self._bits or self._run == MAX_RUN):
+                self._flush_run()
+            self._bits = bits
+            self._run += 1
+            self.ticks += 1
+
+    def game_over_tick(self) -> None:
+        with self._lock:
+            self._dwell += 1
+            self.ticks += 1
+
+    def reset(self) -> None:
+        with self._lock:
+            self._flush_run()
+            self._file.write(RESET.pack(TAG_RESET, self._dwell))
+            self._dwell = 0
+
+    def add(self, timestamp: float, landmarks: Optional[np.ndarray]) -> None:
+        if landmarks is None:
+            points = b""
+        else:
+            points = np.asarray(landmarks, dtype="<f2").reshape(-1, 3).tobytes()
+        with self._lock:
+            if self._file.closed:
+                return
+            self._file.write(
+                LANDMARKS.pack(TAG_LANDMARKS, timestamp, self.ticks, len(points) // 6)
+            )
+            self._file.write(points)
+
+    def close(self) -> None:
+        with self._lock:
+            if not self._file.closed:
+                self._flush_run()
+                self._file.close()
+
+
+def read_replay(path: str) -> tuple[int, list[tuple]]:
+    """Devuelve (semilla, registros).
+
+    Los registros son (TAG_TICKS, bits, count), (TAG_RESET, dwell) o
+    (TAG_LANDMARKS, timestamp, tick, landmarks o None).
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    if len(data) < HEADER.size:
+        raise ValueError(f"{path}: no es una repetición")
+    magic, version, seed = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"{path}: no es una repetición (versión {VERSION})")
+
+    records: list[tuple] = []
+    offset = HEADER.size
+    size = len(data)
+    while offset < size:
+        tag = data[offset]
+        if tag == TAG_TICKS:
+            if offset + TICKS.size > size:
+                break
+            _, bits, count = TICKS.unpack_from(data, offset)
+            offset += TICKS.size
+            records.append((TAG_TICKS, bits, count))
+        elif tag == TAG_RESET:
+            if offset + RESET.size > size:
+                break
+            _, dwell = RESET.unpack_from(data, offset)
+            offset += RESET.size
+            records.append((TAG_RESET, dwell))
+        elif tag == TAG_LANDMARKS:
+            if offset + LANDMARKS.size > size:
+                break
+            _, timestamp, tick, points = LANDMARKS.unpack_from(data, offset)
+            offset += LANDMARKS.size
+            end = offset + points * 6
+            if end > size:
+                break
+            landmarks = None
+            if points:
+                landmarks = np.frombuffer(data, "<f2", points * 3, offset)
+                landmarks = landmarks.reshape(points, 3)
+            offset = end
+            records.append((TAG_LANDMARKS, timestamp, tick, landmarks))
+        else:
+            raise ValueError(f"{path}: registro desconocido {tag} en {offset}")
+    return seed, records
+
+
+class ReplayPlayer:
+    """Reproduce una grabación sobre un GameState, un tick por llamada."""
+
+    def __init__(self, path: str) -> None:
+        self.seed, self.records = read_replay(path)
+        self._inputs = self.inputs()
+        self.finished = False
+
+    def inputs(self) -> Iterator[int]:
+        """Bitfield de cada tick; GAME_OVER_INPUT en los ticks de game over
+        antes de un reinicio y RESET_INPUT en el propio reinicio."""
+        for record in self.records:
+            if record[0] == TAG_TICKS:
+                _, bits, count = record
+                for _ in range(count):
+                    yield bits
+            elif record[0] == TAG_RESET:
+                for _ in range(record[1]):
+                    yield GAME_OVER_INPUT
+                yield RESET_INPUT
+
+    def landmarks(self) -> list[tuple[float, int, Optional[np.ndarray]]]:
+        return [r[1:] for r in self.records if r[0] == TAG_LANDMARKS]
+
+    def new_state(self) -> GameState:
+        return GameState(self.seed)
+
+    def step(self, state: GameState) -> bool:
+        """Aplica el siguiente tick o reinicio; False al acabar la grabación."""
+        bits = next(self._inputs, None)
+        if bits is None:
+            self.finished = True
+            return False
+        if bits == RESET_INPUT:
+            # El reinicio fue entre dos ticks: este ya es de la partida nueva
+            state.reset()
+            bits = next(self._inputs, None)
+            if bits is None:
+                self.finished = True
+                return False
+        if bits != GAME_OVER_INPUT:
+            state.step(bits)
+        return True
+
+
+def replay_headless(path: str) -> dict:
+    """Reproduce la grabación lo más rápido posible, sin ventana."""
+    player = ReplayPlayer(path)
+    state = player.new_state()
+    ticks = 0
+    deaths: list[tuple[int, int]] = []
+
+    start = time.perf_counter()
+    while True:
+        was_over = state.game_over
+        if not player.step(state):
+            break
+        ticks += 1
+        if state.game_over and not was_over:
+            deaths.append((state.frame, int(state.score)))
+    elapsed = time.perf_counter() - start
+
+    return {
+        "seed": player.seed,
+        "ticks": ticks,
+        "deaths": deaths,
+        "final_score": int(state.score),
+        "game_over": state.game_over,
+        "landmark_samples": len(player.landmarks()),
+        "elapsed_s": elapsed,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Reproduce una repetición sin ventana (para verla: "
+        "python main.py --replay RUTA)"
+    )
+    parser.add_argument("replay", help="archivo grabado con main.py --record-replay")
+    args = parser.parse_args()
+
+    result = replay_headless(args.replay)
+    print(
+        f"semilla {result['seed']} | {result['ticks']} ticks en "
+        f"{result['elapsed_s']:.2f} s | {result['landmark_samples']} muestras de pose"
+    )
+    for frame, score in result["deaths"]:
+        print(f"muerte en el tick {frame} con {score} puntos")
+    state = "game over" if result["game_over"] else "en juego"
+    print(f"final: {result['final_score']} puntos ({state})")
@@ -1,15 +1,51 @@
 import os
-from random import randint
+import random
+from typing import Optional
 
 SCREEN_WIDTH = 1100
 SCREEN_HEIGHT = 600
+# Límite de fps del render (0 = sin límite); la simulación va a TICK_RATE
 FPS = 60
+TICK_RATE = 60
+# Tope del tiempo acumulado por frame: tras un parón largo el juego se frena
+# en lugar de encadenar cientos de ticks
+MAX_FRAME_TIME = 0.25
+
+CAMERA_PREVIEW_SIZE = (320, 240)
+
+# Inferencia de pose: 0 = ancho completo del frame
+POSE_MODEL_COMPLEXITY = 1
+POSE_INFERENCE_WIDTH = 0
+# Presupuesto de inferencia por frame en ms; 0 = sin ajuste adaptativo
+POSE_BUDGET_MS = 0
+
+# Líneas de decisión de la pose, en y normalizada (0 arriba, 1 abajo);
+# threshold_tuner.py las evalúa sobre trazas etiquetadas
+POSE_UMBRAL_SALTO = 0.4
+POSE_UMBRAL_AGACHARSE = 0.7
+POSE_UMBRAL_MANO_RESET = 0.3
+
+# Filtro One Euro + histéresis + predicción sobre nariz y muñecas
+POSE_FILTER_ENABLED = True
+POSE_FILTER_PARAMS = {
+    "min_cutoff": 1.0,  # Hz en reposo
+    "beta": 1.0,  # cuánto sube el corte con la velocidad
+    "d_cutoff": 1.0,  # Hz del filtro de la velocidad
+    "hysteresis": 0.03,  # banda para soltar una acción (coordenada normalizada)
+    "prediction_s": 0.06,  # horizonte de predicción
+    "min_velocity": 0.5,  # velocidad mínima (por segundo) para predecir
+}
 
 SPRITE_SHEET_PATH = os.path.join("sprites", "offline-sprite-2x.png")
 
 COLOR_WHITE = (255, 255, 255)
 COLOR_BLACK = (32, 32, 32)
 
+# Transición día/noche: ticks que dura el fundido y pasos precalculados
+# (cada paso es una Surface por sprite, horneada al cargar)
+DAY_NIGHT_FADE_TICKS = 30
+DAY_NIGHT_FADE_STEPS = 8
+
 GRAVITY = 0.6
 SPEED_START = 6.0
 MAX_SPEED = 13.0
@@ -21,9 +57,10 @@ MIN_JUMP_HEIGHT = -4.0
 
 DINO_X_POS = 50
 GROUND_Y_POS = 380
+GROUND_WIDTH = 1200
 
 SCORE_DIVISOR = 10
 
 
-def get_day_night_distance() -> int:
-    return randint(400, 600)
+def get_day_night_distance(rng: Optional[random.Random] = None) -> int:
+    return (rng or random).randint(400, 600)
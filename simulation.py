@@ -0,0 +1,297 @@
+import argparse
+import random
+import time
+from typing import Optional
+
+from settings import (
+    COLOR_WHITE,
+    COLOR_BLACK,
+    DAY_NIGHT_FADE_STEPS,
+    DAY_NIGHT_FADE_TICKS,
+    SPEED_START,
+    MAX_SPEED,
+    ACCELERATION,
+    GROUND_WIDTH,
+    SCREEN_WIDTH,
+    get_day_night_distance,
+)
+from assets import get_mask
+from dinosaur import Dinosaur
+from obstacles import ObstacleManager
+
+INPUT_JUMP_PRESSED = 1
+INPUT_JUMP_HELD = 2
+INPUT_DUCK_HELD = 4
+
+
+def _fade_colors(start: tuple, end: tuple) -> tuple[tuple[int, int, int], ...]:
+    return tuple(
+        tuple(
+            round(a + (b - a) * step / DAY_NIGHT_FADE_STEPS) for a, b in zip(start, end)
+        )
+        for step in range(DAY_NIGHT_FADE_STEPS + 1)
+    )
+
+
+# Colores de cada paso del fundido: el fondo solo cambia (y fuerza un
+# repintado completo) al pasar de un paso al siguiente
+BG_COLORS = _fade_colors(COLOR_WHITE, COLOR_BLACK)
+FG_COLORS = _fade_colors(COLOR_BLACK, COLOR_WHITE)
+
+
+class FrameInput:
+    """Expone un bitfield de entradas con la interfaz que usa Dinosaur.update"""
+
+    __slots__ = ("bits",)
+
+    def __init__(self, bits: int = 0) -> None:
+        self.bits = bits
+
+    def is_jump_just_pressed(self) -> bool:
+        return bool(self.bits & INPUT_JUMP_PRESSED)
+
+    def is_jump_held(self) -> bool:
+        return bool(self.bits & INPUT_JUMP_HELD)
+
+    def is_duck_held(self) -> bool:
+        return bool(self.bits & INPUT_DUCK_HELD)
+
+
+def sample_inputs(input_handler) -> int:
+    """Bitfield INPUT_* de un tick.
+
+    Los backends que generan la entrada tick a tick (ScriptedInput) la dan
+    con tick_inputs(); el resto devuelve None y se lee de su estado actual.
+    """
+    bits = input_handler.tick_inputs()
+    if bits is not None:
+        return bits
+    bits = 0
+    if input_handler.is_jump_just_pressed():
+        bits |= INPUT_JUMP_PRESSED
+    if input_handler.is_jump_held():
+        bits |= INPUT_JUMP_HELD
+    if input_handler.is_duck_held():
+        bits |= INPUT_DUCK_HELD
+    return bits
+
+
+class GameState:
+    """Estado completo de una partida, sin ventana ni cámara"""
+
+    def __init__(self, seed: Optional[int] = None) -> None:
+        self.rng = random.Random(seed)
+        self.player = Dinosaur()
+        self.obstacle_manager = ObstacleManager(self.rng)
+        self._input = FrameInput()
+        self.reset()
+
+    def reset(self, seed: Optional[int] = None) -> None:
+        if seed is not None:
+            self.rng.seed(seed)
+
+        self.player.reset()
+        self.obstacle_manager.reset()
+
+        self.score = 0.0
+        self.game_speed = SPEED_START
+        self.game_over = False
+        self.is_day = True
+        # Ticks de fundido hacia la noche: 0 = día, DAY_NIGHT_FADE_TICKS = noche
+        self.night_fade = 0
+        self.next_day_night_switch = get_day_night_distance(self.rng)
+        self.ground_x = 0.0
+        self.prev_ground_x = 0.0
+        self.frame = 0
+
+    @property
+    def night_step(self) -> int:
+        """Paso del fundido día/noche, de 0 (día) a DAY_NIGHT_FADE_STEPS."""
+        return round(self.night_fade * DAY_NIGHT_FADE_STEPS / DAY_NIGHT_FADE_TICKS)
+
+    @property
+    def bg_color(self) -> tuple[int, int, int]:
+        return BG_COLORS[self.night_step]
+
+    @property
+    def fg_color(self) -> tuple[int, int, int]:
+        return FG_COLORS[self.night_step]
+
+    def step(self, inputs: int = 0) -> bool:
+        if self.game_over:
+            return True
+
+        if self.game_speed < MAX_SPEED:
+            self.game_speed += ACCELERATION
+
+        self._input.bits = inputs
+        self.player.update(self._input)
+        self.obstacle_manager.update(self.game_speed, int(self.score))
+
+        self.score += 0.15 * (self.game_speed / SPEED_START)
+
+        self.prev_ground_x = self.ground_x
+        self.ground_x -= self.game_speed
+        if self.ground_x <= -GROUND_WIDTH:
+            self.ground_x = 0
+            self.prev_ground_x += GROUND_WIDTH
+
+        if self.score >= self.next_day_night_switch:
+            self.is_day = not self.is_day
+            self.next_day_night_switch = self.score + get_day_night_distance(self.rng)
+        # Solo afecta al dibujo: la simulación no depende del fundido
+        if self.is_day:
+            if self.night_fade > 0:
+                self.night_fade -= 1
+        elif self.night_fade < DAY_NIGHT_FADE_TICKS:
+            self.night_fade += 1
+
+        if self.check_collision():
+            self.game_over = True
+
+        self.frame += 1
+        return self.game_over
+
+    def interpolated_ground_x(self, alpha: float) -> float:
+        x = self.prev_ground_x + (self.ground_x - self.prev_ground_x) * alpha
+        # Recién reiniciado el suelo, x > 0 dejaría un hueco a la izquierda
+        return x - GROUND_WIDTH if x > 0 else x
+
+    def check_collision(self) -> bool:
+        """Colisión por máscara de píxeles, solo con obstáculos que solapan en x.
+
+        Los obstáculos aparecen por la derecha y avanzan a la misma velocidad,
+        así que la lista ya está ordenada por x: se saltan los que quedaron
+        atrás y se corta en el primero que aún no llega al dinosaurio.
+        """
+        player = self.player
+        player_rect = player.rect
+        left = player_rect.x
+        right = left + player_rect.width
+        top = player_rect.y
+        bottom = top + player_rect.height
+        player_mask = None
+
+        for obs in self.obstacle_manager.obstacles:
+            obs_rect = obs.rect
+            obs_x = obs_rect.x
+            if obs_x >= right:
+                break
+            if obs_x + obs_rect.width <= left:
+                continue
+            obs_y = obs_rect.y
+            if obs_y >= bottom or obs_y + obs_rect.height <= top:
+                continue
+            if player_mask is None:
+                player_mask = get_mask(player.image)
+            if player_mask.overlap(get_mask(obs.image), (obs_x - left, obs_y - top)):
+                return True
+        return False
+
+
+def autopilot_inputs(state: GameState) -> int:
+    """Política simple para corridas de regresión: salta ante cactus cercanos"""
+    player_rect = state.player.rect
+    for obs in state.obstacle_manager.obstacles:
+        if obs.rect.right < player_rect.left:
+            continue
+        if obs.type != "cactus":
+            break
+        distance = obs.rect.left - player_rect.right
+        if distance < state.game_speed * 8:
+            return INPUT_JUMP_PRESSED | INPUT_JUMP_HELD
+        break
+    return 0
+
+
+def run_headless(frames: int, seed: int) -> dict:
+    state = GameState(seed)
+    deaths = 0
+    best_score = 0
+
+    start = time.perf_counter()
+    for _ in range(frames):
+        if state.step(autopilot_inputs(state)):
+            deaths += 1
+            best_score = max(best_score, int(state.score))
+            state.reset()
+    elapsed = time.perf_counter() - start
+
+    best_score = max(best_score, int(state.score))
+    return {
+        "frames": frames,
+        "seed": seed,
+        "deaths": deaths,
+        "best_score": best_score,
+        "elapsed_s": elapsed,
+        "frames_per_s": frames / elapsed if elapsed > 0 else float("inf"),
+    }
+
+
+def run_stress(obstacles: int, frames: int, seed: int) -> dict:
+    """Mide update y colisión con `obstacles` obstáculos en pantalla a la vez.
+
+    El hueco entre spawns se ajusta para que haya unos `obstacles` activos en
+    régimen estable; la velocidad y la puntuación se fijan (con pájaros) y
+    las colisiones se calculan pero no terminan la partida.
+    """
+    state = GameState(seed)
+    speed = MAX_SPEED
+    # Recorrido de un obstáculo: de SCREEN_WIDTH + 50 hasta right < -100
+    lifetime = SCREEN_WIDTH + 200
+    manager = ObstacleManager(
+        state.rng,
+        capacity=obstacles + obstacles // 20 + 16,
+        spawn_gap=lifetime / obstacles,
+    )
+    state.obstacle_manager = manager
+
+    hits = 0
+    peak = 0
+    start = time.perf_counter()
+    for _ in range(frames):
+        manager.update(speed, 1000)
+        if state.check_collision():
+            hits += 1
+        peak = max(peak, len(manager.obstacles))
+    elapsed = time.perf_counter() - start
+
+    return {
+        "frames": frames,
+        "seed": seed,
+        "peak_obstacles": peak,
+        "collision_frames": hits,
+        "pool_capacity": manager.capacity,
+        "allocations": manager.allocations,
+        "elapsed_s": elapsed,
+        "frames_per_s": frames / elapsed if elapsed > 0 else float("inf"),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Simulación headless de Dino Jumper")
+    parser.add_argument("--frames", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--stress",
+        type=int,
+        metavar="N",
+        help="benchmark de obstáculos: N a la vez en pantalla, sin partida",
+    )
+    args = parser.parse_args()
+
+    if args.stress:
+        result = run_stress(args.stress, args.frames, args.seed)
+        print(
+            f"{result['frames']} frames en {result['elapsed_s']:.2f} s "
+            f"({result['frames_per_s']:.0f} fps) | pico "
+            f"{result['peak_obstacles']} obstáculos | pool "
+            f"{result['pool_capacity']} ({result['allocations']} creados en marcha)"
+        )
+    else:
+        result = run_headless(args.frames, args.seed)
+        print(
+            f"{result['frames']} frames en {result['elapsed_s']:.2f} s "
+            f"({result['frames_per_s']:.0f} fps) | muertes {result['deaths']} | "
+            f"mejor puntuación {result['best_score']}"
+        )
@@ -0,0 +1,387 @@
+import argparse
+import math
+from typing import NamedTuple, Optional, Sequence
+
+from dinosaur import Dinosaur
+from settings import MAX_SPEED, SPEED_START
+
+
+class SpawnBracket(NamedTuple):
+    max_score: float  # el tramo vale mientras score < max_score
+    small: float  # probabilidad de cactus pequeño; el resto, grande
+    bird: float  # probabilidad de pájaro en vez de cactus
+    bird_heights: tuple[int, ...]  # y del pájaro, elegida con rng.choice
+    gap: tuple[int, int]  # randint sumado a speed * GAP_SPEED_FACTOR
+
+
+# Curva de dificultad del juego. Las probabilidades 0 y 1 no consumen números
+# del rng, así una partida con la misma semilla sale igual que antes de la
+# tabla. Antes de 700 puntos el pájaro más bajo sube a la altura media.
+SPAWN_TABLE = (
+    SpawnBracket(150, 1.0, 0.0, (), (400, 900)),
+    SpawnBracket(450, 0.5, 0.0, (), (250, 600)),
+    SpawnBracket(500, 0.5, 0.25, (220, 220, 160), (250, 600)),
+    SpawnBracket(700, 0.5, 0.25, (220, 220, 160), (150, 400)),
+    SpawnBracket(math.inf, 0.5, 0.25, (270, 220, 160), (150, 400)),
+)
+GAP_SPEED_FACTOR = 75
+
+# Ancho de cada tramo de velocidad de las tablas de alcance
+SPEED_STEP = 0.5
+
+
+def spawn_bracket(score: int) -> SpawnBracket:
+    for bracket in SPAWN_TABLE:
+        if score < bracket.max_score:
+            return bracket
+    return SPAWN_TABLE[-1]
+
+
+class ObstacleProfile(NamedTuple):
+    """Rectángulo de un obstáculo en pantalla, sin la x."""
+
+    width: int
+    top: int
+    bottom: int
+
+
+def profile_of(image, y_pos: int) -> ObstacleProfile:
+    return ObstacleProfile(image.get_width(), y_pos, y_pos + image.get_height())
+
+
+class _ArcInput:
+    """Entrada de Dinosaur.update para trazar un arco tick a tick."""
+
+    __slots__ = ("pressed", "held", "duck")
+
+    def __init__(self) -> None:
+        self.pressed = self.held = self.duck = False
+
+    def is_jump_just_pressed(self) -> bool:
+        return self.pressed
+
+    def is_jump_held(self) -> bool:
+        return self.held
+
+    def is_duck_held(self) -> bool:
+        return self.duck
+
+
+class JumpArc(NamedTuple):
+    """Un salto desde el suelo hasta volver a tocarlo.
+
+    `rects` tiene (top, bottom) del dinosaurio en cada tick en el aire; el
+    tick 1 es el del salto y el último (`landing`) el del aterrizaje.
+    """
+
+    hold: int  # ticks con el salto mantenido
+    fall_at: Optional[int]  # tick desde el que se mantiene agachado
+    rects: tuple[tuple[int, int], ...]
+    width: int  # ancho máximo durante el arco
+
+    @property
+    def landing(self) -> int:
+        return len(self.rects)
+
+
+def trace_arc(hold: int, fall_at: Optional[int] = None) -> JumpArc:
+    """Simula Dinosaur.update/apply_physics con una entrada fija."""
+    dino = Dinosaur()
+    arc_input = _ArcInput()
+    rects = []
+    width = dino.rect.width
+    tick = 0
+    while True:
+        tick += 1
+        arc_input.pressed = tick == 1
+        arc_input.held = tick <= hold
+        arc_input.duck = fall_at is not None and tick >= fall_at
+        dino.update(arc_input)
+        rect = dino.rect
+        rects.append((rect.top, rect.bottom))
+        width = max(width, rect.width)
+        if dino.on_ground:
+            return JumpArc(hold, fall_at, tuple(rects), width)
+
+
+def jump_arcs() -> list[JumpArc]:
+    """Saltos cortos (soltando en cada tick posible) y caídas rápidas."""
+    full = trace_arc(hold=10**6)
+    arcs = [full]
+    # Soltar solo recorta el salto mientras la velocidad sea menor que
+    # MIN_JUMP_HEIGHT; después todos los arcos son el completo
+    for hold in range(1, full.landing):
+        arc = trace_arc(hold)
+        if arc.rects == full.rects:
+            break
+        arcs.append(arc)
+    for fall_at in range(2, full.landing):
+        arcs.append(trace_arc(hold=10**6, fall_at=fall_at))
+    return arcs
+
+
+def ground_poses() -> list[tuple[int, int]]:
+    """(top, bottom) de pie y agachado en el suelo."""
+    dino = Dinosaur()
+    poses = [(dino.rect.top, dino.rect.bottom)]
+    duck = _ArcInput()
+    duck.duck = True
+    for _ in range(2):
+        dino.update(duck)
+    poses.append((dino.rect.top, dino.rect.bottom))
+    return poses
+
+
+def _clear(rect: tuple[int, int], profile: ObstacleProfile) -> bool:
+    top, bottom = rect
+    return bottom <= profile.top or top >= profile.bottom
+
+
+def _clear_window(arc: JumpArc, profile: ObstacleProfile) -> Optional[tuple[int, int]]:
+    """Tramo más largo de ticks (a, b) del arco sin tocar el obstáculo."""
+    best = None
+    start = None
+    for tick, rect in enumerate(arc.rects, 1):
+        if _clear(rect, profile):
+            if start is None:
+                start = tick
+            if best is None or tick - start > best[1] - best[0]:
+                best = (start, tick)
+        else:
+            start = None
+    return best
+
+
+class ReachabilityTable:
+    """Huecos mínimos entre obstáculos precalculados por tramo de velocidad.
+
+    Los arcos salen de simular Dinosaur (salto mantenido, soltado antes y
+    caída rápida agachado); las colisiones se aproximan por rectángulos y
+    con un tick de margen, así que la tabla es conservadora respecto a la
+    colisión por máscara. Un obstáculo que no toca al dinosaurio en el
+    suelo (de pie o agachado) se pasa sin saltar; con los demás hay que
+    estar en el aire mientras cruza.
+
+    El hueco es la distancia entre el borde derecho de un obstáculo y el
+    izquierdo del siguiente. Para cada par (A, B) se guarda el mínimo que
+    permite aterrizar de A y superar B, y el máximo con el que ambos caben
+    en un solo salto. allows() y missing_gap() solo indexan las tablas.
+    """
+
+    def __init__(
+        self,
+        profiles: Sequence[ObstacleProfile],
+        speed_step: float = SPEED_STEP,
+        arcs: Optional[list[JumpArc]] = None,
+    ) -> None:
+        self.profiles = tuple(dict.fromkeys(profiles))
+        self.index = {profile: i for i, profile in enumerate(self.profiles)}
+        self.speed_step = speed_step
+        self.arcs = arcs if arcs is not None else jump_arcs()
+
+        buckets = max(1, math.ceil((MAX_SPEED - SPEED_START) / speed_step))
+        # Cada tramo usa su velocidad más desfavorable: la menor para caber
+        # en un salto y la mayor para el hueco mínimo
+        self.speeds = [SPEED_START + i * speed_step for i in range(buckets + 1)]
+
+        poses = ground_poses()
+        self.runs_under = [
+            any(_clear(pose, p) for pose in poses) for p in self.profiles
+        ]
+        self.windows = [
+            [_clear_window(arc, p) for p in self.profiles] for arc in self.arcs
+        ]
+        self.fully_clear = [
+            [all(_clear(rect, p) for rect in arc.rects) for p in self.profiles]
+            for arc in self.arcs
+        ]
+
+        self.clearable: list[list[bool]] = []
+        self.min_gap: list[list[list[float]]] = []
+        self.max_cluster_gap: list[list[list[float]]] = []
+        for bucket in range(buckets):
+            self._build_bucket(self.speeds[bucket], self.speeds[bucket + 1])
+
+    def _clears(self, arc_index: int, p: int, speed: float) -> bool:
+        """El arco supera al obstáculo `p` saltando en el momento justo."""
+        if self.runs_under[p]:
+            return True
+        window = self.windows[arc_index][p]
+        if window is None:
+            return False
+        a, b = window
+        arc = self.arcs[arc_index]
+        return (b - a - 1) * speed >= self.profiles[p].width + arc.width
+
+    def _build_bucket(self, low: float, high: float) -> None:
+        n = len(self.profiles)
+        arcs = range(len(self.arcs))
+        # Arcos que superan cada obstáculo en todo el tramo: caber en un salto
+        # es más fácil cuanto más rápido, así que basta con la velocidad menor
+        usable = [[i for i in arcs if self._clears(i, p, low)] for p in range(n)]
+        windows = self.windows
+        widths = [arc.width for arc in self.arcs]
+
+        # Saltando a B lo antes posible: ticks hasta quedar por encima y
+        # ancho del dinosaurio en ese arco
+        enter = [
+            min(
+                (
+                    (windows[i][p][0] + 1) * high + widths[i]
+                    for i in usable[p]
+                    if windows[i][p] is not None
+                ),
+                default=math.inf,
+            )
+            for p in range(n)
+        ]
+        # Saltando A lo más tarde posible: ticks desde que A queda atrás
+        # hasta aterrizar
+        exit_ = [
+            min(
+                (
+                    self.arcs[i].landing - windows[i][p][1]
+                    for i in usable[p]
+                    if windows[i][p] is not None
+                ),
+                default=math.inf,
+            )
+            for p in range(n)
+        ]
+
+        min_gap = [[0.0] * n for _ in range(n)]
+        max_cluster = [[-math.inf] * n for _ in range(n)]
+        for a in range(n):
+            for b in range(n):
+                if not usable[b]:
+                    min_gap[a][b] = math.inf
+                elif self.runs_under[a] and self.runs_under[b]:
+                    min_gap[a][b] = 0.0
+                elif self.runs_under[a]:
+                    # B se salta en cuanto A pasa, salvo con arcos que no
+                    # tocan nunca a A
+                    min_gap[a][b] = min(
+                        (
+                            (
+                                0.0
+                                if self.fully_clear[i][a]
+                                else (windows[i][b][0] + 1) * high + widths[i]
+                            )
+                            for i in usable[b]
+                        ),
+                        default=math.inf,
+                    )
+                elif self.runs_under[b]:
+                    # Hay que haber aterrizado antes de que B llegue
+                    min_gap[a][b] = min(
+                        (
+                            (
+                                0.0
+                                if self.fully_clear[i][b]
+                                else (self.arcs[i].landing - windows[i][a][1] + 1)
+                                * high
+                                + widths[i]
+                            )
+                            for i in usable[a]
+                        ),
+                        default=math.inf,
+                    )
+                else:
+                    min_gap[a][b] = (exit_[a] + 1) * high + enter[b]
+                    # Los dos en un mismo salto
+                    for i in usable[a]:
+                        if i not in usable[b]:
+                            continue
+                        start = max(windows[i][a][0], windows[i][b][0])
+                        end = min(windows[i][a][1], windows[i][b][1])
+                        room = (end - start - 1) * low - widths[i]
+                        room -= self.profiles[a].width + self.profiles[b].width
+                        max_cluster[a][b] = max(max_cluster[a][b], room)
+
+        self.clearable.append([bool(usable[p]) for p in range(n)])
+        self.min_gap.append(min_gap)
+        self.max_cluster_gap.append(max_cluster)
+
+    def bucket(self, speed: float) -> int:
+        bucket = int((speed - SPEED_START) / self.speed_step)
+        return min(max(bucket, 0), len(self.min_gap) - 1)
+
+    def can_clear(self, speed: float, profile: ObstacleProfile) -> bool:
+        return self.clearable[self.bucket(speed)][self.index[profile]]
+
+    def missing_gap(
+        self,
+        speed: float,
+        previous: ObstacleProfile,
+        profile: ObstacleProfile,
+        gap: float,
+    ) -> float:
+        """Cuánto falta a `gap` para que `profile` tras `previous` sea superable.
+
+        0 si ya lo es; math.inf si `profile` no se puede superar a esta
+        velocidad.
+        """
+        bucket = self.bucket(speed)
+        a = self.index[previous]
+        b = self.index[profile]
+        if gap <= self.max_cluster_gap[bucket][a][b]:
+            return 0.0
+        return max(0.0, self.min_gap[bucket][a][b] - gap)
+
+    def allows(
+        self,
+        speed: float,
+        previous: ObstacleProfile,
+        profile: ObstacleProfile,
+        gap: float,
+    ) -> bool:
+        return self.missing_gap(speed, previous, profile, gap) == 0.0
+
+
+# Una tabla por conjunto de perfiles: todos los ObstacleManager la comparten
+_tables: dict[tuple[ObstacleProfile, ...], ReachabilityTable] = {}
+
+
+def reachability_table(profiles: Sequence[ObstacleProfile]) -> ReachabilityTable:
+    key = tuple(dict.fromkeys(profiles))
+    table = _tables.get(key)
+    if table is None:
+        table = ReachabilityTable(key)
+        _tables[key] = table
+    return table
+
+
+if __name__ == "__main__":
+    from obstacles import ObstacleManager
+
+    parser = argparse.ArgumentParser(
+        description="Muestra las tablas de alcance y comprueba que la curva "
+        "de huecos de SPAWN_TABLE no genere secuencias imposibles"
+    )
+    parser.add_argument("--speed", type=float, action="append", metavar="V")
+    args = parser.parse_args()
+
+    manager = ObstacleManager()
+    table = manager.reachability
+    arcs = table.arcs
+    print(f"{len(arcs)} arcos de salto | completo {arcs[0].landing} ticks en el aire")
+    for speed in args.speed or (SPEED_START, MAX_SPEED):
+        bucket = table.bucket(speed)
+        print(f"\nvelocidad {speed:.1f} (tramo {bucket}):")
+        for a, first in enumerate(table.profiles):
+            gaps = " ".join(f"{gap:6.0f}" for gap in table.min_gap[bucket][a])
+            mode = "por debajo" if table.runs_under[a] else "saltando"
+            clear = "" if table.clearable[bucket][a] else " IMPOSIBLE"
+            print(f"  {tuple(first)} {mode:10}{clear} | huecos mínimos {gaps}")
+
+    # Peor caso de la curva: hueco más corto del tramo a la velocidad más alta
+    worst = math.inf
+    for bracket in SPAWN_TABLE:
+        for speed in table.speeds:
+            spacing = speed * GAP_SPEED_FACTOR + bracket.gap[0]
+            for a, first in enumerate(table.profiles):
+                for b in range(len(table.profiles)):
+                    gap = spacing - first.width
+                    need = table.min_gap[table.bucket(speed)][a][b]
+                    worst = min(worst, gap - need)
+    print(f"\nmargen mínimo de la curva de SPAWN_TABLE: {worst:.0f} px")
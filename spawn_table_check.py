@@ -0,0 +1,205 @@
+import os
+
+# Sin ventana real, como bench.py
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import argparse
+import math
+import sys
+
+import numpy as np
+
+import obstacles
+import spawn_table
+from dinosaur import Dinosaur
+from obstacles import ObstacleManager
+from settings import DINO_X_POS, MAX_SPEED, SPEED_START
+from simulation import GameState
+from spawn_table import ObstacleProfile, ReachabilityTable, profile_of
+
+# Fases de la x del primer obstáculo, en fracciones de la velocidad: la tabla
+# tiene que valer caiga donde caiga el obstáculo entre ticks
+PHASES = (0.0, 0.25, 0.5, 0.75)
+
+
+def _flight_ok(
+    table: ReachabilityTable,
+    pair: tuple[ObstacleProfile, ObstacleProfile],
+    lefts: list[np.ndarray],
+    ticks: int,
+) -> list[np.ndarray]:
+    """Por arco, los ticks de salida con los que no toca ningún obstáculo."""
+    result = []
+    starts = np.arange(ticks)[:, None]
+    for arc in table.arcs:
+        rects = np.array(arc.rects)
+        span = starts + np.arange(arc.landing)
+        ok = np.ones(ticks, dtype=bool)
+        for profile, left in zip(pair, lefts):
+            x = left[span]
+            overlap = (x < DINO_X_POS + arc.width) & (x + profile.width > DINO_X_POS)
+            hit = (rects[:, 1] > profile.top) & (rects[:, 0] < profile.bottom)
+            ok &= ~np.any(overlap & hit, axis=1)
+        result.append(ok)
+    return result
+
+
+def pair_clearable(
+    table: ReachabilityTable,
+    speed: float,
+    first: ObstacleProfile,
+    second: ObstacleProfile,
+    gap: float,
+    phase: float = 0.0,
+) -> bool:
+    """Busca a fuerza bruta uno o dos saltos que superen la pareja.
+
+    Mismo modelo que la tabla (arcos de jump_arcs, rectángulos y el orden de
+    GameState.step: primero el dinosaurio, luego los obstáculos) pero
+    probando cada tick de salida en vez de derivar huecos mínimos. En el
+    suelo solo se pasan los obstáculos que no tocan al dinosaurio de pie o
+    agachado.
+    """
+    standing = Dinosaur().rect.width
+    longest = max(arc.landing for arc in table.arcs)
+    # El primero llega con margen para un salto completo desde el suelo
+    first_x = DINO_X_POS + standing + (longest + 2 + phase) * speed
+    second_x = first_x + first.width + gap
+    ticks = math.ceil((second_x + second.width - DINO_X_POS) / speed) + 2
+    times = np.arange(ticks + longest)
+    pair = (first, second)
+    # x entera tras mover el obstáculo en cada tick, como Obstacle.update
+    lefts = [np.trunc(x - speed * (times + 1)) for x in (first_x, second_x)]
+
+    # Ticks en los que un obstáculo que no se pasa por debajo está encima
+    # del dinosaurio: tienen que caer dentro de algún salto
+    grounded = np.zeros(ticks, dtype=bool)
+    for profile, left in zip(pair, lefts):
+        if table.runs_under[table.index[profile]]:
+            continue
+        x = left[:ticks]
+        grounded |= (x < DINO_X_POS + standing) & (x + profile.width > DINO_X_POS)
+    must = np.flatnonzero(grounded)
+    if len(must) == 0:
+        return True
+
+    valid = _flight_ok(table, pair, lefts, ticks)
+    landings = [arc.landing for arc in table.arcs]
+    # Sumas acumuladas para preguntar "hay alguna salida válida en [a, b]"
+    counts = [np.concatenate(([0], np.cumsum(ok))) for ok in valid]
+
+    # El primer salto tiene que cubrir el primer tick en peligro
+    for i, ok in enumerate(valid):
+        for start in np.flatnonzero(ok[: must[0] + 1]):
+            end = start + landings[i]
+            rest = must[must >= end]
+            if len(rest) == 0:
+                return True
+            # Segundo salto: desde el tick siguiente al aterrizaje
+            for j, count in enumerate(counts):
+                low = max(end, rest[-1] - landings[j] + 1)
+                high = rest[0]
+                if low <= high and count[high + 1] - count[low] > 0:
+                    return True
+    return False
+
+
+def check_table(table: ReachabilityTable, speeds: list[float]) -> list[str]:
+    """Huecos que la tabla acepta y que ningún plan de saltos supera.
+
+    Se recorre cada pareja desde hueco 0 hasta un poco más allá del mínimo
+    de la tabla; con huecos mayores los dos saltos ya no se estorban.
+    """
+    failures = []
+    for speed in speeds:
+        bucket = table.bucket(speed)
+        for a, first in enumerate(table.profiles):
+            for b, second in enumerate(table.profiles):
+                minimum = table.min_gap[bucket][a][b]
+                if minimum == math.inf:
+                    continue
+                end = max(minimum, table.max_cluster_gap[bucket][a][b]) + 4 * speed
+                for gap in np.arange(0.0, end, speed / 2):
+                    if not table.allows(speed, first, second, gap):
+                        continue
+                    for phase in PHASES:
+                        if not pair_clearable(table, speed, first, second, gap, phase):
+                            failures.append(
+                                f"velocidad {speed:.2f}: {tuple(first)} -> "
+                                f"{tuple(second)} con hueco {gap:.1f} "
+                                f"(fase {phase}) aceptado sin plan de saltos"
+                            )
+                            break
+    return failures
+
+
+def check_manager(seed: int, ticks: int, speed: float) -> dict:
+    """Spawns con una curva de huecos casi nulos contrastados con la tabla.
+
+    Cada pareja de obstáculos consecutivos en pantalla tiene que estar
+    permitida por la tabla de alcance; la curva densa obliga a retener
+    candidatos y a cambiar los imposibles.
+    """
+    dense = tuple(b._replace(gap=(0, 10)) for b in spawn_table.SPAWN_TABLE)
+    saved = spawn_table.SPAWN_TABLE, obstacles.GAP_SPEED_FACTOR
+    spawn_table.SPAWN_TABLE = dense
+    obstacles.GAP_SPEED_FACTOR = 0
+    try:
+        state = GameState(seed)
+        manager = state.obstacle_manager
+        spawns = violations = 0
+        for _ in range(ticks):
+            before = manager.obstacles[-1] if manager.obstacles else None
+            manager.update(speed, 1000)
+            last = manager.obstacles[-1] if manager.obstacles else None
+            if last is before or before is None:
+                continue
+            spawns += 1
+            gap = last.exact_x - (before.exact_x + before.rect.width)
+            previous = _profile(manager, before)
+            # Margen por el redondeo de exact_x al comparar con el hueco pedido
+            if not manager.reachability.allows(
+                speed, previous, _profile(manager, last), gap + 0.001
+            ):
+                violations += 1
+    finally:
+        spawn_table.SPAWN_TABLE, obstacles.GAP_SPEED_FACTOR = saved
+    return {
+        "spawns": spawns,
+        "delayed": manager.delayed_spawns,
+        "violations": violations,
+    }
+
+
+def _profile(manager: ObstacleManager, obs) -> ObstacleProfile:
+    # Los pájaros cambian de imagen al aletear; el perfil es el de la primera
+    image = manager.bird_images[0] if obs.type == "bird" else obs.image
+    return profile_of(image, obs.rect.y)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Comprueba que la tabla de alcance y ObstacleManager "
+        "rechacen los huecos imposibles"
+    )
+    parser.add_argument("--speed", type=float, action="append", metavar="V")
+    parser.add_argument("--ticks", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    speeds = args.speed or [SPEED_START, (SPEED_START + MAX_SPEED) / 2, MAX_SPEED]
+
+    failures = check_table(ObstacleManager().reachability, speeds)
+    for line in failures:
+        print(line)
+    print(f"tabla de alcance: {len(failures)} huecos aceptados sin plan de saltos")
+
+    violations = 0
+    for speed in speeds:
+        result = check_manager(args.seed, args.ticks, speed)
+        violations += result["violations"]
+        print(
+            f"curva densa a {speed:.1f}: {result['spawns']} spawns | "
+            f"{result['delayed']} retenidos | "
+            f"{result['violations']} parejas fuera de la tabla"
+        )
+    sys.exit(1 if failures or violations else 0)
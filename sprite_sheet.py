@@ -1,9 +1,17 @@
 import pygame
 
 
+def load_image(filename: str) -> pygame.Surface:
+    image = pygame.image.load(filename)
+    # Sin ventana (modo headless) convert_alpha no está disponible
+    if pygame.display.get_init() and pygame.display.get_surface() is not None:
+        return image.convert_alpha()
+    return image
+
+
 class SpriteSheet:
     def __init__(self, filename: str):
-        self.sheet = pygame.image.load(filename).convert_alpha()
+        self.sheet = load_image(filename)
 
     def get_image(
         self, x: int, y: int, width: int, height: int, scale: float = 0.5
@@ -0,0 +1,425 @@
+import argparse
+import csv
+import itertools
+import json
+import math
+import os
+import time
+
+import numpy as np
+
+from camera_sources import load_trace
+from pose_landmarks import LEFT_WRIST, NOSE, RIGHT_WRIST
+from settings import (
+    POSE_FILTER_PARAMS,
+    POSE_UMBRAL_AGACHARSE,
+    POSE_UMBRAL_MANO_RESET,
+    POSE_UMBRAL_SALTO,
+)
+
+ACTIONS = ("salto", "agachado", "mano")
+
+
+class Sessions:
+    """Trazas de landmarks con sus etiquetas, en arrays (sesión, frame).
+
+    Las sesiones más cortas se rellenan con NaN, que se trata igual que un
+    frame sin pose. Los tiempos son relativos al primer frame de cada traza,
+    como en LandmarkTraceSource.
+    """
+
+    def __init__(self, traces: list[str], labels: list[str]) -> None:
+        loaded = [load_trace(path) for path in traces]
+        n_sessions = len(loaded)
+        n_frames = max(len(timestamps) for timestamps, _ in loaded)
+
+        self.names = traces
+        self.times = np.full((n_sessions, n_frames), np.nan)
+        self.nose = np.full((n_sessions, n_frames), np.nan)
+        self.left_wrist = np.full((n_sessions, n_frames), np.nan)
+        self.right_wrist = np.full((n_sessions, n_frames), np.nan)
+        for s, (timestamps, landmarks) in enumerate(loaded):
+            n = len(timestamps)
+            self.times[s, :n] = timestamps - timestamps[0]
+            self.nose[s, :n] = landmarks[:, NOSE, 1]
+            self.left_wrist[s, :n] = landmarks[:, LEFT_WRIST, 1]
+            self.right_wrist[s, :n] = landmarks[:, RIGHT_WRIST, 1]
+
+        self.game_over = np.zeros((n_sessions, n_frames), dtype=bool)
+        # Por acción: (sesión, inicio, fin) de cada intervalo etiquetado
+        self.intervals: dict[str, list[tuple[int, float, float]]] = {
+            action: [] for action in ACTIONS
+        }
+        for s, path in enumerate(labels):
+            for action, start, end in load_labels(path):
+                if action == "game_over":
+                    times = self.times[s]
+                    self.game_over[s] |= (times >= start) & (times <= end)
+                else:
+                    self.intervals[action].append((s, start, end))
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return self.times.shape
+
+    def interval_ids(self, action: str, tolerance: float) -> np.ndarray:
+        """Índice del intervalo que cubre cada frame (±tolerance), o -1."""
+        ids = np.full(self.shape, -1, dtype=np.int64)
+        for i, (s, start, end) in enumerate(self.intervals[action]):
+            times = self.times[s]
+            ids[s, (times >= start - tolerance) & (times <= end + tolerance)] = i
+        return ids
+
+
+def load_labels(path: str) -> list[tuple[str, float, float]]:
+    """CSV con columnas accion,inicio,fin (segundos desde el primer frame).
+
+    `accion` es salto, agachado, mano o game_over; los intervalos game_over
+    marcan cuándo se evalúa la mano, como en el juego.
+    """
+    with open(path, newline="") as f:
+        rows = [
+            (row["accion"].strip(), float(row["inicio"]), float(row["fin"]))
+            for row in csv.DictReader(f)
+        ]
+    for action, _, _ in rows:
+        if action not in ACTIONS and action != "game_over":
+            raise ValueError(f"{path}: acción desconocida {action!r}")
+    return rows
+
+
+def default_labels_path(trace_path: str) -> str:
+    return os.path.splitext(trace_path)[0] + ".labels.csv"
+
+
+class _Filters:
+    """Los tres OneEuroFilter de PoseFilter para todas las configuraciones."""
+
+    def __init__(self, shape: tuple[int, int]) -> None:
+        self.value = np.zeros((3, *shape))
+        self.velocity = np.zeros((3, *shape))
+        self.last_t = np.zeros(shape)
+        self.initialized = np.zeros(shape, dtype=bool)
+
+    @staticmethod
+    def _alpha(cutoff: np.ndarray, dt: np.ndarray) -> np.ndarray:
+        tau = 1.0 / (2.0 * math.pi * cutoff)
+        return 1.0 / (1.0 + tau / dt)
+
+    def __call__(
+        self,
+        x: np.ndarray,
+        t: np.ndarray,
+        valid: np.ndarray,
+        min_cutoff: np.ndarray,
+        beta: np.ndarray,
+        d_cutoff: np.ndarray,
+        filtered: np.ndarray,
+    ) -> None:
+        """Avanza un frame; x es (3, configs, sesiones) y t (configs, sesiones)."""
+        first = valid & ~self.initialized
+        dt = t - self.last_t
+        moving = valid & self.initialized & (dt > 0.0)
+        safe_dt = np.where(moving, dt, 1.0)
+
+        raw_velocity = (x - self.value) / safe_dt
+        a_d = self._alpha(d_cutoff, safe_dt)
+        velocity = self.velocity + a_d * (raw_velocity - self.velocity)
+        cutoff = min_cutoff + beta * np.abs(velocity)
+        # Sin filtro el valor es el crudo, como classify_pose sin PoseFilter
+        a = np.where(filtered, self._alpha(cutoff, safe_dt), 1.0)
+        value = self.value + a * (x - self.value)
+
+        self.velocity = np.where(moving, velocity, np.where(first, 0.0, self.velocity))
+        self.value = np.where(moving, value, np.where(first, x, self.value))
+        self.last_t = np.where(moving | first, t, self.last_t)
+        self.initialized = valid
+
+
+def evaluate(
+    sessions: Sessions, configs: list[dict], tolerance: float = 0.15
+) -> list[dict]:
+    """Evalúa todas las configuraciones a la vez sobre todas las sesiones.
+
+    Replica PoseFilter.classify (o classify_pose sin filtro) y los flancos
+    de _publish_state: cada flanco de subida de salto, agachado o mano es un
+    evento. Un evento dentro de un intervalo etiquetado (±tolerance) lo
+    acierta; el resto, y los repetidos dentro del mismo intervalo, son
+    disparos falsos. Los intervalos sin evento son acciones perdidas.
+    """
+    n_configs = len(configs)
+    n_sessions, n_frames = sessions.shape
+    shape = (n_configs, n_sessions)
+
+    def column(key: str) -> np.ndarray:
+        return np.array([c[key] for c in configs], dtype=np.float64)[:, None]
+
+    umbral_salto = column("umbral_salto")
+    umbral_agacharse = column("umbral_agacharse")
+    umbral_mano = column("umbral_mano_reset")
+    filtered = np.array([c["filter"] for c in configs], dtype=bool)[:, None]
+    min_cutoff = column("min_cutoff")
+    beta = column("beta")
+    d_cutoff = column("d_cutoff")
+    hysteresis = np.where(filtered, column("hysteresis"), 0.0)
+    prediction_s = np.where(filtered, column("prediction_s"), 0.0)
+    min_velocity = column("min_velocity")
+
+    filters = _Filters(shape)
+    state = {action: np.zeros(shape, dtype=bool) for action in ACTIONS}
+
+    ids = {}
+    hit = {}
+    starts = {}
+    false_triggers = {}
+    delay = {}
+    for action in ACTIONS:
+        intervals = sessions.intervals[action]
+        # La última columna recoge los frames fuera de cualquier intervalo
+        ids[action] = sessions.interval_ids(action, tolerance)
+        ids[action][ids[action] < 0] = len(intervals)
+        hit[action] = np.zeros((n_configs, len(intervals) + 1), dtype=bool)
+        starts[action] = np.array([start for _, start, _ in intervals] + [0.0])
+        false_triggers[action] = np.zeros(n_configs, dtype=np.int64)
+        delay[action] = np.zeros(n_configs)
+
+    def above(index: int, line: np.ndarray, active: np.ndarray) -> np.ndarray:
+        # "Arriba" en imagen es y menor que la línea
+        value = filters.value[index]
+        velocity = filters.velocity[index]
+        predicted = np.where(
+            np.abs(velocity) < min_velocity, value, value + velocity * prediction_s
+        )
+        return predicted < line + np.where(active, hysteresis, 0.0)
+
+    def below(index: int, line: np.ndarray, active: np.ndarray) -> np.ndarray:
+        value = filters.value[index]
+        velocity = filters.velocity[index]
+        predicted = np.where(
+            np.abs(velocity) < min_velocity, value, value + velocity * prediction_s
+        )
+        return predicted > line - np.where(active, hysteresis, 0.0)
+
+    with np.errstate(invalid="ignore"):
+        for frame in range(n_frames):
+            x = np.stack(
+                (
+                    sessions.nose[:, frame],
+                    sessions.left_wrist[:, frame],
+                    sessions.right_wrist[:, frame],
+                )
+            )
+            valid_session = ~np.isnan(x[0])
+            valid = np.broadcast_to(valid_session, shape)
+            t = np.broadcast_to(sessions.times[:, frame], shape)
+            filters(
+                np.broadcast_to(x[:, None, :], (3, *shape)),
+                t,
+                valid,
+                min_cutoff,
+                beta,
+                d_cutoff,
+                filtered,
+            )
+
+            game_over = sessions.game_over[:, frame]
+            hand = game_over & (
+                above(1, umbral_mano, state["mano"])
+                | above(2, umbral_mano, state["mano"])
+            )
+            jump = above(0, umbral_salto, state["salto"])
+            duck = ~jump & below(0, umbral_agacharse, state["agachado"])
+
+            # Sin pose (o fuera de la sesión) TraceProcessor no decide nada
+            # y PoseFilter se reinicia
+            current = {
+                "salto": jump & valid,
+                "agachado": duck & valid,
+                "mano": hand & valid,
+            }
+            for action in ACTIONS:
+                edge = current[action] & ~state[action]
+                state[action] = current[action]
+                if not edge.any():
+                    continue
+                frame_ids = np.broadcast_to(ids[action][:, frame], shape)
+                outside = frame_ids == hit[action].shape[1] - 1
+                already = np.take_along_axis(hit[action], frame_ids, axis=1)
+                new_hit = edge & ~outside & ~already
+                false_triggers[action] += (edge & (outside | already)).sum(axis=1)
+                if new_hit.any():
+                    r, c = np.nonzero(new_hit)
+                    hit[action][r, frame_ids[r, c]] = True
+                    elapsed = t[r, c] - starts[action][frame_ids[r, c]]
+                    np.add.at(delay[action], r, elapsed)
+
+    results = []
+    for i, config in enumerate(configs):
+        row = dict(config)
+        total = 0
+        for action in ACTIONS:
+            labeled = hit[action].shape[1] - 1
+            hits = int(hit[action][i, :labeled].sum())
+            row[f"{action}_etiquetas"] = labeled
+            row[f"{action}_aciertos"] = hits
+            row[f"{action}_perdidas"] = labeled - hits
+            row[f"{action}_falsos"] = int(false_triggers[action][i])
+            row[f"{action}_retardo_ms"] = (
+                float(delay[action][i]) / hits * 1000.0 if hits else 0.0
+            )
+            total += labeled - hits + row[f"{action}_falsos"]
+        row["errores"] = total
+        results.append(row)
+    return results
+
+
+def make_grid(
+    umbral_salto: list[float],
+    umbral_agacharse: list[float],
+    umbral_mano_reset: list[float],
+    min_cutoff: list[float],
+    beta: list[float],
+    hysteresis: list[float],
+    prediction_s: list[float],
+    raw: bool = False,
+    d_cutoff: float = POSE_FILTER_PARAMS["d_cutoff"],
+    min_velocity: float = POSE_FILTER_PARAMS["min_velocity"],
+) -> list[dict]:
+    """Producto cartesiano de umbrales y parámetros de PoseFilter.
+
+    Con `raw` se añaden también los umbrales sin filtro.
+    """
+    thresholds = list(
+        itertools.product(umbral_salto, umbral_agacharse, umbral_mano_reset)
+    )
+    filters = list(itertools.product(min_cutoff, beta, hysteresis, prediction_s))
+    configs = []
+    for salto, agacharse, mano in thresholds:
+        base = {
+            "umbral_salto": salto,
+            "umbral_agacharse": agacharse,
+            "umbral_mano_reset": mano,
+            "d_cutoff": d_cutoff,
+            "min_velocity": min_velocity,
+        }
+        for cutoff, beta_value, hyst, prediction in filters:
+            configs.append(
+                {
+                    **base,
+                    "filter": True,
+                    "min_cutoff": cutoff,
+                    "beta": beta_value,
+                    "hysteresis": hyst,
+                    "prediction_s": prediction,
+                }
+            )
+        if raw:
+            configs.append(
+                {
+                    **base,
+                    "filter": False,
+                    "min_cutoff": 1.0,
+                    "beta": 0.0,
+                    "hysteresis": 0.0,
+                    "prediction_s": 0.0,
+                }
+            )
+    return configs
+
+
+def describe(row: dict) -> str:
+    text = (
+        f"salto {row['umbral_salto']:.2f} agach {row['umbral_agacharse']:.2f} "
+        f"mano {row['umbral_mano_reset']:.2f} | "
+    )
+    if row["filter"]:
+        text += (
+            f"filtro fc {row['min_cutoff']:g} beta {row['beta']:g} "
+            f"hist {row['hysteresis']:g} pred {row['prediction_s']:g}"
+        )
+    else:
+        text += "sin filtro"
+    return text
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Evalúa umbrales y filtro de pose sobre trazas etiquetadas"
+    )
+    parser.add_argument("traces", nargs="+", help="trazas .npz (LandmarkTraceRecorder)")
+    parser.add_argument(
+        "--labels",
+        nargs="+",
+        help="CSV de etiquetas por traza (por defecto <traza>.labels.csv)",
+    )
+    filter_params = POSE_FILTER_PARAMS
+    parser.add_argument(
+        "--jump-threshold", type=float, nargs="+", default=[POSE_UMBRAL_SALTO]
+    )
+    parser.add_argument(
+        "--duck-threshold", type=float, nargs="+", default=[POSE_UMBRAL_AGACHARSE]
+    )
+    parser.add_argument(
+        "--hand-threshold", type=float, nargs="+", default=[POSE_UMBRAL_MANO_RESET]
+    )
+    parser.add_argument(
+        "--min-cutoff", type=float, nargs="+", default=[filter_params["min_cutoff"]]
+    )
+    parser.add_argument(
+        "--beta", type=float, nargs="+", default=[filter_params["beta"]]
+    )
+    parser.add_argument(
+        "--hysteresis", type=float, nargs="+", default=[filter_params["hysteresis"]]
+    )
+    parser.add_argument(
+        "--prediction-s", type=float, nargs="+", default=[filter_params["prediction_s"]]
+    )
+    parser.add_argument(
+        "--raw", action="store_true", help="evalúa también los umbrales sin filtro"
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.15,
+        help="segundos de margen alrededor de cada etiqueta",
+    )
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--json", metavar="RUTA", help="guarda todas las filas en JSON")
+    args = parser.parse_args()
+
+    labels = args.labels or [default_labels_path(path) for path in args.traces]
+    if len(labels) != len(args.traces):
+        parser.error("hace falta un archivo de etiquetas por traza")
+
+    sessions = Sessions(args.traces, labels)
+    configs = make_grid(
+        args.jump_threshold,
+        args.duck_threshold,
+        args.hand_threshold,
+        args.min_cutoff,
+        args.beta,
+        args.hysteresis,
+        args.prediction_s,
+        args.raw,
+    )
+
+    start = time.perf_counter()
+    results = evaluate(sessions, configs, args.tolerance)
+    elapsed = time.perf_counter() - start
+
+    n_sessions, n_frames = sessions.shape
+    print(
+        f"{len(configs)} configuraciones x {n_sessions} sesiones x {n_frames} "
+        f"frames en {elapsed:.2f} s"
+    )
+    ranked: list[dict] = sorted(results, key=lambda row: row["errores"])
+    for row in ranked[: args.top]:
+        counts = " | ".join(
+            f"{action} {row[f'{action}_aciertos']}/{row[f'{action}_etiquetas']} "
+            f"+{row[f'{action}_falsos']} falsos"
+            for action in ACTIONS
+        )
+        print(f"{describe(row)} || {counts} | errores {row['errores']}")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(ranked, f, indent=2)
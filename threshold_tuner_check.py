@@ -0,0 +1,146 @@
+import argparse
+import csv
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+from camera_sources import load_trace
+from pose_landmarks import LEFT_WRIST, NOSE, NUM_LANDMARKS, RIGHT_WRIST, TraceProcessor
+from threshold_tuner import ACTIONS, Sessions, default_labels_path, evaluate, make_grid
+
+FILTER_KEYS = (
+    "min_cutoff",
+    "beta",
+    "d_cutoff",
+    "hysteresis",
+    "prediction_s",
+    "min_velocity",
+)
+
+
+def write_synthetic_sessions(
+    directory: str, seed: int, lengths: tuple[int, ...] = (600, 450, 800)
+) -> list[str]:
+    """Trazas con saltos, agachadas y manos etiquetados, ruido y huecos sin pose.
+
+    Las sesiones tienen longitudes distintas para pasar por el relleno con NaN
+    de Sessions. Devuelve las rutas .npz; las etiquetas van al lado.
+    """
+    rng = np.random.default_rng(seed)
+    paths = []
+    for index, n in enumerate(lengths):
+        times = np.arange(n) / 30.0
+        nose = 0.55 + rng.normal(0.0, 0.02, n)
+        wrist = 0.6 + rng.normal(0.0, 0.02, n)
+        labels = []
+        for start in range(40, n - 40, 90):
+            kind = rng.integers(3)
+            if kind == 0:
+                nose[start : start + 15] = 0.3 + rng.normal(0.0, 0.02, 15)
+                labels.append(("salto", times[start], times[start + 15]))
+            elif kind == 1:
+                nose[start : start + 20] = 0.8 + rng.normal(0.0, 0.02, 20)
+                labels.append(("agachado", times[start], times[start + 20]))
+            else:
+                wrist[start : start + 10] = 0.2
+                labels.append(("game_over", times[start] - 0.5, times[start + 30]))
+                labels.append(("mano", times[start], times[start + 10]))
+
+        landmarks = np.full((n, NUM_LANDMARKS, 3), 0.5, dtype=np.float16)
+        landmarks[:, NOSE, 1] = nose
+        landmarks[:, LEFT_WRIST, 1] = wrist
+        landmarks[:, RIGHT_WRIST, 1] = wrist
+        landmarks[rng.integers(0, n, 8)] = np.nan
+
+        path = os.path.join(directory, f"sesion{index}.npz")
+        np.savez_compressed(path, timestamps=times, landmarks=landmarks)
+        with open(default_labels_path(path), "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["accion", "inicio", "fin"])
+            writer.writerows(labels)
+        paths.append(path)
+    return paths
+
+
+def scalar_events(sessions: Sessions, traces: list[str], config: dict) -> dict:
+    """Flancos de subida por acción reproduciendo cada traza con TraceProcessor."""
+    pose_filter = (
+        {key: config[key] for key in FILTER_KEYS} if config["filter"] else None
+    )
+    events = dict.fromkeys(ACTIONS, 0)
+    for s, path in enumerate(traces):
+        timestamps, landmarks = load_trace(path)
+        landmarks = landmarks.astype(np.float32)
+        timestamps = timestamps - timestamps[0]
+        processor = TraceProcessor(pose_filter)
+        previous = (False, False, False)
+        for frame in range(len(timestamps)):
+            result = processor.process(
+                landmarks[frame],
+                bool(sessions.game_over[s, frame]),
+                config["umbral_salto"],
+                config["umbral_agacharse"],
+                config["umbral_mano_reset"],
+                timestamps[frame],
+            )
+            current = (result.jump, result.duck, result.hand_raised)
+            for action, now, before in zip(ACTIONS, current, previous):
+                if now and not before:
+                    events[action] += 1
+            previous = current
+    return events
+
+
+def check_threshold_tuner(traces: list[str], configs: list[dict]) -> list[str]:
+    """Configuraciones en las que evaluate() no cuenta los mismos eventos que
+    el camino escalar del juego (TraceProcessor + PoseFilter)."""
+    sessions = Sessions(traces, [default_labels_path(path) for path in traces])
+    mismatches = []
+    for row in evaluate(sessions, configs):
+        expected = scalar_events(sessions, traces, row)
+        for action in ACTIONS:
+            vectorized = row[f"{action}_aciertos"] + row[f"{action}_falsos"]
+            if vectorized != expected[action]:
+                mismatches.append(
+                    f"{action}: {vectorized} eventos vectorizados, "
+                    f"{expected[action]} escalares con {row}"
+                )
+    return mismatches
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Comprueba que threshold_tuner cuenta los mismos eventos que "
+        "PoseFilter/TraceProcessor"
+    )
+    parser.add_argument(
+        "traces",
+        nargs="*",
+        help="trazas .npz con su <traza>.labels.csv (por defecto, sintéticas)",
+    )
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    configs = make_grid(
+        [0.35, 0.45],
+        [0.65, 0.75],
+        [0.3],
+        [0.5, 2.0],
+        [0.0, 1.0],
+        [0.0, 0.03],
+        [0.0, 0.06],
+        raw=True,
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        traces = args.traces or write_synthetic_sessions(directory, args.seed)
+        mismatches = check_threshold_tuner(traces, configs)
+
+    for line in mismatches:
+        print(line)
+    print(
+        f"{len(configs)} configuraciones x {len(traces)} trazas | "
+        f"{len(mismatches)} diferencias con el camino escalar"
+    )
+    sys.exit(1 if mismatches else 0)